@@ -153,6 +153,10 @@ class GeminiVisionAdapter:
             prompt=prompt or default_prompt
         )
 
+    async def aclose(self):
+        """关闭底层客户端复用的HTTP连接"""
+        await self.client.aclose()
+
 
 # 导出便捷函数
 def create_gemini_vision_adapter(
@@ -22,7 +22,9 @@ Kokoro是一个开源的82M参数TTS模型，支持8种语言：
 from typing import Optional
 from pathlib import Path
 import asyncio
+import contextlib
 import io
+import re
 import struct
 import numpy as np
 
@@ -53,6 +55,38 @@ KOKORO_VOICES = {
     # 其他语言音色可以根据实际支持情况添加
 }
 
+# 支持的推理精度（float16 适合GPU，CPU上建议 bfloat16）
+KOKORO_DTYPES = ("float32", "float16", "bfloat16")
+
+# 句子边界：中文句末标点之后，或英文句末标点后的空白（避免切开 3.14 这类数字）
+_SENTENCE_END_RE = re.compile(r'(?<=[。！？；])|(?<=[.!?;])(?=\s)')
+
+
+def _chunk_text(text: str, max_chars: int) -> str:
+    """
+    按句子把文本合并为不超过 max_chars 的分块
+
+    KPipeline 默认按换行切分文本并逐块推理，分块以换行连接即可；
+    超过 max_chars 的单个句子保持完整
+
+    Args:
+        text: 原始文本
+        max_chars: 每块最大字符数
+
+    Returns:
+        以换行分隔各分块的文本
+    """
+    chunks = []
+    current = ""
+    for sentence in filter(None, _SENTENCE_END_RE.split(text.replace("\n", " "))):
+        if current and len(current) + len(sentence) > max_chars:
+            chunks.append(current)
+            current = ""
+        current += sentence
+    if current:
+        chunks.append(current)
+    return "\n".join(chunk.strip() for chunk in chunks)
+
 
 class KokoroTTSAdapter:
     """
@@ -66,7 +100,9 @@ class KokoroTTSAdapter:
         default_voice: Optional[str] = None,
         default_lang: str = "zh-CN",
         default_speed: float = 1.0,
-        model_path: Optional[str] = None
+        model_path: Optional[str] = None,
+        default_dtype: Optional[str] = None,
+        default_chunk_chars: Optional[int] = None
     ):
         """
         初始化Kokoro TTS适配器
@@ -76,11 +112,15 @@ class KokoroTTSAdapter:
             default_lang: 默认语言（如'zh-CN'）
             default_speed: 默认语速（0.5-2.0）
             model_path: 模型路径（可选，默认自动下载）
+            default_dtype: 默认推理精度（float32/float16/bfloat16，None表示不启用混合精度）
+            default_chunk_chars: 默认分块最大字符数（None表示不额外分块）
         """
         self.default_voice = default_voice or getattr(settings, "KOKORO_VOICE", "af_heart")
         self.default_lang = default_lang
         self.default_speed = default_speed
         self.model_path = model_path
+        self.default_dtype = default_dtype or getattr(settings, "KOKORO_DTYPE", None)
+        self.default_chunk_chars = default_chunk_chars or getattr(settings, "KOKORO_CHUNK_CHARS", None)
 
         # 延迟加载（只有在首次使用时才导入和初始化）
         self._pipeline = None
@@ -90,7 +130,8 @@ class KokoroTTSAdapter:
             "kokoro_tts_adapter_initialized",
             default_voice=self.default_voice,
             default_lang=self.default_lang,
-            default_speed=self.default_speed
+            default_speed=self.default_speed,
+            default_dtype=self.default_dtype
         )
 
     def _ensure_pipeline(self, lang_code: str):
@@ -126,6 +167,32 @@ class KokoroTTSAdapter:
 
             logger.info("kokoro_pipeline_ready", lang_code=lang_code)
 
+    def _inference_context(self, dtype: Optional[str]):
+        """
+        推理精度上下文：非 float32 时在模型所在设备上启用 torch.autocast
+
+        autocast 会处理音色张量与模型权重的精度差异，不需要手动转换权重；
+        上下文是线程局部的，必须在执行推理的线程中进入
+
+        Args:
+            dtype: 推理精度（float32/float16/bfloat16）
+
+        Raises:
+            ValueError: 不支持的推理精度
+        """
+        if dtype is None or dtype == "float32":
+            return contextlib.nullcontext()
+        if dtype not in KOKORO_DTYPES:
+            raise ValueError(f"不支持的Kokoro推理精度: {dtype}，可选: {', '.join(KOKORO_DTYPES)}")
+
+        model = getattr(self._pipeline, "model", None)
+        if model is None:
+            return contextlib.nullcontext()
+
+        import torch
+        device_type = next(model.parameters()).device.type
+        return torch.autocast(device_type=device_type, dtype=getattr(torch, dtype))
+
     def _normalize_lang_code(self, lang: Optional[str] = None) -> str:
         """
         将标准语言代码转换为Kokoro语言代码
@@ -204,6 +271,8 @@ class KokoroTTSAdapter:
         sample_rate: Optional[int] = None,  # noqa: ARG002 - 接口兼容性
         speed: Optional[float] = None,
         lang: Optional[str] = None,
+        dtype: Optional[str] = None,
+        chunk_chars: Optional[int] = None,
         **kwargs  # noqa: ARG002 - 接口兼容性
     ) -> bytes:
         """
@@ -216,6 +285,8 @@ class KokoroTTSAdapter:
             sample_rate: 采样率（Kokoro固定24kHz）
             speed: 语速（0.5-2.0）
             lang: 语言代码（如'zh-CN', 'en-US'）
+            dtype: 推理精度（float32/float16/bfloat16）
+            chunk_chars: 按句子分块推理的每块最大字符数
             **kwargs: 其他参数
 
         Returns:
@@ -231,6 +302,10 @@ class KokoroTTSAdapter:
         lang_code = self._normalize_lang_code(lang)
         voice = voice or self.default_voice
         speed = speed or self.default_speed
+        dtype = dtype or self.default_dtype
+        chunk_chars = chunk_chars or self.default_chunk_chars
+        if chunk_chars:
+            text = _chunk_text(text, chunk_chars)
 
         # 确保Pipeline已初始化
         self._ensure_pipeline(lang_code)
@@ -240,18 +315,18 @@ class KokoroTTSAdapter:
             text_length=len(text),
             voice=voice,
             speed=speed,
-            lang_code=lang_code
+            lang_code=lang_code,
+            dtype=dtype
         )
 
         # 运行在单独的线程（Kokoro是同步的）
         def _generate_audio():
-            # 生成音频
-            generator = self._pipeline(text, voice=voice, speed=speed)
-
-            # 收集所有音频片段
+            # 收集所有音频片段（生成器惰性推理，需在精度上下文内迭代）
             audio_segments = []
-            for _, _, audio_chunk in generator:  # graphemes和phonemes暂不使用
-                audio_segments.append(audio_chunk)
+            with self._inference_context(dtype):
+                generator = self._pipeline(text, voice=voice, speed=speed)
+                for _, _, audio_chunk in generator:  # graphemes和phonemes暂不使用
+                    audio_segments.append(audio_chunk)
 
             # 合并音频
             if audio_segments:
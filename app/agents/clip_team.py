@@ -5,7 +5,7 @@ AgnoClipTeam - 智能剪辑Agent团队协调器（Workflow模式）
 """
 
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 from pathlib import Path
 
 from agno.workflow import Workflow
@@ -644,7 +644,33 @@ class AgnoClipTeam:
         output_path: Optional[str] = None
     ) -> AgnoClipTeamOutput:
         """
-        运行完整的剪辑策略生成Workflow（异步）
+        运行完整的剪辑策略生成Workflow（异步），参数同 run_stream
+
+        Returns:
+            AgnoClipTeamOutput对象，包含完整的分析、策略、方案、评审和视频（可选）
+        """
+        output = None
+        async for stage, result in self.run_stream(video_paths, config, output_path):
+            if stage == "output":
+                output = result
+        return output
+
+    async def run_stream(
+        self,
+        video_paths: List[str],
+        config: Optional[Dict[str, Any]] = None,
+        output_path: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        运行完整的剪辑策略生成Workflow，每个步骤完成后立即产出其结果
+
+        调用方无需等待整个流程结束即可展示中间结果
+
+        产出的事件 (步骤名, 结果)：
+            - analyses / strategy: 各一次
+            - technical_plan / quality_review: 每轮迭代各一次
+            - execution_result / script / tts_result / narration_result: 启用对应功能时（步骤跳过时结果为None）
+            - output: 最后一个事件，AgnoClipTeamOutput
 
         Args:
             video_paths: 视频文件路径列表
@@ -657,8 +683,8 @@ class AgnoClipTeam:
                 - subtitle_config: 字幕样式配置
             output_path: 最终视频输出路径（仅在enable_video_execution=True时有效）
 
-        Returns:
-            AgnoClipTeamOutput对象，包含完整的分析、策略、方案、评审和视频（可选）
+        Yields:
+            (步骤名, 该步骤的结果)
         """
         start_time = time.time()
 
@@ -683,17 +709,22 @@ class AgnoClipTeam:
             }
 
             # 执行Workflow（Step 1使用并发，Step 2-6按序执行）
-            final_context = await self._run_workflow_steps(initial_context)
+            final_context = initial_context
+            async for stage, final_context in self._iter_workflow_steps(initial_context):
+                # 可选步骤跳过时不会写入对应键，结果为None
+                yield stage, final_context.get(stage)
 
             # Step 7: 异步执行TTS生成（如果启用了narration）
             if self.enable_narration and final_context.get("script"):
                 logger.info("【步骤7/8】异步执行TTS生成")
                 final_context = await self._step_7_generate_tts(final_context)
+                yield "tts_result", final_context.get("tts_result")
 
             # Step 8: 添加口播和字幕（在TTS完成后）
             if self.enable_narration and final_context.get("tts_result"):
                 logger.info("【步骤8/8】执行口播和字幕添加")
                 final_context = self._step_8_add_narration(final_context)
+                yield "narration_result", final_context.get("narration_result")
 
             # 提取结果
             analyses = final_context["analyses"]
@@ -743,7 +774,7 @@ class AgnoClipTeam:
                 passed=quality_review.pass_review
             )
 
-            return output
+            yield "output", output
 
         except Exception as e:
             logger.error(
@@ -754,7 +785,10 @@ class AgnoClipTeam:
             )
             raise
 
-    async def _run_workflow_steps(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def _iter_workflow_steps(
+        self,
+        context: Dict[str, Any]
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
         """
         执行Workflow的所有步骤（支持迭代改进）
 
@@ -765,18 +799,20 @@ class AgnoClipTeam:
         Args:
             context: 初始上下文
 
-        Returns:
-            最终上下文（包含所有步骤的结果）
+        Yields:
+            (步骤名, 当前上下文)，步骤名即该步骤结果在上下文中的键
         """
         current_context = context
 
         # 步骤1: 并发视频分析（只执行一次，异步）
         logger.debug("执行步骤 1/4: 并发视频分析")
         current_context = await self._step_1_analyze_videos(current_context)
+        yield "analyses", current_context
 
         # 步骤2: 创意策略（只执行一次）
         logger.debug("执行步骤 2/4: 创意策略")
         current_context = self._step_2_generate_strategy(current_context)
+        yield "strategy", current_context
 
         # 步骤3和4: 技术方案 + 质量评审（支持迭代）
         iteration = 0
@@ -794,10 +830,12 @@ class AgnoClipTeam:
             logger.debug(f"执行步骤 3/4: 技术方案（迭代{iteration}）")
             current_context["previous_review"] = previous_review
             current_context = self._step_3_create_technical_plan(current_context)
+            yield "technical_plan", current_context
 
             # 步骤4: 质量评审
             logger.debug(f"执行步骤 4/4: 质量评审（迭代{iteration}）")
             current_context = self._step_4_review_quality(current_context)
+            yield "quality_review", current_context
 
             quality_review = current_context["quality_review"]
 
@@ -836,13 +874,13 @@ class AgnoClipTeam:
         if self.enable_video_execution:
             logger.debug("执行步骤 5/5: 视频剪辑执行")
             current_context = self._step_5_execute_video(current_context)
+            yield "execution_result", current_context
 
         # 步骤6: 脚本生成（可选）
         if self.enable_narration:
             logger.debug("执行步骤 6/8: 脚本生成")
             current_context = self._step_6_generate_script(current_context)
-
-        return current_context
+            yield "script", current_context
 
 
 # 便捷函数
@@ -339,6 +339,8 @@ class ScriptGeneratorAgent:
         narration_format = "mp3"
         narration_style = None
         narration_style_degree = None
+        narration_tts_dtype = None
+        narration_tts_chunk_chars = None
         tts_provider = self.default_tts_provider
 
         if config:
@@ -351,12 +353,22 @@ class ScriptGeneratorAgent:
             narration_style = config.get("narration_style")
             narration_style_degree = config.get("narration_style_degree")
             tts_provider = config.get("narration_tts_provider", tts_provider)
+            narration_tts_dtype = config.get("narration_tts_dtype")
+            narration_tts_chunk_chars = config.get("narration_tts_chunk_chars")
 
         tts_provider = (tts_provider or self.default_tts_provider).lower()
         adapter = self.tts_adapters.get(tts_provider)
         if not adapter:
             raise RuntimeError(f"未找到TTS Provider: {tts_provider}")
 
+        # 推理精度和分块只对本地Kokoro模型有效，其他Provider不接受这些参数
+        engine_options: Dict[str, Any] = {}
+        if tts_provider == "kokoro":
+            if narration_tts_dtype:
+                engine_options["dtype"] = narration_tts_dtype
+            if narration_tts_chunk_chars:
+                engine_options["chunk_chars"] = narration_tts_chunk_chars
+
         logger.info(
             "开始生成TTS语音",
             segments_count=len(script.narration_segments),
@@ -387,6 +399,7 @@ class ScriptGeneratorAgent:
                 style=narration_style,
                 style_degree=narration_style_degree,
                 adapter=adapter,
+                engine_options=engine_options,
                 segment_index=segment.segment_index,
                 start_time=segment.start_time,
                 end_time=segment.end_time
@@ -439,6 +452,7 @@ class ScriptGeneratorAgent:
         style: Optional[str],
         style_degree: Optional[float],
         adapter: Any,
+        engine_options: Dict[str, Any],
         segment_index: int,
         start_time: float,
         end_time: float
@@ -456,7 +470,8 @@ class ScriptGeneratorAgent:
                 pitch=pitch,
                 volume=volume,
                 style=style,
-                style_degree=style_degree
+                style_degree=style_degree,
+                **engine_options
             )
 
             # 获取音频时长（使用moviepy 2.x）
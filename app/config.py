@@ -79,6 +79,15 @@ class Settings(BaseSettings):
         ge=0.5,
         le=2.0
     )
+    KOKORO_DTYPE: Optional[str] = Field(
+        default=None,
+        description="Kokoro TTS 推理精度（float16/bfloat16启用混合精度，默认float32）"
+    )
+    KOKORO_CHUNK_CHARS: Optional[int] = Field(
+        default=None,
+        description="Kokoro TTS 按句子分块推理的每块最大字符数（默认不额外分块）",
+        gt=0
+    )
 
     # Gemini (视频理解)
     GEMINI_API_KEY: Optional[str] = Field(None, description="Gemini API密钥")
@@ -127,7 +136,25 @@ class Settings(BaseSettings):
     # ===== 视频压缩配置 =====
     DEFAULT_COMPRESSION_PROFILE: str = Field(
         default="balanced",
-        description="默认压缩策略: aggressive/balanced/conservative/dynamic"
+        description="默认压缩策略: aggressive/balanced/conservative/dynamic/gpu_nvenc"
+    )
+    COMPRESSED_WORK_DIR: Optional[str] = Field(
+        default=None,
+        description="压缩文件工作目录（可设为 tmpfs，如 /dev/shm/autoclip_work），上传成功后即删除；留空使用 storage/compressed"
+    )
+    COMPRESSION_STREAM_UPLOAD: bool = Field(
+        default=True,
+        description="压缩输出直接流式分片上传到 OSS（不写入 compressed_dir）"
+    )
+    NVENC_SESSIONS_PER_GPU: int = Field(
+        default=2,
+        ge=1,
+        description="每个 worker 主机同时运行的 NVENC 编码会话上限（消费级显卡通常为2）"
+    )
+    NVENC_SLOT_TIMEOUT: float = Field(
+        default=300.0,
+        gt=0,
+        description="等待空闲 NVENC 会话的最长时间（秒），超时改用 CPU 编码"
     )
     MAX_VIDEO_DURATION: int = Field(
         default=600,
@@ -147,6 +174,12 @@ class Settings(BaseSettings):
         le=10,
         description="批处理并行任务数限制"
     )
+    BATCH_VIDEOS_PER_TASK: int = Field(
+        default=1,
+        ge=1,
+        le=20,
+        description="每个 Celery 任务处理的视频数（>1 时按组打包，减少 broker 消息数）"
+    )
 
     # ===== 临时存储配置 =====
     TEMP_STORAGE_EXPIRY_HOURS: int = Field(
@@ -203,7 +236,7 @@ class Settings(BaseSettings):
     @classmethod
     def validate_compression_profile(cls, v):
         """验证压缩策略"""
-        valid_profiles = ["aggressive", "balanced", "conservative", "dynamic"]
+        valid_profiles = ["aggressive", "balanced", "conservative", "dynamic", "gpu_nvenc"]
         if v not in valid_profiles:
             raise ValueError(f"DEFAULT_COMPRESSION_PROFILE must be one of: {', '.join(valid_profiles)}")
         return v
@@ -236,7 +269,7 @@ class Settings(BaseSettings):
     @property
     def compressed_dir(self) -> str:
         """压缩视频目录"""
-        return f"{self.LOCAL_STORAGE_PATH}/compressed"
+        return self.COMPRESSED_WORK_DIR or f"{self.LOCAL_STORAGE_PATH}/compressed"
 
     @property
     def videos_dir(self) -> str:
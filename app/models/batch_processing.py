@@ -2,7 +2,7 @@
 批处理请求和响应模型
 支持多视频批量处理、AI分析和自动剪辑
 """
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from pydantic import BaseModel, Field, field_validator
 from enum import Enum
@@ -72,6 +72,32 @@ class ClipSegment(BaseModel):
             raise ValueError("结束时间必须大于起始时间")
         return v
 
+    @classmethod
+    def batch_construct(
+        cls,
+        rows: List[Tuple[int, float, float, int, str]]
+    ) -> List["ClipSegment"]:
+        """
+        批量构建片段，跳过字段校验（仅用于来源可信的数据）
+
+        Args:
+            rows: (video_index, start_time, end_time, priority, reason) 元组列表
+
+        Returns:
+            片段列表，duration 由起止时间计算
+        """
+        return [
+            cls.model_construct(
+                video_index=video_index,
+                start_time=start_time,
+                end_time=end_time,
+                duration=end_time - start_time,
+                priority=priority,
+                reason=reason
+            )
+            for video_index, start_time, end_time, priority, reason in rows
+        ]
+
 
 class ClipPlan(BaseModel):
     """完整剪辑方案"""
@@ -112,7 +138,7 @@ class BatchProcessRequest(BaseModel):
     # 全局配置
     global_compression_profile: str = Field(
         default="balanced",
-        description="全局压缩策略: aggressive/balanced/conservative/dynamic"
+        description="全局压缩策略: aggressive/balanced/conservative/dynamic/gpu_nvenc"
     )
 
     # 临时存储配置
@@ -83,7 +83,7 @@ class CompressionProfile(BaseModel):
     audio_bitrate: str = Field(..., description="音频码率")
     audio_sample_rate: int = Field(..., description="音频采样率")
     video_codec: str = Field(default="libx264", description="视频编码器")
-    preset: str = Field(..., description="编码预设: ultrafast/fast/medium/slow")
+    preset: str = Field(..., description="编码预设: ultrafast/fast/medium/slow（NVENC 为 p1-p7）")
     crf: int = Field(..., description="质量参数 (18-28, 越小质量越好)")
 
     @field_validator('crf')
@@ -137,6 +137,19 @@ COMPRESSION_PROFILES = {
         preset="medium",
         crf=20
     ),
+
+    # GPU 硬件编解码（需要 NVIDIA GPU 和带 NVENC 的 FFmpeg），crf 作为 NVENC 的 -cq 使用
+    "gpu_nvenc": CompressionProfile(
+        name="gpu_nvenc",
+        max_resolution="720p",
+        target_fps=15,
+        video_bitrate="1500k",
+        audio_bitrate="128k",
+        audio_sample_rate=44100,
+        video_codec="h264_nvenc",
+        preset="p4",
+        crf=23
+    ),
 }
 
 # 动态压缩规则：根据视频时长自动选择策略
@@ -6,7 +6,9 @@
 - 底层音频操作已抽取到 app/utils/audio_utils.py
 - 本服务类只负责业务编排和异常处理
 """
+import asyncio
 import os
+from functools import partial
 from app.core.exceptions import AnalysisError
 from app.utils.logger import get_logger
 from app.utils.audio_utils import extract_audio_from_video
@@ -49,14 +51,20 @@ class AudioExtractor:
 
             # 调用底层工具函数进行音频提取
             # 使用Paraformer ASR要求的格式
-            result_path = extract_audio_from_video(
-                video_path=video_path,
-                output_path=output_path,
-                audio_codec='pcm_s16le',  # PCM 16位小端编码
-                bitrate='192k',
-                fps=16000,                 # 16kHz采样率（Paraformer要求）
-                nbytes=2,                  # 16位 = 2字节
-                ffmpeg_params=["-ac", "1"] # 单声道
+            # 提取为同步ffmpeg调用，放到线程池执行，可与视频压缩等步骤并发
+            loop = asyncio.get_running_loop()
+            result_path = await loop.run_in_executor(
+                None,
+                partial(
+                    extract_audio_from_video,
+                    video_path=video_path,
+                    output_path=output_path,
+                    audio_codec='pcm_s16le',  # PCM 16位小端编码
+                    bitrate='192k',
+                    fps=16000,                 # 16kHz采样率（Paraformer要求）
+                    nbytes=2,                  # 16位 = 2字节
+                    ffmpeg_params=["-ac", "1"] # 单声道
+                )
             )
 
             # 业务层验证
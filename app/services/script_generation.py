@@ -2,12 +2,17 @@
 脚本生成服务 - 基于剪辑内容生成解说词
 职责: 根据视频剪辑决策和主题生成配音脚本
 """
+import json
+import re
 from typing import List, Dict, Any, Optional
 from app.utils.ai_clients.dashscope_client import DashScopeClient
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 模型响应首尾的Markdown代码块标记（```json / ```），预编译后一次替换完成清理
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*|\s*```\s*$')
+
 
 class ScriptGenerationService:
     """脚本生成服务 - 基于剪辑内容生成配音解说词"""
@@ -177,17 +182,8 @@ class ScriptGenerationService:
 
     def _parse_script_response(self, response: str) -> Dict[str, Any]:
         """解析脚本生成响应"""
-        import json
-
         # 清理可能的markdown代码块
-        response = response.strip()
-        if response.startswith("```json"):
-            response = response[7:]
-        elif response.startswith("```"):
-            response = response[3:]
-        if response.endswith("```"):
-            response = response[:-3]
-        response = response.strip()
+        response = _FENCE_RE.sub('', response).strip()
 
         try:
             script_data = json.loads(response)
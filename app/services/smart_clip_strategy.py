@@ -9,6 +9,7 @@
 4. 质量评估 - 评估片段质量并筛选最佳内容
 """
 import re
+from collections import Counter
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
@@ -191,61 +192,35 @@ class SmartClipStrategy:
 
         logger.info(f"智能排序片段，叙事风格: {narrative_style}")
 
-        # 计算每个片段的质量指标
-        segments_with_metrics = [
-            (seg, self.calculate_clip_metrics(seg))
-            for seg in segments
-        ]
+        # 每个片段只计算一次综合评分，排序时对下标排序
+        scores = [self.calculate_clip_metrics(seg).overall_score for seg in segments]
+        by_score = sorted(range(len(segments)), key=scores.__getitem__)
 
         if narrative_style == "crescendo":
             # 渐强式：按综合评分升序
-            sorted_segments = sorted(
-                segments_with_metrics,
-                key=lambda x: x[1].overall_score
-            )
+            order = by_score
 
         elif narrative_style == "decrescendo":
             # 渐弱式：按综合评分降序
-            sorted_segments = sorted(
-                segments_with_metrics,
-                key=lambda x: x[1].overall_score,
-                reverse=True
-            )
+            order = sorted(range(len(segments)), key=scores.__getitem__, reverse=True)
 
         elif narrative_style == "wave":
-            # 波浪式：高低交替
-            sorted_by_score = sorted(
-                segments_with_metrics,
-                key=lambda x: x[1].overall_score
-            )
-
-            # 交替选择高分和低分片段
-            result = []
-            low_idx = 0
-            high_idx = len(sorted_by_score) - 1
-
-            while low_idx <= high_idx:
-                # 先添加高分
-                if high_idx >= low_idx:
-                    result.append(sorted_by_score[high_idx])
-                    high_idx -= 1
-
-                # 再添加低分
-                if low_idx <= high_idx:
-                    result.append(sorted_by_score[low_idx])
-                    low_idx += 1
-
-            sorted_segments = result
+            # 波浪式：高低交替（最高、最低、次高、次低……）
+            half = (len(by_score) + 1) // 2
+            high = by_score[::-1][:half]
+            low = by_score[:len(by_score) - half]
+            order = [idx for pair in zip(high, low) for idx in pair]
+            if len(high) > len(low):
+                order.append(high[-1])
 
         else:  # chronological
             # 按原始时间顺序
-            sorted_segments = sorted(
-                segments_with_metrics,
-                key=lambda x: (x[0].video_index, x[0].start_time)
+            order = sorted(
+                range(len(segments)),
+                key=lambda i: (segments[i].video_index, segments[i].start_time)
             )
 
-        # 提取片段（去掉指标）
-        result = [seg for seg, _ in sorted_segments]
+        result = [segments[i] for i in order]
 
         logger.info(
             f"片段排序完成:\n"
@@ -456,6 +431,7 @@ class SmartClipStrategy:
         total_duration = sum(s.duration for s in segments)
         metrics = [self.calculate_clip_metrics(s) for s in segments]
         avg_quality = sum(m.overall_score for m in metrics) / len(metrics) if metrics else 0
+        type_counts = Counter(self.classify_content_type(s) for s in segments)
 
         stats = {
             'clip_count': len(segments),
@@ -463,10 +439,7 @@ class SmartClipStrategy:
             'average_quality': avg_quality,
             'narrative_style': narrative_style,
             'content_types': {
-                content_type.value: sum(
-                    1 for s in segments
-                    if self.classify_content_type(s) == content_type
-                )
+                content_type.value: type_counts[content_type]
                 for content_type in ContentType
             }
         }
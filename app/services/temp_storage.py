@@ -3,9 +3,11 @@
 管理临时文件的 OSS 上传、签名 URL 生成和自动清理
 """
 import os
+import asyncio
+import functools
 import hashlib
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
 from pathlib import Path
 
 import oss2
@@ -14,6 +16,140 @@ from app.config import settings
 from app.utils.logger import logger
 
 
+# OSS 分片上传的分片大小（最后一片以外不得小于100KB）
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+
+
+class TempStreamUpload:
+    """
+    流式分片上传到临时存储
+
+    数据按块写入，凑满一个分片即上传，不需要先把完整文件落盘。
+    oss2 为同步 SDK，初始化、分片上传、完成和取消都放到线程池执行；
+    分片上传任务在首次上传分片时才初始化。
+    """
+
+    def __init__(
+        self,
+        service: "TempStorageService",
+        oss_key: str,
+        headers: Dict[str, str],
+        expiry_hours: int,
+        expiry_time: datetime,
+        part_size: int = MULTIPART_PART_SIZE
+    ):
+        self._service = service
+        self._bucket = service.bucket
+        self.oss_key = oss_key
+        self.expiry_hours = expiry_hours
+        self.expiry_time = expiry_time
+        self.part_size = part_size
+        self.size = 0
+
+        self._headers = headers
+        self._buffer = bytearray()
+        self._parts: List[oss2.models.PartInfo] = []
+        self._upload_id: Optional[str] = None
+
+    async def _ensure_started(self):
+        """初始化分片上传任务（仅首次调用时请求 OSS）"""
+        if self._upload_id is None:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                None,
+                functools.partial(
+                    self._bucket.init_multipart_upload,
+                    self.oss_key,
+                    headers=self._headers
+                )
+            )
+            self._upload_id = result.upload_id
+
+    async def _upload_part(self, data: bytes):
+        """上传一个分片"""
+        await self._ensure_started()
+        part_number = len(self._parts) + 1
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            None,
+            self._bucket.upload_part,
+            self.oss_key,
+            self._upload_id,
+            part_number,
+            data
+        )
+        self._parts.append(oss2.models.PartInfo(part_number, result.etag))
+
+    async def write(self, chunk: bytes):
+        """
+        写入数据块，缓冲区满一个分片时上传
+
+        Args:
+            chunk: 数据块
+        """
+        self._buffer.extend(chunk)
+        self.size += len(chunk)
+        while len(self._buffer) >= self.part_size:
+            data = bytes(self._buffer[:self.part_size])
+            del self._buffer[:self.part_size]
+            await self._upload_part(data)
+
+    async def complete(self) -> Dict[str, Any]:
+        """
+        上传剩余数据并完成分片上传
+
+        Returns:
+            Dict: 与 TempStorageService.upload_temp_file 返回值相同，另含 'size'
+        """
+        if self._buffer or not self._parts:
+            await self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None,
+            self._bucket.complete_multipart_upload,
+            self.oss_key,
+            self._upload_id,
+            self._parts
+        )
+
+        signed_url = self._service.generate_signed_url(
+            self.oss_key,
+            expiry_seconds=int(self.expiry_hours * 3600)
+        )
+        public_url = f"https://{settings.OSS_BUCKET_NAME}.{settings.OSS_ENDPOINT}/{self.oss_key}"
+
+        logger.info(
+            f"临时文件流式上传成功:\n"
+            f"  OSS Key: {self.oss_key}\n"
+            f"  大小: {self.size / (1024 * 1024):.2f}MB ({len(self._parts)} 个分片)"
+        )
+
+        return {
+            'oss_key': self.oss_key,
+            'signed_url': signed_url,
+            'public_url': public_url,
+            'expiry_time': self.expiry_time.isoformat(),
+            'size': self.size
+        }
+
+    async def abort(self):
+        """取消分片上传，释放已上传的分片"""
+        if self._upload_id is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(
+                None,
+                self._bucket.abort_multipart_upload,
+                self.oss_key,
+                self._upload_id
+            )
+        except Exception as e:
+            logger.warning(f"取消分片上传失败 {self.oss_key}: {str(e)}")
+
+
 class TempStorageService:
     """临时存储服务"""
 
@@ -52,7 +188,8 @@ class TempStorageService:
     def generate_temp_key(
         self,
         original_filename: str,
-        prefix: str = "compressed"
+        prefix: str = "compressed",
+        key_seed: Optional[str] = None
     ) -> str:
         """
         生成临时文件的 OSS key
@@ -60,28 +197,35 @@ class TempStorageService:
         Args:
             original_filename: 原始文件名
             prefix: 文件前缀（如 'compressed', 'downloaded'）
+            key_seed: 确定性种子（可选），提供时 key 完全由种子和文件名决定（不含日期），
+                      任务重试（包括跨零点的重投递）时覆盖同一对象而不是重复上传
 
         Returns:
-            str: OSS key (例如: temp/compressed/20241104/abc123_video.mp4)
+            str: OSS key (例如: temp/compressed/20241104/abc123_video.mp4；
+                 提供种子时为 temp/compressed/abc123_video.mp4)
         """
-        # 生成时间戳和哈希
-        timestamp = datetime.now().strftime("%Y%m%d")
-        hash_value = hashlib.md5(
-            f"{original_filename}{datetime.now().isoformat()}".encode()
-        ).hexdigest()[:8]
+        # 生成哈希
+        hash_source = key_seed or f"{original_filename}{datetime.now().isoformat()}"
+        hash_value = hashlib.md5(hash_source.encode()).hexdigest()[:8]
 
         # 提取文件扩展名
         file_ext = Path(original_filename).suffix
+        filename = f"{hash_value}_{Path(original_filename).stem}{file_ext}"
+
+        # 确定性 key: temp/{prefix}/{hash}_{filename}
+        if key_seed:
+            return f"{self.temp_prefix}{prefix}/{filename}"
 
         # 构建 key: temp/{prefix}/{date}/{hash}_{filename}
-        filename = f"{hash_value}_{Path(original_filename).stem}{file_ext}"
+        timestamp = datetime.now().strftime("%Y%m%d")
         return f"{self.temp_prefix}{prefix}/{timestamp}/{filename}"
 
     async def upload_temp_file(
         self,
         local_path: str,
         prefix: str = "compressed",
-        expiry_hours: Optional[int] = None
+        expiry_hours: Optional[int] = None,
+        key_seed: Optional[str] = None
     ) -> Dict[str, str]:
         """
         上传文件到临时存储
@@ -90,6 +234,7 @@ class TempStorageService:
             local_path: 本地文件路径
             prefix: 文件前缀
             expiry_hours: 过期时间（小时），None 使用默认配置
+            key_seed: 确定性 key 种子（可选），见 generate_temp_key
 
         Returns:
             Dict: {
@@ -111,7 +256,8 @@ class TempStorageService:
         # 生成 OSS key
         oss_key = self.generate_temp_key(
             os.path.basename(local_path),
-            prefix
+            prefix,
+            key_seed=key_seed
         )
 
         # 设置过期时间
@@ -166,6 +312,40 @@ class TempStorageService:
             logger.error(f"上传临时文件失败: {str(e)}", exc_info=True)
             raise RuntimeError(f"OSS 上传失败: {str(e)}")
 
+    def start_stream_upload(
+        self,
+        filename: str,
+        prefix: str = "compressed",
+        expiry_hours: Optional[int] = None,
+        key_seed: Optional[str] = None
+    ) -> TempStreamUpload:
+        """
+        开始一个流式分片上传
+
+        Args:
+            filename: 文件名（用于生成 OSS key）
+            prefix: 文件前缀
+            expiry_hours: 过期时间（小时），None 使用默认配置
+            key_seed: 确定性 key 种子（可选），见 generate_temp_key
+
+        Returns:
+            TempStreamUpload: 通过 write() 写入数据，complete() 完成上传
+        """
+        self._check_bucket()
+
+        oss_key = self.generate_temp_key(filename, prefix, key_seed=key_seed)
+        expiry_hours = expiry_hours or settings.TEMP_STORAGE_EXPIRY_HOURS
+        expiry_time = datetime.now() + timedelta(hours=expiry_hours)
+
+        headers = {
+            'x-oss-meta-expiry-time': expiry_time.isoformat(),
+            'x-oss-meta-original-name': filename,
+            'x-oss-meta-upload-time': datetime.now().isoformat()
+        }
+
+        logger.info(f"开始流式上传临时文件: {filename} → {oss_key}")
+        return TempStreamUpload(self, oss_key, headers, expiry_hours, expiry_time)
+
     def generate_signed_url(
         self,
         oss_key: str,
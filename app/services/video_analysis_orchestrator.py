@@ -73,7 +73,7 @@ class VideoAnalysisOrchestrator:
 
         流程:
         1. 视频压缩 + base64编码
-        2. 音频提取 + OSS上传（如果启用语音识别）
+        2. 音频提取 + OSS上传（如果启用语音识别，与步骤1并发执行）
         3. 并行执行视觉分析和语音识别
         4. 融合分析结果
 
@@ -94,22 +94,26 @@ class VideoAnalysisOrchestrator:
                 enable_speech=enable_speech_recognition
             )
 
-            # 步骤1: 视频预处理
-            (
-                compressed_path,
-                video_base64,
-                compression_ratio,
-                preprocessing_temp_files
-            ) = await self.video_preprocessor.compress_and_encode(video_path)
-
-            temp_files.extend(preprocessing_temp_files)
-
-            # 步骤2: 音频处理（如果启用）
-            audio_url = None
-            if enable_speech_recognition:
-                audio_url = await self._prepare_audio_for_recognition(
-                    video_path, temp_files
-                )
+            # 步骤1+2: 视频压缩编码与音频提取上传互不依赖（音频取自原视频），并发执行
+            async def _no_audio() -> None:
+                return None
+
+            preprocess_result, audio_result = await asyncio.gather(
+                self.video_preprocessor.compress_and_encode(video_path),
+                self._prepare_audio_for_recognition(video_path, temp_files)
+                if enable_speech_recognition else _no_audio(),
+                return_exceptions=True
+            )
+
+            # 先登记压缩产生的临时文件，保证另一分支失败时也能被清理
+            if not isinstance(preprocess_result, BaseException):
+                temp_files.extend(preprocess_result[3])
+            for result in (preprocess_result, audio_result):
+                if isinstance(result, BaseException):
+                    raise result
+
+            video_base64 = preprocess_result[1]
+            audio_url = audio_result
 
             # 步骤3: 并行执行分析
             analysis_result = await self._execute_parallel_analysis(
@@ -126,7 +130,7 @@ class VideoAnalysisOrchestrator:
             raise AnalysisError(f"视频分析失败: {str(e)}")
         finally:
             # 清理临时文件
-            self._cleanup_temp_files(temp_files)
+            await self._cleanup_temp_files(temp_files)
 
     async def analyze_from_url(
         self,
@@ -346,21 +350,27 @@ class VideoAnalysisOrchestrator:
 
         return await self.text_service.generate(prompt)
 
-    def _cleanup_temp_files(self, temp_files: List[str]) -> None:
-        """清理临时文件"""
+    async def _cleanup_temp_files(self, temp_files: List[str]) -> None:
+        """清理临时文件（各文件互不依赖，在线程池中并发删除）"""
         if temp_files:
             logger.info("cleaning_up_temp_files", count=len(temp_files))
-            for temp_file in temp_files:
-                if os.path.exists(temp_file):
-                    try:
-                        os.remove(temp_file)
-                        logger.debug("temp_file_removed", file=temp_file)
-                    except Exception as cleanup_error:
-                        logger.warning(
-                            "temp_file_cleanup_failed",
-                            file=temp_file,
-                            error=str(cleanup_error)
-                        )
+            await asyncio.gather(
+                *(asyncio.to_thread(self._remove_temp_file, temp_file) for temp_file in temp_files)
+            )
+
+    @staticmethod
+    def _remove_temp_file(temp_file: str) -> None:
+        """删除单个临时文件，失败只记录警告"""
+        if os.path.exists(temp_file):
+            try:
+                os.remove(temp_file)
+                logger.debug("temp_file_removed", file=temp_file)
+            except Exception as cleanup_error:
+                logger.warning(
+                    "temp_file_cleanup_failed",
+                    file=temp_file,
+                    error=str(cleanup_error)
+                )
 
     def format_analysis_for_llm(self, analysis_result: Dict[str, Any]) -> str:
         """
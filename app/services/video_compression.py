@@ -11,7 +11,8 @@
 import os
 import subprocess
 import asyncio
-from typing import Dict, Any, Optional, Tuple
+import tempfile
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
 from datetime import datetime
 
 from app.config import settings
@@ -23,6 +24,11 @@ from app.models.video_source import (
 from app.utils.logger import logger
 from app.utils.video_utils import get_video_info
 
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl，不限制 NVENC 会话数
+    fcntl = None
+
 
 class VideoMetadata:
     """视频元信息"""
@@ -53,11 +59,101 @@ class VideoMetadata:
         }
 
 
+# 流式输出时每次从 FFmpeg stdout 读取的块大小（与 OSS 分片大小一致）
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+
+# NVENC 会话数有硬件上限（消费级显卡通常为2），超额会导致编码失败或帧率骤降；
+# 每个会话对应一个槽位锁文件，同一主机上所有 worker 进程共享。
+# flock 随文件描述符关闭（包括进程崩溃退出）由内核自动释放，不会丢失槽位
+NVENC_LOCK_DIR = os.path.join(tempfile.gettempdir(), "autoclip_nvenc")
+
+# 等待空闲槽位时的轮询间隔（秒）
+NVENC_POLL_INTERVAL = 0.5
+
+
+def _try_acquire_nvenc_slot() -> Optional[int]:
+    """
+    尝试以非阻塞方式占用一个 NVENC 槽位
+
+    Returns:
+        Optional[int]: 持有锁的文件描述符，所有槽位都被占用时返回 None
+    """
+    os.makedirs(NVENC_LOCK_DIR, exist_ok=True)
+    for slot in range(settings.NVENC_SESSIONS_PER_GPU):
+        fd = os.open(
+            os.path.join(NVENC_LOCK_DIR, f"slot{slot}.lock"),
+            os.O_RDWR | os.O_CREAT,
+            0o666
+        )
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return fd
+        except BlockingIOError:
+            os.close(fd)
+    return None
+
+
+async def _acquire_nvenc_slot(timeout: float) -> Optional[int]:
+    """
+    等待空闲的 NVENC 槽位
+
+    在事件循环中轮询非阻塞加锁，不占用线程池；协程被取消时不会遗留已占用的槽位
+
+    Args:
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        Optional[int]: 持有锁的文件描述符（平台不支持 fcntl 时为 -1），超时返回 None
+    """
+    if fcntl is None:
+        return -1
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        fd = _try_acquire_nvenc_slot()
+        if fd is not None:
+            return fd
+        if loop.time() >= deadline:
+            return None
+        await asyncio.sleep(NVENC_POLL_INTERVAL)
+
+
+def _release_nvenc_slot(fd: int) -> None:
+    """释放 NVENC 槽位（关闭文件描述符即释放 flock）"""
+    if fd >= 0:
+        os.close(fd)
+
+
 class VideoCompressionService:
     """视频压缩服务"""
 
     def __init__(self):
         self.ffmpeg_path = "ffmpeg"
+        self._nvenc_available: Optional[bool] = None
+
+    def is_nvenc_available(self) -> bool:
+        """
+        检测 FFmpeg 是否支持 NVENC 硬件编码（结果按进程缓存）
+
+        Returns:
+            bool: 是否可用
+        """
+        if self._nvenc_available is None:
+            try:
+                result = subprocess.run(
+                    [self.ffmpeg_path, "-hide_banner", "-encoders"],
+                    capture_output=True,
+                    text=True,
+                    timeout=10
+                )
+                self._nvenc_available = "h264_nvenc" in result.stdout
+            except (OSError, subprocess.SubprocessError):
+                self._nvenc_available = False
+
+            logger.info(f"NVENC 硬件编码可用: {self._nvenc_available}")
+
+        return self._nvenc_available
 
     async def get_video_metadata(self, video_path: str) -> VideoMetadata:
         """
@@ -76,7 +172,7 @@ class VideoCompressionService:
             raise ValueError(f"视频文件不存在: {video_path}")
 
         try:
-            # 使用 video_utils 获取基本信息
+            # 使用 video_utils 获取基本信息（文件未变化时复用缓存）
             info = get_video_info(video_path)
 
             # 转换为 VideoMetadata 业务模型
@@ -108,7 +204,7 @@ class VideoCompressionService:
 
         Args:
             metadata: 视频元信息
-            profile_name: 指定的配置名称（aggressive/balanced/conservative/dynamic）
+            profile_name: 指定的配置名称（aggressive/balanced/conservative/dynamic/gpu_nvenc）
 
         Returns:
             CompressionProfile: 压缩配置
@@ -117,6 +213,11 @@ class VideoCompressionService:
             # 动态选择：根据视频时长
             return get_dynamic_compression_profile(metadata.duration)
 
+        # GPU 配置在没有 NVENC 的主机上回退到 CPU 编码
+        if profile_name == "gpu_nvenc" and not self.is_nvenc_available():
+            logger.warning("NVENC 不可用，gpu_nvenc 回退为 balanced")
+            return COMPRESSION_PROFILES["balanced"]
+
         # 使用指定的配置
         if profile_name in COMPRESSION_PROFILES:
             return COMPRESSION_PROFILES[profile_name]
@@ -125,24 +226,105 @@ class VideoCompressionService:
         logger.warning(f"未知的压缩配置: {profile_name}，使用默认配置 balanced")
         return COMPRESSION_PROFILES["balanced"]
 
+    def _build_ffmpeg_cmd(
+        self,
+        input_path: str,
+        output_path: Optional[str],
+        profile: CompressionProfile
+    ) -> Tuple[list, str]:
+        """
+        构建压缩用的 FFmpeg 命令
+
+        Args:
+            input_path: 输入视频路径
+            output_path: 输出视频路径（None 时输出分片 MP4 到 stdout）
+            profile: 压缩配置对象
+
+        Returns:
+            Tuple[list, str]: (FFmpeg 命令, 目标分辨率 "宽:高")
+        """
+        # 解析目标分辨率
+        resolution_map = {
+            '480p': '854:480',
+            '720p': '1280:720',
+            '1080p': '1920:1080'
+        }
+        target_resolution = resolution_map.get(profile.max_resolution, '1280:720')
+
+        # 构建 FFmpeg 命令
+        if profile.video_codec.endswith("_nvenc"):
+            # 解码、缩放、编码全程在 GPU 显存中完成
+            cmd = [
+                self.ffmpeg_path,
+                "-hwaccel", "cuda",
+                "-hwaccel_output_format", "cuda",
+                "-i", input_path,
+                "-c:v", profile.video_codec,
+                "-preset", profile.preset,
+                "-tune", "hq",
+                "-rc", "vbr",
+                "-cq", str(profile.crf),
+                "-b:v", "0",
+                "-maxrate", profile.video_bitrate,
+                "-bufsize", f"{int(profile.video_bitrate.rstrip('k')) * 2}k",
+                "-vf", f"fps={profile.target_fps},scale_cuda={target_resolution}:force_original_aspect_ratio=decrease",
+            ]
+        else:
+            cmd = [
+                self.ffmpeg_path,
+                "-i", input_path,
+                "-c:v", profile.video_codec,
+                "-preset", profile.preset,
+                "-crf", str(profile.crf),
+                "-b:v", profile.video_bitrate,
+                "-maxrate", profile.video_bitrate,
+                "-bufsize", f"{int(profile.video_bitrate.rstrip('k')) * 2}k",
+                "-vf", f"scale={target_resolution}:force_original_aspect_ratio=decrease,fps={profile.target_fps}",
+            ]
+
+        cmd += [
+            "-c:a", "aac",
+            "-b:a", profile.audio_bitrate,
+            "-ar", str(profile.audio_sample_rate),
+        ]
+
+        if output_path:
+            cmd += [
+                "-movflags", "+faststart",  # 优化在线播放
+                "-y",  # 覆盖输出文件
+                output_path
+            ]
+        else:
+            # 不可 seek 的管道输出需要分片 MP4
+            cmd += [
+                "-f", "mp4",
+                "-movflags", "frag_keyframe+empty_moov",
+                "pipe:1"
+            ]
+
+        return cmd, target_resolution
+
     async def compress_video(
         self,
         input_path: str,
-        output_path: str,
+        output_path: Optional[str],
         profile: Optional[CompressionProfile] = None,
-        profile_name: Optional[str] = None
-    ) -> Tuple[str, Dict[str, Any]]:
+        profile_name: Optional[str] = None,
+        stdout_sink: Optional[Callable[[bytes], Awaitable[None]]] = None
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
         """
         压缩视频
 
         Args:
             input_path: 输入视频路径
-            output_path: 输出视频路径
+            output_path: 输出视频路径（提供 stdout_sink 时忽略）
             profile: 压缩配置对象
             profile_name: 压缩配置名称（如果 profile 为 None）
+            stdout_sink: 流式输出回调（可选），提供时 FFmpeg 以分片 MP4 写入
+                         stdout，每个数据块交给该回调，不落盘
 
         Returns:
-            Tuple[str, Dict[str, Any]]: (输出路径, 压缩统计信息)
+            Tuple[Optional[str], Dict[str, Any]]: (输出路径（流式时为 None）, 压缩统计信息)
 
         Raises:
             ValueError: 视频文件不存在或压缩失败
@@ -163,42 +345,35 @@ class VideoCompressionService:
         if profile is None:
             profile = self.select_compression_profile(original_metadata, profile_name)
 
+        if stdout_sink is not None:
+            output_path = None
+
         logger.info(
-            f"开始压缩视频: {input_path} → {output_path} "
+            f"开始压缩视频: {input_path} → {output_path or 'stream'} "
             f"(策略: {profile.name})"
         )
 
         # 确保输出目录存在
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-        # 解析目标分辨率
-        resolution_map = {
-            '480p': '854:480',
-            '720p': '1280:720',
-            '1080p': '1920:1080'
-        }
-        target_resolution = resolution_map.get(profile.max_resolution, '1280:720')
+        if output_path:
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-        # 构建 FFmpeg 命令
-        cmd = [
-            self.ffmpeg_path,
-            "-i", input_path,
-            "-c:v", profile.video_codec,
-            "-preset", profile.preset,
-            "-crf", str(profile.crf),
-            "-b:v", profile.video_bitrate,
-            "-maxrate", profile.video_bitrate,
-            "-bufsize", f"{int(profile.video_bitrate.rstrip('k')) * 2}k",
-            "-vf", f"scale={target_resolution}:force_original_aspect_ratio=decrease,fps={profile.target_fps}",
-            "-c:a", "aac",
-            "-b:a", profile.audio_bitrate,
-            "-ar", str(profile.audio_sample_rate),
-            "-movflags", "+faststart",  # 优化在线播放
-            "-y",  # 覆盖输出文件
-            output_path
-        ]
+        nvenc_slot: Optional[int] = None
 
         try:
+            if profile.video_codec.endswith("_nvenc"):
+                # 等待空闲的 NVENC 会话，超时（槽位长期被占满）则改用 CPU 编码
+                nvenc_slot = await _acquire_nvenc_slot(settings.NVENC_SLOT_TIMEOUT)
+                if nvenc_slot is None:
+                    logger.warning(
+                        f"等待 NVENC 会话超过 {settings.NVENC_SLOT_TIMEOUT}秒，"
+                        f"{profile.name} 回退为 balanced"
+                    )
+                    profile = COMPRESSION_PROFILES["balanced"]
+
+            cmd, target_resolution = self._build_ffmpeg_cmd(
+                input_path, output_path, profile
+            )
+
             # 执行压缩
             process = await asyncio.create_subprocess_exec(
                 *cmd,
@@ -206,15 +381,51 @@ class VideoCompressionService:
                 stderr=asyncio.subprocess.PIPE
             )
 
-            stdout, stderr = await process.communicate()
+            streamed_size = 0
+            if stdout_sink is None:
+                _, stderr = await process.communicate()
+            else:
+                async def _pump_stdout() -> int:
+                    total = 0
+                    while True:
+                        chunk = await process.stdout.read(STREAM_CHUNK_SIZE)
+                        if not chunk:
+                            return total
+                        total += len(chunk)
+                        await stdout_sink(chunk)
+
+                try:
+                    streamed_size, stderr = await asyncio.gather(
+                        _pump_stdout(),
+                        process.stderr.read()
+                    )
+                except Exception:
+                    process.kill()
+                    raise
+                await process.wait()
+
+            if nvenc_slot is not None:
+                _release_nvenc_slot(nvenc_slot)
+                nvenc_slot = None
 
             if process.returncode != 0:
                 error_msg = stderr.decode()
                 logger.error(f"FFmpeg 压缩失败: {error_msg}")
                 raise ValueError(f"视频压缩失败: {error_msg}")
 
-            # 获取压缩后的元信息
-            compressed_metadata = await self.get_video_metadata(output_path)
+            # 获取压缩后的元信息（流式输出没有落盘文件，按配置和输出字节数估算）
+            if output_path:
+                compressed_metadata = await self.get_video_metadata(output_path)
+            else:
+                width, height = target_resolution.split(':')
+                compressed_metadata = VideoMetadata({
+                    'duration': original_metadata.duration,
+                    'width': width,
+                    'height': height,
+                    'fps': profile.target_fps,
+                    'codec': profile.video_codec,
+                    'file_size': streamed_size
+                })
 
             # 计算压缩统计
             processing_time = (datetime.now() - start_time).total_seconds()
@@ -240,7 +451,7 @@ class VideoCompressionService:
             }
 
             logger.info(
-                f"视频压缩成功: {input_path} → {output_path}\n"
+                f"视频压缩成功: {input_path} → {output_path or 'stream'}\n"
                 f"  原始大小: {original_metadata.file_size / (1024*1024):.2f}MB\n"
                 f"  压缩大小: {compressed_metadata.file_size / (1024*1024):.2f}MB\n"
                 f"  压缩率: {compression_ratio * 100:.1f}%\n"
@@ -252,10 +463,34 @@ class VideoCompressionService:
         except Exception as e:
             logger.error(f"视频压缩异常: {str(e)}", exc_info=True)
             # 清理失败的输出文件
-            if os.path.exists(output_path):
+            if output_path and os.path.exists(output_path):
                 os.remove(output_path)
             raise
 
+        finally:
+            if nvenc_slot is not None:
+                _release_nvenc_slot(nvenc_slot)
+
+    async def validate_and_probe(
+        self,
+        video_path: str
+    ) -> Tuple[bool, Optional[VideoMetadata]]:
+        """
+        一次探测同时完成时长验证和元信息获取
+
+        Args:
+            video_path: 视频文件路径
+
+        Returns:
+            Tuple[bool, Optional[VideoMetadata]]: (是否有效, 元信息（探测失败时为 None）)
+        """
+        try:
+            metadata = await self.get_video_metadata(video_path)
+            return metadata.duration <= settings.MAX_VIDEO_DURATION, metadata
+        except Exception as e:
+            logger.error(f"验证视频时长失败: {str(e)}")
+            return False, None
+
     async def validate_video_duration(self, video_path: str) -> bool:
         """
         验证视频时长是否在允许范围内
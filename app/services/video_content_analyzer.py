@@ -5,6 +5,7 @@
 from typing import Dict, Any, Optional, List, Tuple
 import asyncio
 import base64
+import mmap
 import os
 import tempfile
 
@@ -84,14 +85,18 @@ class VideoContentAnalyzer:
 
             # 2. 转换压缩后视频为base64（用于VL模型）
             logger.info("converting_video_to_base64")
-            with open(compressed_path, "rb") as f:
-                video_bytes = f.read()
-                video_base64 = base64.b64encode(video_bytes).decode('utf-8')
+            # 内存映射后直接编码，避免同时持有原始字节副本和base64结果
+            with open(compressed_path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                original_bytes = len(mm)
+                video_base64 = base64.b64encode(mm).decode('ascii')
 
             logger.info(
                 "video_base64_ready",
                 base64_length=len(video_base64),
-                original_bytes=len(video_bytes)
+                original_bytes=original_bytes
             )
 
             # 3. 处理音频（如果启用语音识别）
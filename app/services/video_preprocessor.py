@@ -7,6 +7,7 @@
 - compress_and_encode() 使用 video_utils.video_to_base64()
 - Service层专注业务编排、状态管理、异常处理
 """
+import asyncio
 import tempfile
 from typing import Tuple, List
 import os
@@ -83,8 +84,9 @@ class VideoPreprocessor:
             # 2. 转换为base64（使用工具函数）
             logger.info("converting_video_to_base64")
             
-            # 调用底层工具函数
-            video_base64 = video_to_base64(compressed_path)
+            # 调用底层工具函数（读文件 + 编码为阻塞操作，放到线程池执行，
+            # 不阻塞同时进行的音频提取/上传等协程）
+            video_base64 = await asyncio.to_thread(video_to_base64, compressed_path)
 
             logger.info(
                 "video_base64_ready",
@@ -3,6 +3,7 @@
 支持qwen-vl-plus视觉分析、qwen-plus文本生成和CosyVoice语音合成
 """
 import asyncio
+import os
 from functools import partial
 from typing import Optional, Dict, Any, List
 import dashscope
@@ -215,8 +216,15 @@ class DashScopeClient:
                 base64_size_kb=len(video_base64) / 1024
             )
 
-            response = MultiModalConversation.call(
-                model=settings.DASHSCOPE_VL_MODEL, messages=messages
+            # SDK只提供同步调用（大体积请求体上传耗时长），放到线程池执行，避免阻塞事件循环
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None,
+                partial(
+                    MultiModalConversation.call,
+                    model=settings.DASHSCOPE_VL_MODEL,
+                    messages=messages
+                )
             )
 
             if response.status_code == 200:
@@ -232,6 +240,66 @@ class DashScopeClient:
             logger.error("dashscope_vl_base64_exception", error=str(e))
             raise LLMServiceError(f"视觉分析失败（base64方式）: {str(e)}")
 
+    async def analyze_video_visual_file(
+        self,
+        video_path: str,
+        prompt: Optional[str] = None
+    ) -> str:
+        """
+        使用qwen-vl-plus分析本地视频文件（SDK文件上传方式）
+
+        Args:
+            video_path: 本地视频文件路径
+            prompt: 自定义提示词
+
+        Returns:
+            视觉分析结果
+
+        Note:
+            以 file:// 形式传给SDK，由SDK将文件上传到DashScope临时存储后再调用模型，
+            无需将整个视频读入内存并做base64编码
+        """
+        try:
+            messages = [
+                {
+                    "role": "user",
+                    "content": [
+                        {"video": f"file://{os.path.abspath(video_path)}"},
+                        {"text": prompt or VideoAnalysisPrompts.VISUAL_ANALYSIS_DEFAULT},
+                    ],
+                }
+            ]
+
+            logger.info(
+                "calling_dashscope_vl_file",
+                model=settings.DASHSCOPE_VL_MODEL,
+                file_size_kb=os.path.getsize(video_path) / 1024
+            )
+
+            # SDK调用（含文件上传）为阻塞IO，放到线程池执行，避免阻塞事件循环
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None,
+                partial(
+                    MultiModalConversation.call,
+                    model=settings.DASHSCOPE_VL_MODEL,
+                    messages=messages
+                )
+            )
+
+            if response.status_code == 200:
+                result = response.output.choices[0].message.content[0]["text"]
+                logger.info("dashscope_vl_file_success")
+                return result
+            else:
+                error_msg = f"DashScope API错误: {response.message}"
+                logger.error("dashscope_vl_file_failed", error=error_msg)
+                raise LLMServiceError(error_msg)
+
+        except Exception as e:
+            logger.error("dashscope_vl_file_exception", error=str(e))
+            raise LLMServiceError(f"视觉分析失败（文件方式）: {str(e)}")
+
     async def chat(
         self, prompt: str, system_prompt: Optional[str] = None
     ) -> str:
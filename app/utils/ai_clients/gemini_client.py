@@ -3,6 +3,7 @@ Google Gemini API客户端
 支持自定义base_url的视频理解分析
 """
 from typing import Optional, Dict, Any
+import asyncio
 import httpx
 import base64
 from pathlib import Path
@@ -13,6 +14,13 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 安装了 h2 时启用 HTTP/2，多个请求复用同一连接
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 
 class GeminiClient:
     """
@@ -50,6 +58,8 @@ class GeminiClient:
         self.base_url = (base_url or settings.GEMINI_BASE_URL or self.DEFAULT_BASE_URL).rstrip('/')
         self.model = model or settings.GEMINI_MODEL or self.DEFAULT_MODEL
         self.timeout = timeout
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
 
         if not self.api_key:
             raise ValueError("Gemini API密钥未配置，请设置GEMINI_API_KEY环境变量")
@@ -61,6 +71,29 @@ class GeminiClient:
             timeout=self.timeout
         )
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        获取复用的HTTP客户端（同一事件循环内共享连接池，避免每次请求重新握手）
+
+        AsyncClient 绑定创建时的事件循环，循环变化（例如多次 asyncio.run）时重新创建
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=self.timeout
+            )
+            self._http_loop = loop
+        return self._http_client
+
+    async def aclose(self):
+        """关闭复用的HTTP客户端"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._http_loop = None
+
     def _build_endpoint(self, method: str = "generateContent") -> str:
         """
         构建API端点URL
@@ -97,20 +130,22 @@ class GeminiClient:
             LLMServiceError: API调用失败
         """
         path = Path(video_path)
-        if not path.exists():
+        try:
+            file_size = path.stat().st_size
+        except FileNotFoundError:
             raise FileNotFoundError(f"视频文件不存在：{video_path}")
 
-        # 读取并编码视频
-        with open(path, "rb") as f:
-            video_data = base64.b64encode(f.read()).decode("utf-8")
-
         logger.info(
             "encoding_video_for_gemini",
             video_path=video_path,
-            size_kb=len(video_data) / 1024,
+            size_kb=file_size / 1024,
             model=self.model
         )
 
+        # 读取并编码视频
+        with open(path, "rb") as f:
+            video_data = base64.b64encode(f.read()).decode("utf-8")
+
         return await self._call_api(
             video_data=video_data,
             mime_type=self._get_mime_type(path),
@@ -204,40 +239,40 @@ class GeminiClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(
-                    "calling_gemini_api",
-                    model=self.model,
-                    base_url=self.base_url,
-                    prompt_length=len(prompt)
-                )
-
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-
-                result = response.json()
-
-                # 提取响应内容
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    candidate = result["candidates"][0]
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        parts = candidate["content"]["parts"]
-                        if len(parts) > 0 and "text" in parts[0]:
-                            analysis_result = parts[0]["text"]
-
-                            logger.info(
-                                "gemini_api_success",
-                                model=self.model,
-                                response_length=len(analysis_result),
-                                usage=result.get("usageMetadata")
-                            )
-
-                            return analysis_result
-
-                # 响应格式不符合预期
-                error_msg = f"Gemini API响应格式异常: {result}"
-                logger.error("gemini_api_unexpected_response", response=result)
-                raise LLMServiceError(error_msg)
+            client = self._get_http_client()
+            logger.info(
+                "calling_gemini_api",
+                model=self.model,
+                base_url=self.base_url,
+                prompt_length=len(prompt)
+            )
+
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+
+            result = response.json()
+
+            # 提取响应内容
+            if "candidates" in result and len(result["candidates"]) > 0:
+                candidate = result["candidates"][0]
+                if "content" in candidate and "parts" in candidate["content"]:
+                    parts = candidate["content"]["parts"]
+                    if len(parts) > 0 and "text" in parts[0]:
+                        analysis_result = parts[0]["text"]
+
+                        logger.info(
+                            "gemini_api_success",
+                            model=self.model,
+                            response_length=len(analysis_result),
+                            usage=result.get("usageMetadata")
+                        )
+
+                        return analysis_result
+
+            # 响应格式不符合预期
+            error_msg = f"Gemini API响应格式异常: {result}"
+            logger.error("gemini_api_unexpected_response", response=result)
+            raise LLMServiceError(error_msg)
 
         except httpx.HTTPStatusError as e:
             error_msg = f"Gemini API HTTP错误 ({e.response.status_code}): {e.response.text}"
@@ -246,7 +281,8 @@ class GeminiClient:
                 status_code=e.response.status_code,
                 error=e.response.text
             )
-            raise LLMServiceError(error_msg)
+            # 429（配额/限流）可稍后重试
+            raise LLMServiceError(error_msg, recoverable=e.response.status_code == 429)
 
         except httpx.TimeoutException:
             error_msg = f"Gemini API请求超时（>{self.timeout}秒）"
@@ -319,35 +355,35 @@ class GeminiClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(
-                    "calling_gemini_chat",
-                    model=self.model,
-                    prompt_length=len(prompt)
-                )
-
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-
-                result = response.json()
-
-                if "candidates" in result and len(result["candidates"]) > 0:
-                    candidate = result["candidates"][0]
-                    if "content" in candidate and "parts" in candidate["content"]:
-                        parts = candidate["content"]["parts"]
-                        if len(parts) > 0 and "text" in parts[0]:
-                            reply = parts[0]["text"]
-
-                            logger.info(
-                                "gemini_chat_success",
-                                response_length=len(reply)
-                            )
-
-                            return reply
-
-                error_msg = f"Gemini API响应格式异常: {result}"
-                logger.error("gemini_chat_unexpected_response", response=result)
-                raise LLMServiceError(error_msg)
+            client = self._get_http_client()
+            logger.info(
+                "calling_gemini_chat",
+                model=self.model,
+                prompt_length=len(prompt)
+            )
+
+            response = await client.post(url, json=payload)
+            response.raise_for_status()
+
+            result = response.json()
+
+            if "candidates" in result and len(result["candidates"]) > 0:
+                candidate = result["candidates"][0]
+                if "content" in candidate and "parts" in candidate["content"]:
+                    parts = candidate["content"]["parts"]
+                    if len(parts) > 0 and "text" in parts[0]:
+                        reply = parts[0]["text"]
+
+                        logger.info(
+                            "gemini_chat_success",
+                            response_length=len(reply)
+                        )
+
+                        return reply
+
+            error_msg = f"Gemini API响应格式异常: {result}"
+            logger.error("gemini_chat_unexpected_response", response=result)
+            raise LLMServiceError(error_msg)
 
         except Exception as e:
             logger.error("gemini_chat_exception", error=str(e))
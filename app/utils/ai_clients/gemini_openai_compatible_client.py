@@ -3,6 +3,7 @@ Gemini OpenAI兼容客户端
 支持通过OpenAI兼容的代理服务访问Gemini
 """
 from typing import Optional
+import asyncio
 import httpx
 import base64
 from pathlib import Path
@@ -13,6 +14,13 @@ from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 安装了 h2 时启用 HTTP/2，多个请求复用同一连接
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 
 class GeminiOpenAICompatibleClient:
     """
@@ -44,6 +52,8 @@ class GeminiOpenAICompatibleClient:
         self.base_url = (base_url or settings.GEMINI_BASE_URL).rstrip('/')
         self.model = model or settings.GEMINI_MODEL or "gemini-2.0-flash"
         self.timeout = timeout
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._http_loop: Optional[asyncio.AbstractEventLoop] = None
 
         if not self.api_key:
             raise ValueError("API密钥未配置，请设置GEMINI_API_KEY环境变量")
@@ -55,6 +65,29 @@ class GeminiOpenAICompatibleClient:
             timeout=self.timeout
         )
 
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        获取复用的HTTP客户端（同一事件循环内共享连接池，避免每次请求重新握手）
+
+        AsyncClient 绑定创建时的事件循环，循环变化（例如多次 asyncio.run）时重新创建
+        """
+        loop = asyncio.get_running_loop()
+        if self._http_client is None or self._http_client.is_closed or self._http_loop is not loop:
+            self._http_client = httpx.AsyncClient(
+                http2=_HTTP2_AVAILABLE,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=self.timeout
+            )
+            self._http_loop = loop
+        return self._http_client
+
+    async def aclose(self):
+        """关闭复用的HTTP客户端"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+            self._http_loop = None
+
     async def analyze_video_from_path(
         self,
         video_path: str,
@@ -75,20 +108,22 @@ class GeminiOpenAICompatibleClient:
             视频分析结果文本
         """
         path = Path(video_path)
-        if not path.exists():
+        try:
+            file_size = path.stat().st_size
+        except FileNotFoundError:
             raise FileNotFoundError(f"视频文件不存在：{video_path}")
 
-        # 读取并编码视频
-        with open(path, "rb") as f:
-            video_data = base64.b64encode(f.read()).decode("utf-8")
-
         logger.info(
             "encoding_video_for_gemini_openai",
             video_path=video_path,
-            size_kb=len(video_data) / 1024,
+            size_kb=file_size / 1024,
             model=self.model
         )
 
+        # 读取并编码视频
+        with open(path, "rb") as f:
+            video_data = base64.b64encode(f.read()).decode("utf-8")
+
         # 构建data URI
         mime_type = self._get_mime_type(path)
         video_url = f"data:{mime_type};base64,{video_data}"
@@ -186,42 +221,42 @@ class GeminiOpenAICompatibleClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(
-                    "calling_gemini_openai_api",
-                    model=self.model,
-                    base_url=self.base_url,
-                    prompt_length=len(prompt)
-                )
+            client = self._get_http_client()
+            logger.info(
+                "calling_gemini_openai_api",
+                model=self.model,
+                base_url=self.base_url,
+                prompt_length=len(prompt)
+            )
 
-                response = await client.post(
-                    self.base_url,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
+            response = await client.post(
+                self.base_url,
+                json=payload,
+                headers=headers
+            )
+            response.raise_for_status()
 
-                result = response.json()
+            result = response.json()
 
-                # 提取OpenAI格式的响应
-                if "choices" in result and len(result["choices"]) > 0:
-                    choice = result["choices"][0]
-                    if "message" in choice and "content" in choice["message"]:
-                        content = choice["message"]["content"]
+            # 提取OpenAI格式的响应
+            if "choices" in result and len(result["choices"]) > 0:
+                choice = result["choices"][0]
+                if "message" in choice and "content" in choice["message"]:
+                    content = choice["message"]["content"]
 
-                        logger.info(
-                            "gemini_openai_api_success",
-                            model=self.model,
-                            response_length=len(content),
-                            usage=result.get("usage")
-                        )
+                    logger.info(
+                        "gemini_openai_api_success",
+                        model=self.model,
+                        response_length=len(content),
+                        usage=result.get("usage")
+                    )
 
-                        return content
+                    return content
 
-                # 响应格式不符合预期
-                error_msg = f"API响应格式异常: {result}"
-                logger.error("gemini_openai_api_unexpected_response", response=result)
-                raise LLMServiceError(error_msg)
+            # 响应格式不符合预期
+            error_msg = f"API响应格式异常: {result}"
+            logger.error("gemini_openai_api_unexpected_response", response=result)
+            raise LLMServiceError(error_msg)
 
         except httpx.HTTPStatusError as e:
             error_msg = f"API HTTP错误 ({e.response.status_code}): {e.response.text}"
@@ -230,7 +265,8 @@ class GeminiOpenAICompatibleClient:
                 status_code=e.response.status_code,
                 error=e.response.text
             )
-            raise LLMServiceError(error_msg)
+            # 429（配额/限流）可稍后重试
+            raise LLMServiceError(error_msg, recoverable=e.response.status_code == 429)
 
         except httpx.TimeoutException:
             error_msg = f"API请求超时（>{self.timeout}秒）"
@@ -285,35 +321,35 @@ class GeminiOpenAICompatibleClient:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(
-                    "calling_gemini_openai_chat",
-                    model=self.model,
-                    prompt_length=len(prompt)
-                )
+            client = self._get_http_client()
+            logger.info(
+                "calling_gemini_openai_chat",
+                model=self.model,
+                prompt_length=len(prompt)
+            )
 
-                response = await client.post(
-                    self.base_url,
-                    json=payload,
-                    headers=headers
-                )
-                response.raise_for_status()
+            response = await client.post(
+                self.base_url,
+                json=payload,
+                headers=headers
+            )
+            response.raise_for_status()
 
-                result = response.json()
+            result = response.json()
 
-                if "choices" in result and len(result["choices"]) > 0:
-                    content = result["choices"][0]["message"]["content"]
+            if "choices" in result and len(result["choices"]) > 0:
+                content = result["choices"][0]["message"]["content"]
 
-                    logger.info(
-                        "gemini_openai_chat_success",
-                        response_length=len(content)
-                    )
+                logger.info(
+                    "gemini_openai_chat_success",
+                    response_length=len(content)
+                )
 
-                    return content
+                return content
 
-                error_msg = f"API响应格式异常: {result}"
-                logger.error("gemini_openai_chat_unexpected_response", response=result)
-                raise LLMServiceError(error_msg)
+            error_msg = f"API响应格式异常: {result}"
+            logger.error("gemini_openai_chat_unexpected_response", response=result)
+            raise LLMServiceError(error_msg)
 
         except Exception as e:
             logger.error("gemini_openai_chat_exception", error=str(e))
@@ -3,10 +3,13 @@
 提供纯粹的音频操作功能，不包含业务状态管理
 """
 import os
-from typing import Optional
-from moviepy import VideoFileClip
+import subprocess
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
+from app.utils.ffmpeg_worker import get_ffmpeg_pool
 from app.utils.logger import get_logger
+from app.utils.video_utils import concat_stream_copy
 
 logger = get_logger(__name__)
 
@@ -15,6 +18,60 @@ logger = get_logger(__name__)
 # 音频提取
 # ============================================
 
+# 音频编码 → 可直接容纳该编码（无需重新编码）的输出文件后缀
+STREAM_COPY_CONTAINERS = {
+    'aac': ('.m4a', '.aac'),
+    'mp3': ('.mp3',),
+    'opus': ('.ogg', '.opus'),
+    'vorbis': ('.ogg',),
+    'flac': ('.flac',),
+}
+
+
+@lru_cache(maxsize=256)
+def _probe_audio_codec(video_path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """
+    探测第一条音频流的编码（按 路径+修改时间+大小 进程内缓存）
+
+    Returns:
+        编码名称（如 aac），无音轨或探测失败时返回None
+    """
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error',
+                '-select_streams', 'a:0',
+                '-show_entries', 'stream=codec_name',
+                '-of', 'csv=p=0',
+                video_path
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def _can_stream_copy(video_path: str, output_path: str) -> bool:
+    """输出文件后缀能否直接容纳源视频的音频编码"""
+    stat = os.stat(video_path)
+    codec = _probe_audio_codec(os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+    suffix = os.path.splitext(output_path)[1].lower()
+    return suffix in STREAM_COPY_CONTAINERS.get(codec, ())
+
+
+# 采样字节数 → 对应位宽的 PCM 编码器
+PCM_CODECS_BY_NBYTES = {
+    1: 'pcm_u8',
+    2: 'pcm_s16le',
+    3: 'pcm_s24le',
+    4: 'pcm_s32le',
+}
+
+
 def extract_audio_from_video(
     video_path: str,
     output_path: str,
@@ -22,62 +79,161 @@ def extract_audio_from_video(
     bitrate: str = "192k",
     fps: Optional[int] = None,
     nbytes: Optional[int] = None,
-    ffmpeg_params: Optional[list] = None
+    ffmpeg_params: Optional[list] = None,
+    stream_copy: bool = True
 ) -> str:
     """
     从视频提取音频（纯工具函数）
 
+    输出格式能直接容纳源音频编码（如 aac → .m4a）且未要求重采样时，直接复制音频流，不重新编码；
+    否则用一次ffmpeg调用重新编码
+
     Args:
         video_path: 视频文件路径
         output_path: 输出音频路径
         audio_codec: 音频编码器 (mp3, aac, pcm_s16le等)
         bitrate: 音频码率
         fps: 采样率（如16000用于ASR）
-        nbytes: 字节数（如2表示16位）
+        nbytes: 字节数（如2表示16位）；PCM 编码时决定输出位宽（见 PCM_CODECS_BY_NBYTES），
+                有损编码的位宽由编码器决定，与 MoviePy 的行为一致
         ffmpeg_params: 额外的ffmpeg参数（如["-ac", "1"]表示单声道）
+        stream_copy: 是否允许直接复制音频流（设为False时总是按 audio_codec 重新编码）
 
     Returns:
         输出音频文件路径
 
     Raises:
         FileNotFoundError: 视频文件不存在
+        ValueError: PCM 编码不支持指定的 nbytes
         RuntimeError: 提取失败
     """
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"视频文件不存在: {video_path}")
 
+    if nbytes is not None and audio_codec.startswith('pcm_'):
+        if nbytes not in PCM_CODECS_BY_NBYTES:
+            raise ValueError(f"不支持的PCM采样字节数: {nbytes}")
+        audio_codec = PCM_CODECS_BY_NBYTES[nbytes]
+
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+    if (
+        stream_copy
+        and fps is None and nbytes is None and ffmpeg_params is None
+        and _can_stream_copy(video_path, output_path)
+    ):
+        try:
+            get_ffmpeg_pool().run(['-i', video_path, '-vn', '-acodec', 'copy', output_path])
+            logger.info(f"音频提取成功（流复制）: {output_path}")
+            return output_path
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.warning(f"音频流复制失败，回退到重新编码: {getattr(e, 'stderr', e)}")
+
+    # 构建参数（-map 0:a:0 在视频没有音轨时直接报错）
+    args = ['-i', video_path, '-map', '0:a:0', '-vn', '-c:a', audio_codec]
+    if not audio_codec.startswith('pcm_'):
+        args.extend(['-b:a', bitrate])
+    if fps is not None:
+        args.extend(['-ar', str(fps)])
+    if ffmpeg_params is not None:
+        args.extend(ffmpeg_params)
+    args.append(output_path)
+
     try:
         logger.info(f"开始从视频提取音频: {video_path}")
+        get_ffmpeg_pool().run(args)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"音频提取失败: {getattr(e, 'stderr', e)}")
 
-        # 使用MoviePy提取音频
-        with VideoFileClip(video_path) as video:
-            if video.audio is None:
-                raise RuntimeError("视频没有音轨")
-
-            # 构建参数
-            kwargs = {
-                'codec': audio_codec,
-                'bitrate': bitrate
-            }
-
-            # 添加可选参数
-            if fps is not None:
-                kwargs['fps'] = fps
-            if nbytes is not None:
-                kwargs['nbytes'] = nbytes
-            if ffmpeg_params is not None:
-                kwargs['ffmpeg_params'] = ffmpeg_params
-
-            # 提取音频并保存
-            video.audio.write_audiofile(output_path, **kwargs)
-
-        logger.info(f"音频提取成功: {output_path}")
-        return output_path
+    logger.info(f"音频提取成功: {output_path}")
+    return output_path
 
-    except Exception as e:
-        raise RuntimeError(f"音频提取失败: {str(e)}")
+
+# 输出文件后缀 → ffmpeg 音频编码器
+AUDIO_ENCODERS = {
+    '.mp3': 'libmp3lame',
+    '.wav': 'pcm_s16le',
+    '.m4a': 'aac',
+    '.aac': 'aac',
+    '.flac': 'flac',
+    '.ogg': 'libvorbis',
+}
+
+
+def _encode_args(format: str, bitrate: Optional[str] = None) -> List[str]:
+    """
+    按输出格式生成编码参数
+
+    Args:
+        format: 输出格式 (mp3, wav, aac等)
+        bitrate: 有损编码的音频码率，None时使用编码器默认值
+
+    Returns:
+        ffmpeg 编码参数；格式不在 AUDIO_ENCODERS 中时交给ffmpeg按后缀自动选择
+    """
+    encoder = AUDIO_ENCODERS.get(f'.{format.lower()}')
+    args = ['-c:a', encoder] if encoder else []
+    if bitrate and encoder != 'pcm_s16le':
+        args.extend(['-b:a', bitrate])
+    return args
+
+
+def extract_and_derive(
+    video_path: str,
+    outputs: List[Tuple[str, Optional[Tuple[float, float]]]],
+    bitrate: str = "192k"
+) -> List[str]:
+    """
+    一次ffmpeg调用从视频提取多个音频输出（纯工具函数）
+
+    源视频只读取、解码一次，各输出分别编码；适合同时需要多种格式或片段的场景，
+    代替 extract_audio_from_video + convert_audio_format + trim_audio 多次调用
+
+    Args:
+        video_path: 视频文件路径
+        outputs: [(输出路径, 裁剪范围(开始秒, 结束秒) 或 None)]，编码器由输出后缀决定
+        bitrate: 有损编码的音频码率
+
+    Returns:
+        输出音频文件路径列表（与 outputs 顺序一致）
+
+    Raises:
+        FileNotFoundError: 视频文件不存在
+        ValueError: 输出列表为空、不支持的输出格式或裁剪范围无效
+        RuntimeError: 提取失败
+    """
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"视频文件不存在: {video_path}")
+
+    if not outputs:
+        raise ValueError("输出列表不能为空")
+
+    cmd = ['-i', video_path]
+    for output_path, trim in outputs:
+        suffix = os.path.splitext(output_path)[1].lower()
+        if suffix not in AUDIO_ENCODERS:
+            raise ValueError(f"不支持的输出格式: {output_path}")
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+        cmd.extend(['-map', '0:a:0', '-vn', '-c:a', AUDIO_ENCODERS[suffix]])
+        if suffix != '.wav':
+            cmd.extend(['-b:a', bitrate])
+        if trim is not None:
+            start_time, end_time = trim
+            if start_time >= end_time:
+                raise ValueError(f"无效的时间范围: {start_time} >= {end_time}")
+            cmd.extend(['-ss', f'{start_time:.3f}', '-to', f'{end_time:.3f}'])
+        cmd.append(output_path)
+
+    try:
+        logger.info(f"开始从视频提取 {len(outputs)} 个音频输出: {video_path}")
+        get_ffmpeg_pool().run(cmd)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"音频提取失败: {getattr(e, 'stderr', e)}")
+
+    logger.info(f"音频提取成功: {len(outputs)} 个输出")
+    return [output_path for output_path, _ in outputs]
 
 
 # ============================================
@@ -113,30 +269,19 @@ def convert_audio_format(
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    try:
-        from pydub import AudioSegment
+    args = ['-i', input_path, '-vn', *_encode_args(target_format, bitrate)]
+    if sample_rate:
+        args.extend(['-ar', str(sample_rate)])
+    args.append(output_path)
 
+    try:
         logger.info(f"开始转换音频格式: {input_path} -> {target_format}")
+        get_ffmpeg_pool().run(args)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"音频格式转换失败: {getattr(e, 'stderr', e)}")
 
-        # 加载音频
-        audio = AudioSegment.from_file(input_path)
-
-        # 调整采样率
-        if sample_rate:
-            audio = audio.set_frame_rate(sample_rate)
-
-        # 导出
-        audio.export(
-            output_path,
-            format=target_format,
-            bitrate=bitrate
-        )
-
-        logger.info(f"音频格式转换成功: {output_path}")
-        return output_path
-
-    except Exception as e:
-        raise RuntimeError(f"音频格式转换失败: {str(e)}")
+    logger.info(f"音频格式转换成功: {output_path}")
+    return output_path
 
 
 # ============================================
@@ -151,6 +296,8 @@ def merge_audio_files(
     """
     合并多个音频文件（纯工具函数）
 
+    各音频编码参数一致且输出为同一格式时直接流复制拼接，否则解码后重新导出
+
     Args:
         audio_paths: 音频文件路径列表
         output_path: 输出路径
@@ -172,6 +319,13 @@ def merge_audio_files(
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+    if (
+        os.path.splitext(output_path)[1].lower() == f".{format}"
+        and concat_stream_copy(audio_paths, output_path)
+    ):
+        logger.info(f"音频合并成功（流复制）: {output_path}")
+        return output_path
+
     try:
         from pydub import AudioSegment
 
@@ -232,24 +386,17 @@ def trim_audio(
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    try:
-        from pydub import AudioSegment
+    # -ss/-to 放在 -i 之前，直接定位到开始时间，不解码前面的部分
+    args = [
+        '-ss', f'{start_time:.3f}', '-to', f'{end_time:.3f}', '-i', audio_path,
+        '-vn', *_encode_args(format), output_path
+    ]
 
+    try:
         logger.info(f"开始裁剪音频: {start_time}s - {end_time}s")
+        get_ffmpeg_pool().run(args)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise RuntimeError(f"音频裁剪失败: {getattr(e, 'stderr', e)}")
 
-        # 加载音频
-        audio = AudioSegment.from_file(audio_path)
-
-        # 裁剪 (pydub使用毫秒)
-        start_ms = int(start_time * 1000)
-        end_ms = int(end_time * 1000)
-        trimmed = audio[start_ms:end_ms]
-
-        # 导出
-        trimmed.export(output_path, format=format)
-
-        logger.info(f"音频裁剪成功: {output_path}")
-        return output_path
-
-    except Exception as e:
-        raise RuntimeError(f"音频裁剪失败: {str(e)}")
+    logger.info(f"音频裁剪成功: {output_path}")
+    return output_path
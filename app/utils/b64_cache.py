@@ -0,0 +1,136 @@
+"""
+视频base64编码缓存（进程内存 + 磁盘）
+同一文件（路径、修改时间、大小均未变化）只编码一次，后续直接读取缓存结果
+"""
+import os
+import base64
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import BinaryIO, Optional, Tuple
+
+from app.config import settings
+from app.utils.logger import get_logger
+from app.utils.pipeline import pipelined_copy
+
+logger = get_logger(__name__)
+
+# 每次读取的原始字节数，必须是3的倍数，保证分块编码结果可以直接拼接
+# b64encode 执行期间持有GIL，分块较小可让调用方（to_thread）所在的事件循环及时得到调度
+ENCODE_CHUNK_SIZE = 3 * 256 * 1024
+
+# 读线程最多预读的分块数
+ENCODE_PIPELINE_DEPTH = 4
+
+# 进程内内存缓存上限（按base64字符串长度计），超出时淘汰最久未使用的条目
+MEMORY_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+CacheKey = Tuple[str, int, int]
+
+_memory_cache: "OrderedDict[CacheKey, str]" = OrderedDict()
+_memory_cache_bytes = 0
+_memory_cache_lock = threading.Lock()
+
+
+def _cache_key(path: str) -> CacheKey:
+    """缓存键：(绝对路径, mtime_ns, size)"""
+    stat = os.stat(path)
+    return os.path.abspath(path), stat.st_mtime_ns, stat.st_size
+
+
+def _cache_path(key: CacheKey, cache_dir: str) -> str:
+    """根据缓存键计算缓存文件路径"""
+    digest = hashlib.blake2b(":".join(map(str, key)).encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.b64")
+
+
+def _remember(key: CacheKey, value: str) -> str:
+    """写入内存缓存并按容量淘汰"""
+    global _memory_cache_bytes
+    if len(value) > MEMORY_CACHE_MAX_BYTES:
+        return value
+
+    with _memory_cache_lock:
+        if key not in _memory_cache:
+            _memory_cache[key] = value
+            _memory_cache_bytes += len(value)
+        while _memory_cache_bytes > MEMORY_CACHE_MAX_BYTES:
+            _, evicted = _memory_cache.popitem(last=False)
+            _memory_cache_bytes -= len(evicted)
+    return value
+
+
+def clear_memory_cache() -> None:
+    """清空进程内内存缓存（磁盘缓存不受影响）"""
+    global _memory_cache_bytes
+    with _memory_cache_lock:
+        _memory_cache.clear()
+        _memory_cache_bytes = 0
+
+
+def _encode_pipelined(path: str, dst: BinaryIO) -> None:
+    """
+    流水线编码：读线程预读后续分块，当前线程编码并写出
+
+    读文件时释放GIL，磁盘读取与编码可以重叠；队列有界，预读内存不超过
+    ENCODE_PIPELINE_DEPTH 个分块
+
+    Args:
+        path: 源文件路径
+        dst: 编码结果写入的文件对象
+    """
+    with open(path, "rb") as src:
+        pipelined_copy(
+            lambda: src.read(ENCODE_CHUNK_SIZE),
+            lambda chunk: dst.write(base64.b64encode(chunk)),
+            ENCODE_PIPELINE_DEPTH,
+            name="b64-reader"
+        )
+
+
+def get_or_encode(path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    获取文件的base64编码，命中缓存时不再重新读取和编码源文件
+
+    先查进程内内存缓存，再查磁盘缓存，都未命中时才编码源文件
+
+    Args:
+        path: 源文件路径
+        cache_dir: 缓存目录，默认 {cache_dir}/b64
+
+    Returns:
+        base64编码字符串（不包含data URI前缀）
+
+    Raises:
+        FileNotFoundError: 源文件不存在
+    """
+    key = _cache_key(path)
+    with _memory_cache_lock:
+        if key in _memory_cache:
+            _memory_cache.move_to_end(key)
+            return _memory_cache[key]
+
+    cache_dir = cache_dir or os.path.join(settings.cache_dir, "b64")
+    cached = _cache_path(key, cache_dir)
+
+    if os.path.exists(cached):
+        logger.debug("b64_cache_hit", path=path)
+        with open(cached, "r", encoding="ascii") as f:
+            return _remember(key, f.read())
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # 分块编码写入临时文件，完成后原子替换，避免并发读到半成品
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as dst:
+            _encode_pipelined(path, dst)
+        os.replace(tmp_path, cached)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+    logger.info("b64_cache_stored", path=path, cache_file=cached)
+    with open(cached, "r", encoding="ascii") as f:
+        return _remember(key, f.read())
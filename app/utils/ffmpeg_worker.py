@@ -0,0 +1,96 @@
+"""
+ffmpeg 调用池
+音视频工具函数通过同一个池执行ffmpeg命令：可执行文件路径只解析一次，
+信号量限制同时运行的ffmpeg进程数，统一的基础参数（-nostdin 等）避免子进程等待终端输入；
+进度统计和banner不输出，只通过管道读取错误信息
+"""
+import os
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 默认同时运行的ffmpeg进程上限
+DEFAULT_POOL_SIZE = 4
+
+# 静默参数：不读stdin、不打印版本信息和逐帧进度、只输出错误
+QUIET_ARGS = ['-nostdin', '-hide_banner', '-nostats', '-loglevel', 'error']
+
+# 每条命令都带的基础参数：静默参数 + 覆盖已有输出
+BASE_ARGS = [*QUIET_ARGS, '-y']
+
+
+class FFmpegPool:
+    """
+    ffmpeg 命令执行池
+
+    ffmpeg 命令行进程启动后不能再接收新任务，无法真正“预热”进程复用；
+    池负责复用已解析的可执行文件路径，并限制并发进程数。命令在调用线程中直接执行，
+    不依赖后台线程，fork 出的子进程（Celery prefork、ProcessPoolExecutor）中同样可用
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, binary: Optional[str] = None):
+        """
+        Args:
+            size: 同时运行的ffmpeg进程上限
+            binary: ffmpeg 可执行文件路径，默认从 PATH 中查找
+        """
+        self.binary = binary or shutil.which('ffmpeg') or 'ffmpeg'
+        self.slots = threading.BoundedSemaphore(size)
+
+    def run(self, args: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """
+        执行ffmpeg命令并等待完成（进程数达到上限时等待空位）
+
+        Args:
+            args: ffmpeg 参数（不含可执行文件和基础参数）
+            timeout: 超时时间（秒）
+
+        Returns:
+            命令执行结果
+
+        Raises:
+            OSError: ffmpeg 无法启动
+            subprocess.CalledProcessError: ffmpeg 返回非零退出码
+            subprocess.TimeoutExpired: 执行超时
+        """
+        with self.slots:
+            return subprocess.run(
+                [self.binary, *BASE_ARGS, *args],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                check=True,
+                text=True,
+                timeout=timeout
+            )
+
+
+_pool: Optional[FFmpegPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_ffmpeg_pool() -> FFmpegPool:
+    """获取全局ffmpeg调用池（首次使用时创建）"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = FFmpegPool()
+                logger.info(f"ffmpeg调用池已创建: {_pool.binary}")
+    return _pool
+
+
+def _reset_after_fork() -> None:
+    """fork 时其他线程可能正持有信号量或锁，子进程中丢弃继承的状态，首次使用时重新创建"""
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -9,6 +9,14 @@ from pydantic import BaseModel, ValidationError
 
 from app.utils.logger import logger
 
+# orjson 为可选依赖：解码大段模型输出比标准库快数倍，未安装时回退到 json
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，下方的异常处理无需区分
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 T = TypeVar('T', bound=BaseModel)
 
 
@@ -128,14 +136,20 @@ class RobustJSONParser:
         if not json_str:
             raise JSONParseError(f"无法从文本中提取JSON对象，文本长度: {len(text)}")
 
+        # 快速路径：pydantic v2 在 Rust 内核中一次完成 JSON 解码和模型验证
+        try:
+            return model.model_validate_json(json_str)
+        except ValidationError as e:
+            logger.debug(f"快速解析失败，回退到逐步解析: {e.error_count()} 个错误")
+
         # 尝试解析策略
         strategies = [
-            ("标准解析", lambda s: json.loads(s)),
+            ("标准解析", _loads),
         ]
 
         if not strict:
             strategies.append(
-                ("修复后解析", lambda s: json.loads(cls.fix_common_json_errors(s)))
+                ("修复后解析", lambda s: _loads(cls.fix_common_json_errors(s)))
             )
 
         last_error = None
@@ -161,7 +175,7 @@ class RobustJSONParser:
 
         # Pydantic验证
         try:
-            return model(**parsed_data)
+            return model.model_validate(parsed_data)
         except ValidationError as e:
             logger.error(f"Pydantic验证失败: {e}")
             raise JSONParseError(f"JSON验证失败: {e}")
@@ -198,12 +212,12 @@ class RobustJSONParser:
 
             # 尝试标准解析
             try:
-                return json.loads(json_str)
+                return _loads(json_str)
             except json.JSONDecodeError:
                 if not strict:
                     # 尝试修复后解析
                     fixed_json = cls.fix_common_json_errors(json_str)
-                    return json.loads(fixed_json)
+                    return _loads(fixed_json)
                 raise
 
         except Exception as e:
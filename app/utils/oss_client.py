@@ -2,8 +2,10 @@
 阿里云OSS客户端
 提供文件上传、下载、删除等基础功能
 """
+import asyncio
 import os
-from typing import Optional, Dict, Any, BinaryIO
+import tempfile
+from typing import Optional, Dict, Any, BinaryIO, Set
 from datetime import datetime, timedelta
 import oss2
 from oss2.credentials import EnvironmentVariableCredentialsProvider
@@ -11,9 +13,19 @@ from oss2.credentials import EnvironmentVariableCredentialsProvider
 from app.config import settings
 from app.core.exceptions import StorageError
 from app.utils.logger import get_logger
+from app.utils.pipeline import pipelined_copy
 
 logger = get_logger(__name__)
 
+# 超过该大小的文件使用分片上传，分片由多个线程并行上传
+MULTIPART_THRESHOLD = 32 * 1024 * 1024
+MULTIPART_PART_SIZE = 8 * 1024 * 1024
+MULTIPART_THREADS = 4
+
+# 下载到文件时每次从网络读取的字节数，以及读线程最多预读的分块数
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_PIPELINE_DEPTH = 4
+
 
 class OSSClient:
     """阿里云OSS客户端封装"""
@@ -97,24 +109,25 @@ class OSSClient:
         try:
             logger.info("downloading_from_oss", oss_path=oss_path, local_path=local_path)
 
+            # oss2 为同步 SDK，网络请求和文件写入都放到线程池执行，避免阻塞事件循环
             # 检查对象是否存在
-            if not self.bucket.object_exists(oss_path):
+            if not await asyncio.to_thread(self.bucket.object_exists, oss_path):
                 raise StorageError(f"OSS对象不存在: {oss_path}")
 
             # 下载文件
             if local_path:
                 # 确保目录存在
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                await asyncio.to_thread(os.makedirs, os.path.dirname(local_path), exist_ok=True)
 
-                # 下载到本地文件
-                result = self.bucket.get_object_to_file(oss_path, local_path)
+                # 下载到本地文件（网络读取与磁盘写入流水线并行）
+                await asyncio.to_thread(self._download_pipelined, oss_path, local_path)
 
-                # 验证下载
-                if not os.path.exists(local_path):
+                # 验证下载（一次 stat 同时完成存在性检查与大小获取）
+                try:
+                    file_size = (await asyncio.to_thread(os.stat, local_path)).st_size
+                except FileNotFoundError:
                     raise StorageError(f"文件下载后未找到: {local_path}")
 
-                file_size = os.path.getsize(local_path)
-
                 logger.info(
                     "oss_download_success",
                     oss_path=oss_path,
@@ -126,8 +139,7 @@ class OSSClient:
 
             else:
                 # 下载到内存
-                result = self.bucket.get_object(oss_path)
-                content = result.read()
+                content = await asyncio.to_thread(lambda: self.bucket.get_object(oss_path).read())
 
                 logger.info(
                     "oss_download_success",
@@ -147,43 +159,115 @@ class OSSClient:
             logger.error("oss_download_exception", oss_path=oss_path, error=error_msg)
             raise StorageError(error_msg)
 
+    def _download_pipelined(self, oss_path: str, local_path: str) -> None:
+        """
+        流水线下载：读线程从网络读取后续分块，当前线程写入磁盘
+
+        网络读取与磁盘写入重叠，耗时约为两者中较大的一个而不是两者之和；
+        与 get_object_to_file 一样校验长度和CRC64，写入临时文件，校验通过后才原子替换到目标路径
+
+        Args:
+            oss_path: OSS对象路径
+            local_path: 本地保存路径
+
+        Raises:
+            StorageError: 下载的字节数与 Content-Length 不一致
+            oss2.exceptions.InconsistentError: CRC64校验失败
+        """
+        result = self.bucket.get_object(oss_path)
+        received = 0
+
+        def write(chunk: bytes) -> None:
+            nonlocal received
+            dst.write(chunk)
+            received += len(chunk)
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(local_path) or None, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                pipelined_copy(
+                    lambda: result.read(DOWNLOAD_CHUNK_SIZE),
+                    write,
+                    DOWNLOAD_PIPELINE_DEPTH,
+                    name="oss-download-reader"
+                )
+
+            if result.content_length is not None and received != result.content_length:
+                raise StorageError(
+                    f"OSS下载不完整: 已接收 {received} 字节，应为 {result.content_length} 字节"
+                )
+            if self.bucket.enable_crc:
+                oss2.utils.check_crc('get', result.client_crc, result.server_crc, result.request_id)
+
+            os.replace(tmp_path, local_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
     async def upload(
         self,
         local_path: str,
         oss_path: str,
-        content_type: Optional[str] = None
+        content_type: Optional[str] = None,
+        signed_url_expires: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         上传文件到OSS
 
+        oss2 为同步 SDK，上传放到线程池执行；大文件按分片并行上传
+
         Args:
             local_path: 本地文件路径
             oss_path: OSS对象路径
             content_type: Content-Type（可选，自动检测）
+            signed_url_expires: 签名URL有效期（秒，可选）
+                               提供时在结果中附带 GET 签名URL，无需再单独调用 generate_signed_url
 
         Returns:
             Dict: 上传结果
                 - oss_path: OSS对象路径
                 - public_url: 公网访问URL（如果Bucket公开）
+                - signed_url: 签名URL（仅当提供 signed_url_expires 时）
                 - size: 文件大小
 
         Raises:
             StorageError: 上传失败时抛出
         """
         try:
-            if not os.path.exists(local_path):
+            try:
+                file_size = os.stat(local_path).st_size
+            except FileNotFoundError:
                 raise StorageError(f"本地文件不存在: {local_path}")
 
             logger.info("uploading_to_oss", local_path=local_path, oss_path=oss_path)
 
-            # 上传文件
-            result = self.bucket.put_object_from_file(
-                oss_path,
-                local_path,
-                headers={'Content-Type': content_type} if content_type else None
+            headers = {'Content-Type': content_type} if content_type else None
+
+            # 签名只依赖对象路径，在本地计算，不必等待上传完成
+            signed_url = (
+                self.generate_signed_url(oss_path, expires=signed_url_expires)
+                if signed_url_expires else None
             )
 
-            file_size = os.path.getsize(local_path)
+            # 上传文件
+            if file_size > MULTIPART_THRESHOLD:
+                result = await asyncio.to_thread(
+                    oss2.resumable_upload,
+                    self.bucket,
+                    oss_path,
+                    local_path,
+                    headers=headers,
+                    multipart_threshold=MULTIPART_THRESHOLD,
+                    part_size=MULTIPART_PART_SIZE,
+                    num_threads=MULTIPART_THREADS
+                )
+            else:
+                result = await asyncio.to_thread(
+                    self.bucket.put_object_from_file,
+                    oss_path,
+                    local_path,
+                    headers=headers
+                )
 
             # 生成公网URL（如果Bucket是公开的）
             public_url = f"https://{self.bucket_name}.{self.endpoint}/{oss_path}"
@@ -194,12 +278,15 @@ class OSSClient:
                 file_size_mb=file_size / (1024 * 1024)
             )
 
-            return {
+            upload_result = {
                 "oss_path": oss_path,
                 "public_url": public_url,
                 "size": file_size,
                 "etag": result.etag if hasattr(result, 'etag') else None
             }
+            if signed_url:
+                upload_result["signed_url"] = signed_url
+            return upload_result
 
         except Exception as e:
             error_msg = f"OSS上传失败: {str(e)}"
@@ -285,6 +372,28 @@ class OSSClient:
             logger.error("oss_exists_check_failed", oss_path=oss_path, error=str(e))
             return False
 
+    def list_object_keys(self, prefix: str = "") -> Set[str]:
+        """
+        列出指定前缀下的所有对象路径
+
+        需要检查多个对象是否存在时，一次列举（分页）代替逐个 object_exists 请求
+
+        Args:
+            prefix: OSS对象路径前缀（例如: "test/"）
+
+        Returns:
+            Set[str]: 对象路径集合
+
+        Raises:
+            StorageError: 列举失败时抛出
+        """
+        try:
+            return {obj.key for obj in oss2.ObjectIterator(self.bucket, prefix=prefix)}
+        except Exception as e:
+            error_msg = f"OSS列举对象失败: {str(e)}"
+            logger.error("oss_list_objects_failed", prefix=prefix, error=error_msg)
+            raise StorageError(error_msg)
+
 
 # 单例实例（可选）
 oss_client = OSSClient()
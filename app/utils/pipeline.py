@@ -0,0 +1,57 @@
+"""
+分块读写流水线
+读线程预读后续分块，调用线程处理并写出当前分块；磁盘/网络读取时释放GIL，
+读取与处理、写出可以重叠进行
+"""
+import queue
+import threading
+from typing import Callable, Union
+
+
+def pipelined_copy(
+    read_chunk: Callable[[], bytes],
+    write_chunk: Callable[[bytes], None],
+    depth: int,
+    name: str = "pipeline-reader"
+) -> None:
+    """
+    流水线复制：读线程反复调用 read_chunk，调用线程对每个分块调用 write_chunk
+
+    队列有界，预读内存不超过 depth 个分块；任一侧出错时另一侧随即停止
+
+    Args:
+        read_chunk: 读取下一个分块，返回空bytes表示结束（在读线程中调用）
+        write_chunk: 处理并写出一个分块（在调用线程中调用）
+        depth: 读线程最多预读的分块数
+        name: 读线程名称
+
+    Raises:
+        读取或写出过程中的异常原样抛出
+    """
+    chunks: "queue.Queue[Union[bytes, BaseException, None]]" = queue.Queue(depth)
+    stop = threading.Event()
+
+    def reader() -> None:
+        try:
+            while not stop.is_set() and (chunk := read_chunk()):
+                chunks.put(chunk)
+            chunks.put(None)
+        except BaseException as e:
+            chunks.put(e)
+
+    thread = threading.Thread(target=reader, name=name, daemon=True)
+    thread.start()
+    try:
+        while (item := chunks.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            write_chunk(item)
+    finally:
+        # 写出侧出错时通知读线程停止，并取走阻塞在队列上的分块
+        stop.set()
+        while thread.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        thread.join()
@@ -8,24 +8,102 @@
 - 纯函数设计，无副作用
 """
 import os
+import mmap
+import asyncio
+import json
+import hashlib
+import shutil
+import tempfile
 import subprocess
 import base64
-from typing import Dict, Any, Optional, Tuple, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, List, Iterator
 from moviepy import VideoFileClip, concatenate_videoclips
 
+from app.config import settings
+from app.utils.ffmpeg_worker import QUIET_ARGS, get_ffmpeg_pool
 from app.utils.logger import get_logger
 
+# PyNvVideoCodec 为可选依赖（仅 NVIDIA GPU 环境安装），未安装时不提供 pynvc 拼接后端
+try:
+    import PyNvVideoCodec as nvc
+except ImportError:
+    nvc = None
+
 logger = get_logger(__name__)
 
+# NVENC 编码参数：p4 为速度与质量的均衡预设，低延迟调优，恒定质量的可变码率
+NVENC_CODEC = "h264_nvenc"
+NVENC_FFMPEG_PARAMS = ['-preset', 'p4', '-tune', 'll', '-rc', 'vbr', '-cq', '23']
+
+# PyNvVideoCodec 拼接时同时进行的 解码+编码 会话数（受显卡NVDEC引擎数和NVENC会话数限制）
+PYNVC_MAX_SESSIONS = 3
+
+
+@lru_cache(maxsize=None)
+def nvenc_available(ffmpeg_path: str = "ffmpeg") -> bool:
+    """
+    检测 NVENC 硬件编码是否可用（结果按进程缓存）
+
+    编码器列表中存在 h264_nvenc 不代表有可用的显卡，因此实际编码一帧验证
+
+    Args:
+        ffmpeg_path: ffmpeg可执行文件路径
+
+    Returns:
+        是否可用
+    """
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg_path, '-hide_banner', '-loglevel', 'error',
+                '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+                '-frames:v', '1', '-c:v', NVENC_CODEC, '-f', 'null', '-'
+            ],
+            capture_output=True,
+            timeout=10
+        )
+        available = result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        available = False
+
+    logger.info(f"NVENC 硬件编码可用: {available}")
+    return available
+
+
+def _resolve_video_codec(codec: str, hw_accel: Optional[str]) -> Tuple[str, Optional[List[str]]]:
+    """
+    根据硬件加速选项确定实际使用的视频编码器和附加ffmpeg参数
+
+    Args:
+        codec: 软件编码器
+        hw_accel: None 使用软件编码；"auto" NVENC 可用时使用；"nvenc" 强制使用
+
+    Returns:
+        (视频编码器, 附加ffmpeg参数)
+    """
+    if hw_accel == "nvenc" or (hw_accel == "auto" and nvenc_available()):
+        return NVENC_CODEC, NVENC_FFMPEG_PARAMS
+    if hw_accel not in (None, "auto"):
+        raise ValueError(f"不支持的硬件加速选项: {hw_accel}")
+    return codec, None
+
 
 # ============================================
 # 视频基本信息获取
 # ============================================
 
+# 进程内缓存的视频信息条数
+PROBE_CACHE_MAX_ENTRIES = 256
+
+
 def get_video_info(video_path: str) -> Dict[str, Any]:
     """
     使用MoviePy获取视频基本信息（轻量级，按需使用）
 
+    结果按 路径+修改时间+大小 缓存（进程内 + 磁盘），文件未变化时不再重新探测
+
     Args:
         video_path: 视频文件路径
 
@@ -41,14 +119,56 @@ def get_video_info(video_path: str) -> Dict[str, Any]:
         - 时长验证
         - 分辨率检查
     """
-    if not os.path.exists(video_path):
+    try:
+        stat = os.stat(video_path)
+    except FileNotFoundError:
         raise FileNotFoundError(f"视频文件不存在: {video_path}")
 
+    # 返回副本，调用方修改结果不会污染缓存
+    return dict(_cached_video_info(os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size))
+
+
+async def get_video_info_async(video_path: str) -> Dict[str, Any]:
+    """
+    get_video_info 的异步版本（在线程池中探测，与同步版本共用缓存）
+
+    多个文件可通过 asyncio.gather 并发探测，总耗时取决于最慢的一个
+    """
+    return await asyncio.to_thread(get_video_info, video_path)
+
+
+@lru_cache(maxsize=PROBE_CACHE_MAX_ENTRIES)
+def _cached_video_info(video_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """先查磁盘缓存，未命中时探测视频并写入磁盘缓存"""
+    digest = hashlib.blake2b(f"{video_path}:{mtime_ns}:{size}".encode("utf-8"), digest_size=16).hexdigest()
+    cache_dir = os.path.join(settings.cache_dir, "probe")
+    cached = os.path.join(cache_dir, f"{digest}.json")
+
     try:
-        with VideoFileClip(video_path) as clip:
-            # 获取文件大小
-            file_size = os.path.getsize(video_path)
+        with open(cached, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    info = _probe_video_info(video_path, size)
+
+    # 缓存写入失败不影响结果；先写临时文件再原子替换，避免并发读到半成品
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        os.replace(tmp_path, cached)
+    except OSError as e:
+        logger.debug(f"视频信息缓存写入失败: {e}")
+
+    return info
+
 
+def _probe_video_info(video_path: str, file_size: int) -> Dict[str, Any]:
+    """使用MoviePy探测视频信息"""
+    try:
+        with VideoFileClip(video_path) as clip:
             info = {
                 'duration': clip.duration,          # 时长（秒）
                 'width': clip.w,                    # 宽度
@@ -106,7 +226,7 @@ def compress_video(
 
     # 构建ffmpeg命令
     cmd = [
-        ffmpeg_path,
+        ffmpeg_path, *QUIET_ARGS,
         '-i', input_path,
         '-c:v', 'libx264',
         '-crf', str(crf),
@@ -128,8 +248,9 @@ def compress_video(
 
         subprocess.run(
             cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             check=True,
-            capture_output=True,
             text=True
         )
 
@@ -163,24 +284,103 @@ def compress_video(
 # 视频片段提取
 # ============================================
 
+# 起点与关键帧的时间差在此范围内时视为对齐，可以直接流复制
+KEYFRAME_TOLERANCE = 0.05
+
+
+def _starts_on_keyframe(video_path: str, start_time: float) -> bool:
+    """
+    判断起点是否落在视频关键帧上
+
+    只解码关键帧（-skip_frame nokey），且只读取起点前后各1秒
+
+    Args:
+        video_path: 视频路径
+        start_time: 起点（秒）
+
+    Returns:
+        是否对齐关键帧（探测失败时返回False）
+    """
+    if start_time <= KEYFRAME_TOLERANCE:
+        # 视频第一帧必然是关键帧
+        return True
+
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error',
+                '-select_streams', 'v:0',
+                '-skip_frame', 'nokey',
+                '-read_intervals', f'{max(0.0, start_time - 1):.3f}%+2',
+                '-show_entries', 'frame=best_effort_timestamp_time',
+                '-of', 'csv=p=0',
+                video_path
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+    for line in result.stdout.split():
+        try:
+            if abs(float(line.strip(',')) - start_time) <= KEYFRAME_TOLERANCE:
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def _stream_copy_clip(video_path: str, start_time: float, end_time: float, output_path: str) -> bool:
+    """
+    不重新编码，直接复制音视频流截取片段
+
+    Returns:
+        是否成功
+    """
+    cmd = [
+        '-ss', f'{start_time:.3f}',
+        '-i', video_path,
+        '-t', f'{end_time - start_time:.3f}',
+        '-c', 'copy',
+        '-avoid_negative_ts', 'make_zero',
+        output_path
+    ]
+    try:
+        get_ffmpeg_pool().run(cmd)
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"流复制截取失败，回退到重新编码: {getattr(e, 'stderr', e)}")
+        return False
+
+
 def extract_video_clip(
     video_path: str,
     start_time: float,
     end_time: float,
     output_path: str,
-    codec: str = "libx264",
-    audio_codec: str = "aac"
+    codec: Optional[str] = None,
+    audio_codec: Optional[str] = None,
+    hw_accel: Optional[str] = None,
+    allow_stream_copy: bool = True
 ) -> str:
     """
     从视频提取片段（纯工具函数）
 
+    未指定任何编码器且起点对齐关键帧时直接复制流（不重新编码，耗时取决于磁盘读写），
+    否则按指定编码器重新编码
+
     Args:
         video_path: 源视频路径
         start_time: 开始时间（秒）
         end_time: 结束时间（秒）
         output_path: 输出路径
-        codec: 视频编码器
-        audio_codec: 音频编码器
+        codec: 视频编码器（None 表示不指定，重新编码时使用 libx264）
+        audio_codec: 音频编码器（None 表示不指定，重新编码时使用 aac）
+        hw_accel: 硬件编码（None/"auto"/"nvenc"），启用时替代 codec 指定的软件编码器
+        allow_stream_copy: 是否允许流复制；需要逐帧精确切点时设为False
 
     Returns:
         输出文件路径
@@ -198,22 +398,41 @@ def extract_video_clip(
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+    # 流复制和重新编码两条路径都按实际时长截断
+    duration = get_video_info(video_path)['duration']
+    if end_time > duration:
+        logger.warning(
+            f"结束时间 {end_time}s 超过视频时长 {duration}s，"
+            f"调整为 {duration}s"
+        )
+        end_time = duration
+        if start_time >= end_time:
+            raise ValueError(f"开始时间 {start_time}s 超过视频时长 {duration}s")
+
+    # 调用方指定了输出编码时必须重新编码，不能沿用源视频的编码
+    encoder_requested = codec is not None or audio_codec is not None or hw_accel is not None
+
+    if (
+        allow_stream_copy
+        and not encoder_requested
+        and _starts_on_keyframe(video_path, start_time)
+        and _stream_copy_clip(video_path, start_time, end_time, output_path)
+    ):
+        logger.info(f"视频片段提取成功（流复制）: {output_path}")
+        return output_path
+
+    codec, ffmpeg_params = _resolve_video_codec(codec or "libx264", hw_accel)
+
     try:
         with VideoFileClip(video_path) as video:
-            # 验证时间范围
-            if end_time > video.duration:
-                logger.warning(
-                    f"结束时间 {end_time}s 超过视频时长 {video.duration}s，"
-                    f"调整为 {video.duration}s"
-                )
-                end_time = video.duration
-
-            # 提取片段
-            clip = video.subclipped(start_time, end_time)
+            # 提取片段（MoviePy 解析的时长可能略短于探测值）
+            clip = video.subclipped(start_time, min(end_time, video.duration))
             clip.write_videofile(
                 output_path,
                 codec=codec,
-                audio_codec=audio_codec
+                audio_codec=audio_codec or "aac",
+                ffmpeg_params=ffmpeg_params,
+                logger=None  # 不输出逐帧进度条
             )
 
         logger.info(f"视频片段提取成功: {output_path}")
@@ -227,22 +446,244 @@ def extract_video_clip(
 # 视频拼接
 # ============================================
 
+def _has_audio_stream(video_path: str) -> bool:
+    """判断视频是否包含音频流（探测失败时返回False）"""
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error',
+                '-select_streams', 'a',
+                '-show_entries', 'stream=index',
+                '-of', 'csv=p=0',
+                video_path
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return bool(result.stdout.strip())
+
+
+# 判断能否直接流复制拼接时需要一致的流参数
+CONCAT_STREAM_FIELDS = (
+    'codec_type', 'codec_name', 'profile', 'width', 'height', 'pix_fmt',
+    'sample_aspect_ratio', 'time_base', 'sample_rate', 'channels'
+)
+
+
+def _stream_params(media_path: str) -> Optional[List[Tuple]]:
+    """探测各条流的编码参数（探测失败时返回None）"""
+    try:
+        result = subprocess.run(
+            [
+                'ffprobe', '-v', 'error',
+                '-show_entries', f"stream={','.join(CONCAT_STREAM_FIELDS)}",
+                '-of', 'json',
+                media_path
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+        streams = json.loads(result.stdout).get('streams', [])
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+    return [tuple(stream.get(field) for field in CONCAT_STREAM_FIELDS) for stream in streams]
+
+
+def concat_stream_copy(input_paths: List[str], output_path: str) -> bool:
+    """
+    使用 concat demuxer 直接复制流拼接，不重新编码
+
+    仅当各输入的流参数（编码、分辨率、时间基、采样率、声道等）完全一致，
+    且输出与输入为同一容器格式时才执行
+
+    Args:
+        input_paths: 输入文件路径列表
+        output_path: 输出路径
+
+    Returns:
+        是否成功（不满足条件或执行失败时返回False，由调用方回退到重新编码）
+    """
+    suffixes = {os.path.splitext(path)[1].lower() for path in [*input_paths, output_path]}
+    if len(suffixes) != 1:
+        return False
+
+    params = [_stream_params(path) for path in input_paths]
+    if params[0] is None or any(p != params[0] for p in params[1:]):
+        return False
+
+    fd, list_path = tempfile.mkstemp(suffix=".ffconcat", text=True)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write("ffconcat version 1.0\n")
+            for path in input_paths:
+                escaped = os.path.abspath(path).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+
+        get_ffmpeg_pool().run(['-f', 'concat', '-safe', '0', '-i', list_path, '-c', 'copy', output_path])
+        return True
+
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"流复制拼接失败，回退到重新编码: {getattr(e, 'stderr', e)}")
+        return False
+
+    finally:
+        os.remove(list_path)
+
+
+def _concatenate_on_gpu(clip_paths: List[str], output_path: str, audio_codec: str) -> bool:
+    """
+    使用 NVDEC → concat → NVENC 拼接，帧全程保留在显存中
+
+    仅处理各片段分辨率相同且都带音频的情况，其余情况交给MoviePy
+
+    Returns:
+        是否成功
+    """
+    infos = [get_video_info(path) for path in clip_paths]
+    if len({(info['width'], info['height']) for info in infos}) != 1:
+        return False
+    if not all(_has_audio_stream(path) for path in clip_paths):
+        return False
+
+    cmd = []
+    for path in clip_paths:
+        cmd.extend(['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda', '-i', path])
+
+    inputs = ''.join(f'[{i}:v][{i}:a]' for i in range(len(clip_paths)))
+    cmd.extend([
+        '-filter_complex', f'{inputs}concat=n={len(clip_paths)}:v=1:a=1[v][a]',
+        '-map', '[v]', '-map', '[a]',
+        '-c:v', NVENC_CODEC, *NVENC_FFMPEG_PARAMS,
+        '-c:a', audio_codec,
+        output_path
+    ])
+
+    try:
+        get_ffmpeg_pool().run(cmd)
+        return True
+    except (OSError, subprocess.CalledProcessError) as e:
+        logger.warning(f"GPU拼接失败，回退到MoviePy: {getattr(e, 'stderr', e)}")
+        return False
+
+
+def _encode_clip_pynvc(path: str, width: int, height: int, bitstream_path: str) -> None:
+    """
+    用独立的 NVDEC 解码器和 NVENC 编码器把单个片段转成 H.264 裸码流
+
+    解码出的 NV12 帧留在显存中直接送入编码器；每段码流以 SPS/PPS + IDR 开头，
+    相同参数编码的各段码流可以按顺序直接拼接
+
+    Args:
+        path: 片段路径
+        width: 编码宽度
+        height: 编码高度
+        bitstream_path: 裸码流输出路径
+    """
+    demuxer = nvc.CreateDemuxer(filename=path)
+    decoder = nvc.CreateDecoder(
+        gpuid=0,
+        codec=demuxer.GetNvCodecId(),
+        cudacontext=0,
+        cudastream=0,
+        usedevicememory=True
+    )
+    encoder = nvc.CreateEncoder(width, height, "NV12", False, codec="h264", preset="P4")
+    with open(bitstream_path, 'wb') as bitstream:
+        for packet in demuxer:
+            for frame in decoder.Decode(packet):
+                bitstream.write(bytearray(encoder.Encode(frame)))
+        bitstream.write(bytearray(encoder.EndEncode()))
+
+
+def _concatenate_with_pynvc(clip_paths: List[str], output_path: str, audio_codec: str) -> bool:
+    """
+    使用 PyNvVideoCodec 拼接：各片段并行占用独立的 NVDEC/NVENC 会话转码为裸码流，
+    按顺序拼接后由 ffmpeg 拼接音频并封装
+
+    并行会话数不超过 PYNVC_MAX_SESSIONS，耗时接近最长片段而不是各片段之和；
+    仅处理各片段分辨率、帧率相同且都带音频的情况
+
+    Returns:
+        是否成功
+    """
+    infos = [get_video_info(path) for path in clip_paths]
+    if len({(info['width'], info['height'], info['fps']) for info in infos}) != 1:
+        return False
+    if not all(_has_audio_stream(path) for path in clip_paths):
+        return False
+
+    width, height, fps = infos[0]['width'], infos[0]['height'], infos[0]['fps']
+    work_dir = tempfile.mkdtemp(dir=os.path.dirname(output_path) or None, prefix="pynvc_")
+    segment_paths = [os.path.join(work_dir, f"{i}.h264") for i in range(len(clip_paths))]
+    bitstream_path = os.path.join(work_dir, "concat.h264")
+    try:
+        with ThreadPoolExecutor(max_workers=min(PYNVC_MAX_SESSIONS, len(clip_paths))) as executor:
+            futures = [
+                executor.submit(_encode_clip_pynvc, path, width, height, segment_path)
+                for path, segment_path in zip(clip_paths, segment_paths)
+            ]
+            for future in futures:
+                future.result()
+
+        with open(bitstream_path, 'wb') as bitstream:
+            for segment_path in segment_paths:
+                with open(segment_path, 'rb') as segment:
+                    shutil.copyfileobj(segment, bitstream)
+
+        # 裸码流没有时间戳，按源帧率封装；音频由 concat 滤镜拼接
+        cmd = ['-r', f'{fps}', '-i', bitstream_path]
+        for path in clip_paths:
+            cmd.extend(['-i', path])
+        audio_inputs = ''.join(f'[{i}:a]' for i in range(1, len(clip_paths) + 1))
+        cmd.extend([
+            '-filter_complex', f'{audio_inputs}concat=n={len(clip_paths)}:v=0:a=1[a]',
+            '-map', '0:v', '-map', '[a]',
+            '-c:v', 'copy',
+            '-c:a', audio_codec,
+            output_path
+        ])
+        get_ffmpeg_pool().run(cmd)
+        return True
+
+    except Exception as e:
+        logger.warning(f"PyNvVideoCodec拼接失败，回退: {getattr(e, 'stderr', e)}")
+        return False
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
 def concatenate_video_clips(
     clip_paths: List[str],
     output_path: str,
     method: str = "compose",
     codec: str = "libx264",
-    audio_codec: str = "aac"
+    audio_codec: str = "aac",
+    hw_accel: Optional[str] = None,
+    backend: Optional[str] = None,
+    allow_stream_copy: bool = True
 ) -> str:
     """
     拼接多个视频片段（纯工具函数）
 
+    各片段编码参数一致时直接流复制拼接（不重新编码）；
+    使用NVENC且各片段分辨率一致时，直接由ffmpeg在显存中完成解码、拼接、编码
+
     Args:
         clip_paths: 视频片段路径列表
         output_path: 输出路径
         method: 拼接方法 ("compose" 或 "chain")
         codec: 视频编码器
         audio_codec: 音频编码器
+        hw_accel: 硬件编码（None/"auto"/"nvenc"），启用时替代 codec 指定的软件编码器
+        backend: 拼接后端，"pynvc" 使用 PyNvVideoCodec（需安装，不可用时回退到默认方式）
+        allow_stream_copy: 是否允许流复制拼接；需要统一输出编码时设为False
 
     Returns:
         输出文件路径
@@ -260,6 +701,24 @@ def concatenate_video_clips(
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+    codec, ffmpeg_params = _resolve_video_codec(codec, hw_accel)
+
+    if backend == "pynvc":
+        if nvc is None:
+            logger.warning("未安装 PyNvVideoCodec，回退到默认拼接方式")
+        elif _concatenate_with_pynvc(clip_paths, output_path, audio_codec):
+            logger.info(f"视频拼接成功（PyNvVideoCodec）: {len(clip_paths)} 个片段 -> {output_path}")
+            return output_path
+    elif backend is not None:
+        raise ValueError(f"不支持的拼接后端: {backend}")
+    elif allow_stream_copy and concat_stream_copy(clip_paths, output_path):
+        logger.info(f"视频拼接成功（流复制）: {len(clip_paths)} 个片段 -> {output_path}")
+        return output_path
+
+    if codec == NVENC_CODEC and _concatenate_on_gpu(clip_paths, output_path, audio_codec):
+        logger.info(f"视频拼接成功（GPU）: {len(clip_paths)} 个片段 -> {output_path}")
+        return output_path
+
     try:
         # 加载所有片段
         clips = [VideoFileClip(path) for path in clip_paths]
@@ -271,7 +730,9 @@ def concatenate_video_clips(
         final_clip.write_videofile(
             output_path,
             codec=codec,
-            audio_codec=audio_codec
+            audio_codec=audio_codec,
+            ffmpeg_params=ffmpeg_params,
+            logger=None  # 不输出逐帧进度条
         )
 
         # 清理
@@ -303,12 +764,61 @@ def video_to_base64(video_path: str) -> str:
     Raises:
         FileNotFoundError: 视频文件不存在
     """
-    if not os.path.exists(video_path):
+    # 一次 stat 同时完成存在性检查与大小获取（mmap 不能映射空文件）
+    try:
+        file_size = os.stat(video_path).st_size
+    except FileNotFoundError:
         raise FileNotFoundError(f"视频文件不存在: {video_path}")
 
-    with open(video_path, 'rb') as f:
-        video_data = f.read()
-        base64_str = base64.b64encode(video_data).decode('utf-8')
+    if file_size == 0:
+        return ""
+
+    # 内存映射后直接编码，避免同时持有原始字节副本和base64结果
+    with open(video_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        base64_str = base64.b64encode(mm).decode('ascii')
 
     logger.info(f"视频转base64完成: {len(base64_str)} 字符")
     return base64_str
+
+
+def video_to_base64_stream(video_path: str, chunk_size: int = 3 * 1024 * 1024) -> Iterator[bytes]:
+    """
+    分块生成视频的base64编码（纯工具函数）
+
+    内存映射源文件后按块编码（切片为 memoryview，不复制原始字节），
+    内存占用只与块大小有关；适合直接写入文件或作为HTTP请求体流式发送
+
+    Args:
+        video_path: 视频文件路径
+        chunk_size: 每次读取的原始字节数，必须是3的倍数，保证各块编码结果可以直接拼接
+
+    Yields:
+        base64编码后的字节块（ASCII）
+
+    Raises:
+        FileNotFoundError: 视频文件不存在
+        ValueError: chunk_size 不是3的倍数
+    """
+    if chunk_size <= 0 or chunk_size % 3:
+        raise ValueError(f"chunk_size 必须是3的正整数倍: {chunk_size}")
+
+    try:
+        file_size = os.stat(video_path).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"视频文件不存在: {video_path}")
+
+    if file_size == 0:
+        return
+
+    with open(video_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        view = memoryview(mm)
+        try:
+            for offset in range(0, len(view), chunk_size):
+                yield base64.b64encode(view[offset:offset + chunk_size])
+        finally:
+            # mmap 关闭前必须释放所有导出的缓冲区
+            view.release()
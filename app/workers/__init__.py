@@ -7,8 +7,14 @@ from .batch_processing_tasks import (
     prepare_video_task,
     compress_and_upload_task,
     analyze_video_task,
+    process_single_video_task,
+    process_video_batch_task,
     generate_clip_plan_task,
     execute_clip_plan_task,
+    generate_narration_task,
+    mux_video_audio_task,
+    upload_final_task,
+    produce_final_video_with_narration_task,
     batch_process_videos_task
 )
 
@@ -17,7 +23,13 @@ __all__ = [
     'prepare_video_task',
     'compress_and_upload_task',
     'analyze_video_task',
+    'process_single_video_task',
+    'process_video_batch_task',
     'generate_clip_plan_task',
     'execute_clip_plan_task',
+    'generate_narration_task',
+    'mux_video_audio_task',
+    'upload_final_task',
+    'produce_final_video_with_narration_task',
     'batch_process_videos_task',
 ]
@@ -3,15 +3,21 @@
 使用 Celery group/chord 编排多视频批处理工作流
 """
 import os
+import re
 import asyncio
 from typing import List, Dict, Any, Optional
+from urllib.parse import urlparse
+import time
 from datetime import datetime
-from pathlib import Path
+from itertools import islice
 
-from celery import group, chord
+from celery import chord, chain
+from celery.utils.time import get_exponential_backoff_interval
 import aiohttp
+import httpx
+import requests
 
-from app.workers.celery_app import celery_app
+from app.workers.celery_app import celery_app, get_worker_loop, register_worker_cleanup
 from app.config import settings
 from app.models.video_source import VideoSource, VideoSourceType
 from app.models.task import TaskStatus
@@ -27,17 +33,45 @@ from app.services import (
     temp_storage_service,
     video_editing_service
 )
-from app.services.video_production_orchestrator import VideoProductionOrchestrator
+from app.services.script_generation import ScriptGenerationService
+from app.services.video_audio_composer import video_audio_composer
+from app.adapters.tts_adapters import DashScopeTTSAdapter
 from app.utils.ai_clients.dashscope_client import DashScopeClient
 from app.utils.logger import logger
+from app.utils.redis_client import redis_client
 from app.utils.json_parser import parse_json_with_model, JSONParseError
 
 
+# 工作目录（配置在进程内不变，导入时计算一次）
+TEMP_DIR = settings.temp_dir
+COMPRESSED_DIR = settings.compressed_dir
+PROCESSED_DIR = settings.processed_dir
+
+
 # ======================
 # 辅助函数
 # ======================
 
 
+# 时间戳模式：HH:MM:SS, MM:SS, 或秒数（模块导入时预编译）
+_TIME_PATTERNS = [
+    # HH:MM:SS 格式
+    (re.compile(r'(\d{1,2}):(\d{2}):(\d{2})'), lambda h, m, s: int(h) * 3600 + int(m) * 60 + int(s)),
+    # MM:SS 格式
+    (re.compile(r'(?<!\d)(\d{1,2}):(\d{2})(?!\d)'), lambda m, s: int(m) * 60 + int(s)),
+    # 秒数格式 (90秒, 90s)
+    (re.compile(r'(\d+)\s*[秒s]'), lambda s: int(s))
+]
+
+# 关键词（用于判断这是一个关键时刻）
+_MOMENT_KEYWORDS = (
+    '精彩', '高潮', '亮点', '关键', '重要', '特写', '转折',
+    'highlight', 'key', 'important', 'climax', 'peak'
+)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
 def extract_key_moments(analysis_text: str, video_duration: float) -> List[Dict[str, Any]]:
     """
     从AI分析文本中提取关键时刻
@@ -54,29 +88,11 @@ def extract_key_moments(analysis_text: str, video_duration: float) -> List[Dict[
     Returns:
         关键时刻列表，每项包含 timestamp, description, confidence
     """
-    import re
-
     if not analysis_text:
         return []
 
     key_moments = []
 
-    # 时间戳模式：HH:MM:SS, MM:SS, 或秒数
-    time_patterns = [
-        # HH:MM:SS 格式
-        (r'(\d{1,2}):(\d{2}):(\d{2})', lambda h, m, s: int(h) * 3600 + int(m) * 60 + int(s)),
-        # MM:SS 格式
-        (r'(?<!\d)(\d{1,2}):(\d{2})(?!\d)', lambda m, s: int(m) * 60 + int(s)),
-        # 秒数格式 (90秒, 90s)
-        (r'(\d+)\s*[秒s]', lambda s: int(s))
-    ]
-
-    # 关键词（用于判断这是一个关键时刻）
-    moment_keywords = [
-        '精彩', '高潮', '亮点', '关键', '重要', '特写', '转折',
-        'highlight', 'key', 'important', 'climax', 'peak'
-    ]
-
     # 按行分割文本
     lines = analysis_text.split('\n')
 
@@ -86,11 +102,12 @@ def extract_key_moments(analysis_text: str, video_duration: float) -> List[Dict[
             continue
 
         # 检查是否包含关键词
-        has_keyword = any(kw in line.lower() for kw in moment_keywords)
+        lowered = line.lower()
+        has_keyword = any(kw in lowered for kw in _MOMENT_KEYWORDS)
 
         # 尝试匹配时间戳
-        for pattern, converter in time_patterns:
-            matches = re.finditer(pattern, line)
+        for pattern, converter in _TIME_PATTERNS:
+            matches = pattern.finditer(line)
 
             for match in matches:
                 try:
@@ -107,7 +124,7 @@ def extract_key_moments(analysis_text: str, video_duration: float) -> List[Dict[
                     description = line[start_pos:end_pos].strip()
 
                     # 清理描述
-                    description = re.sub(r'\s+', ' ', description)
+                    description = _WHITESPACE_PATTERN.sub(' ', description)
 
                     # 计算置信度
                     confidence = 0.5  # 基础置信度
@@ -136,7 +153,7 @@ def extract_key_moments(analysis_text: str, video_duration: float) -> List[Dict[
             unique_moments.append(moment)
             seen_timestamps.add(timestamp)
 
-    logger.info(f"从分析文本中提取 {len(unique_moments)} 个关键时刻")
+    logger.debug("从分析文本中提取 %d 个关键时刻", len(unique_moments))
     return unique_moments
 
 
@@ -238,32 +255,123 @@ def calculate_clip_plan_quality(
     # 计算总分
     total_score = sum(scores.values())
 
-    logger.info(
-        f"质量评分详情: "
-        f"覆盖率={scores.get('coverage', 0):.3f}, "
-        f"时长={scores.get('duration', 0):.3f}, "
-        f"多样性={scores.get('diversity', 0):.3f}, "
-        f"优先级={scores.get('priority', 0):.3f}, "
-        f"推理={scores.get('reasoning', 0):.3f}, "
-        f"总分={total_score:.3f}"
+    logger.debug(
+        "质量评分详情: 覆盖率=%.3f, 时长=%.3f, 多样性=%.3f, 优先级=%.3f, 推理=%.3f, 总分=%.3f",
+        scores.get('coverage', 0),
+        scores.get('duration', 0),
+        scores.get('diversity', 0),
+        scores.get('priority', 0),
+        scores.get('reasoning', 0),
+        total_score
     )
 
     return round(total_score, 3)
 
 def run_async(coro):
-    """在 Celery 任务中运行异步函数"""
-    loop = asyncio.get_event_loop()
+    """在 Celery 任务中运行异步函数（复用 worker 进程的常驻事件循环）"""
+    loop = get_worker_loop()
     if loop.is_running():
-        # 如果事件循环已在运行，创建新的
+        # 如果事件循环已在运行，允许嵌套调用
         import nest_asyncio
-        nest_asyncio.apply()
+        nest_asyncio.apply(loop)
     return loop.run_until_complete(coro)
 
 
+# 进程级单例：同一 worker 进程内的任务复用，避免每个任务重复初始化
+_dashscope_client: Optional[DashScopeClient] = None
+_script_service: Optional[ScriptGenerationService] = None
+_tts_adapter: Optional[DashScopeTTSAdapter] = None
+
+
+def get_dashscope_client() -> DashScopeClient:
+    """获取进程内共享的 DashScope 客户端"""
+    global _dashscope_client
+    if _dashscope_client is None:
+        _dashscope_client = DashScopeClient(api_key=settings.DASHSCOPE_API_KEY)
+    return _dashscope_client
+
+
+def get_script_service() -> ScriptGenerationService:
+    """获取进程内共享的解说脚本生成服务"""
+    global _script_service
+    if _script_service is None:
+        _script_service = ScriptGenerationService()
+    return _script_service
+
+
+def get_tts_adapter() -> DashScopeTTSAdapter:
+    """获取进程内共享的 TTS 适配器"""
+    global _tts_adapter
+    if _tts_adapter is None:
+        _tts_adapter = DashScopeTTSAdapter(api_key=settings.DASHSCOPE_API_KEY)
+    return _tts_adapter
+
+
+# 下载配置：分片大小与并发分片数
+DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+DOWNLOAD_MAX_CONCURRENCY = 8
+
+# 进程级 HTTP 会话：跨任务复用连接池和 DNS 缓存
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """获取进程内共享的 aiohttp 会话（绑定 worker 常驻事件循环）"""
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        )
+    return _http_session
+
+
+async def close_http_session():
+    """关闭进程内共享的 aiohttp 会话"""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+
+register_worker_cleanup(close_http_session)
+register_worker_cleanup(redis_client.close)
+
+
+def _workflow_analyses_key(workflow_id: str) -> str:
+    """工作流分析结果在 Redis 中的缓存键"""
+    return f"workflow:{workflow_id}:analyses"
+
+
+async def _download_range(
+    session: aiohttp.ClientSession,
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    semaphore: asyncio.Semaphore
+):
+    """下载 [start, end] 字节范围并写入文件对应偏移"""
+    async with semaphore:
+        async with session.get(url, headers={'Range': f'bytes={start}-{end}'}) as response:
+            if response.status != 206:
+                raise ValueError(f"分片下载失败: HTTP {response.status}")
+
+            offset = start
+            async for chunk in response.content.iter_chunked(1024 * 1024):
+                os.pwrite(fd, chunk, offset)
+                offset += len(chunk)
+
+            if offset != end + 1:
+                raise ValueError(f"分片下载不完整: bytes={start}-{end}, 实际到 {offset - 1}")
+
+
 async def download_video(url: str, output_path: str) -> str:
     """
     下载视频文件
 
+    服务端支持 Range 且文件大于一个分片时，按分片并发下载并直接写入文件偏移；
+    否则回退为单连接流式下载
+
     Args:
         url: 视频 URL
         output_path: 输出路径
@@ -273,32 +381,56 @@ async def download_video(url: str, output_path: str) -> str:
     """
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise ValueError(f"下载失败: HTTP {response.status}")
+    session = get_http_session()
 
-            # 流式下载
-            with open(output_path, 'wb') as f:
-                async for chunk in response.content.iter_chunked(8192):
-                    f.write(chunk)
+    async with session.head(url, allow_redirects=True) as response:
+        content_length = int(response.headers.get('Content-Length', 0))
+        supports_range = (
+            response.status == 200
+            and response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+        )
+
+    if supports_range and content_length > DOWNLOAD_CHUNK_SIZE:
+        semaphore = asyncio.Semaphore(DOWNLOAD_MAX_CONCURRENCY)
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.ftruncate(fd, content_length)
+            await asyncio.gather(*(
+                _download_range(
+                    session,
+                    url,
+                    fd,
+                    start,
+                    min(start + DOWNLOAD_CHUNK_SIZE, content_length) - 1,
+                    semaphore
+                )
+                for start in range(0, content_length, DOWNLOAD_CHUNK_SIZE)
+            ))
+        finally:
+            os.close(fd)
+
+        return output_path
+
+    async with session.get(url) as response:
+        if response.status != 200:
+            raise ValueError(f"下载失败: HTTP {response.status}")
+
+        # 流式下载
+        with open(output_path, 'wb') as f:
+            async for chunk in response.content.iter_chunked(8192):
+                f.write(chunk)
 
     return output_path
 
 
 # ======================
-# Celery 任务
+# 单视频处理阶段（协程）
 # ======================
 
-@celery_app.task(
-    bind=True,
-    name='batch_processing.prepare_video',
-    max_retries=3,
-    default_retry_delay=60
-)
-def prepare_video_task(self, video_source_dict: Dict[str, Any], video_index: int) -> Dict[str, Any]:
+
+async def prepare_video(video_source_dict: Dict[str, Any], video_index: int) -> Dict[str, Any]:
     """
-    准备视频任务：下载或验证本地视频
+    准备视频：下载或验证本地视频
 
     Args:
         video_source_dict: VideoSource 字典
@@ -309,11 +441,12 @@ def prepare_video_task(self, video_source_dict: Dict[str, Any], video_index: int
             'video_index': int,
             'local_path': str,
             'source': VideoSource dict,
+            'metadata': VideoMetadata dict（供后续阶段复用，避免重复探测）,
             'error': Optional[str]
         }
     """
     try:
-        logger.info(f"准备视频 #{video_index}: {video_source_dict}")
+        logger.info("准备视频 #%d: type=%s", video_index, video_source_dict.get('type'))
 
         video_source = VideoSource(**video_source_dict)
         local_path = None
@@ -326,21 +459,18 @@ def prepare_video_task(self, video_source_dict: Dict[str, Any], video_index: int
 
         elif video_source.type in [VideoSourceType.OSS, VideoSourceType.URL]:
             # 远程文件：下载到本地
-            filename = f"downloaded_{video_index}_{Path(video_source.url).name}"
-            local_path = os.path.join(settings.temp_dir, filename)
+            filename = f"downloaded_{video_index}_{os.path.basename(urlparse(video_source.url).path)}"
+            local_path = os.path.join(TEMP_DIR, filename)
 
-            # 异步下载
-            run_async(download_video(video_source.url, local_path))
+            await download_video(video_source.url, local_path)
 
-        # 验证视频时长
-        is_valid = run_async(
-            video_compression_service.validate_video_duration(local_path)
-        )
+        # 验证视频时长（同一次探测得到的元信息随结果传递）
+        is_valid, metadata = await video_compression_service.validate_and_probe(local_path)
+
+        if metadata is None:
+            raise ValueError(f"无法解析视频文件: {local_path}")
 
         if not is_valid:
-            metadata = run_async(
-                video_compression_service.get_video_metadata(local_path)
-            )
             raise ValueError(
                 f"视频时长 {metadata.duration}秒 超过最大限制 "
                 f"{settings.MAX_VIDEO_DURATION}秒"
@@ -350,6 +480,7 @@ def prepare_video_task(self, video_source_dict: Dict[str, Any], video_index: int
             'video_index': video_index,
             'local_path': local_path,
             'source': video_source_dict,
+            'metadata': metadata.to_dict(),
             'error': None
         }
 
@@ -363,14 +494,7 @@ def prepare_video_task(self, video_source_dict: Dict[str, Any], video_index: int
         }
 
 
-@celery_app.task(
-    bind=True,
-    name='batch_processing.compress_and_upload',
-    max_retries=2,
-    default_retry_delay=120
-)
-def compress_and_upload_task(
-    self,
+async def compress_and_upload(
     prepared_video: Dict[str, Any],
     compression_profile: str,
     temp_expiry_hours: int
@@ -379,7 +503,7 @@ def compress_and_upload_task(
     压缩并上传到临时 OSS
 
     Args:
-        prepared_video: prepare_video_task 的返回值
+        prepared_video: prepare_video 的返回值
         compression_profile: 压缩策略
         temp_expiry_hours: 临时存储过期时间（小时）
 
@@ -398,41 +522,72 @@ def compress_and_upload_task(
             }
 
         local_path = prepared_video['local_path']
-        logger.info(f"压缩视频 #{video_index}: {local_path}")
-
-        # 获取原始元信息
-        original_metadata = run_async(
-            video_compression_service.get_video_metadata(local_path)
+        logger.info("压缩视频 #%d: %s", video_index, local_path)
+
+        # 原始元信息：优先使用准备阶段的探测结果
+        original_metadata = prepared_video.get('metadata')
+        if original_metadata is None:
+            original_metadata = (
+                await video_compression_service.get_video_metadata(local_path)
+            ).to_dict()
+
+        compressed_filename = f"compressed_{video_index}_{os.path.basename(local_path)}"
+
+        # OSS key 由视频索引和源文件指纹决定，重试时不会重复上传
+        source_stat = os.stat(local_path)
+        key_seed = (
+            f"{video_index}:{local_path}:{source_stat.st_size}:"
+            f"{source_stat.st_mtime_ns}:{compression_profile}"
         )
 
-        # 压缩视频
-        compressed_filename = f"compressed_{video_index}_{Path(local_path).name}"
-        compressed_path = os.path.join(settings.compressed_dir, compressed_filename)
+        if settings.COMPRESSION_STREAM_UPLOAD and temp_storage_service.is_oss_configured():
+            # 压缩输出直接分片上传到临时 OSS，不经过 compressed_dir 落盘
+            stream_upload = temp_storage_service.start_stream_upload(
+                compressed_filename,
+                prefix="compressed",
+                expiry_hours=temp_expiry_hours,
+                key_seed=key_seed
+            )
+            try:
+                _, compression_stats = await video_compression_service.compress_video(
+                    local_path,
+                    None,
+                    profile_name=compression_profile,
+                    stdout_sink=stream_upload.write
+                )
+                upload_result = await stream_upload.complete()
+            except Exception:
+                await stream_upload.abort()
+                raise
+        else:
+            # 压缩视频
+            compressed_path = os.path.join(COMPRESSED_DIR, compressed_filename)
 
-        _, compression_stats = run_async(
-            video_compression_service.compress_video(
+            _, compression_stats = await video_compression_service.compress_video(
                 local_path,
                 compressed_path,
                 profile_name=compression_profile
             )
-        )
 
-        # 上传到临时 OSS
-        upload_result = run_async(
-            temp_storage_service.upload_temp_file(
+            # 上传到临时 OSS
+            upload_result = await temp_storage_service.upload_temp_file(
                 compressed_path,
                 prefix="compressed",
-                expiry_hours=temp_expiry_hours
+                expiry_hours=temp_expiry_hours,
+                key_seed=key_seed
             )
-        )
+
+            # 工作目录在 tmpfs 上时占用内存，上传成功后立即释放
+            if settings.COMPRESSED_WORK_DIR:
+                os.remove(compressed_path)
 
         return {
             'video_index': video_index,
             'video_source': prepared_video['source'],
-            'duration': original_metadata.duration,
-            'resolution': original_metadata.resolution,
-            'fps': original_metadata.fps,
-            'file_size': original_metadata.file_size,
+            'duration': original_metadata['duration'],
+            'resolution': original_metadata['resolution'],
+            'fps': original_metadata['fps'],
+            'file_size': original_metadata['file_size'],
             'compressed_oss_url': upload_result['signed_url'],
             'oss_key': upload_result['oss_key'],
             'compression_profile': compression_stats['profile_used'],
@@ -451,23 +606,58 @@ def compress_and_upload_task(
         }
 
 
-@celery_app.task(
-    bind=True,
-    name='batch_processing.analyze_video',
-    max_retries=2,
-    default_retry_delay=60
+# 可重试的瞬时错误（网络中断、超时），其余错误视为永久失败
+# DashScope SDK 同步接口基于 requests；httpx 为其他 AI 客户端使用的传输层
+TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    httpx.TransportError,
 )
-def analyze_video_task(
-    self,
+
+# 单视频任务内 VL 分析的重试参数（秒）
+VL_MAX_RETRIES = 3
+VL_RETRY_DELAY = 10
+VL_RETRY_MAX_DELAY = 600
+
+
+def _is_transient(error: BaseException) -> bool:
+    """
+    判断是否为可重试的瞬时错误
+
+    DashScopeClient 会把 SDK 异常包装为 LLMServiceError，因此沿异常链查找原始异常
+    """
+    while error is not None:
+        if isinstance(error, TRANSIENT_ERRORS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _analysis_failure(compressed_video: Dict[str, Any], error: Exception) -> Dict[str, Any]:
+    """构建分析失败结果"""
+    return {
+        **compressed_video,
+        'vl_analysis': {},
+        'analysis_summary': f"分析失败: {str(error)}",
+        'key_moments': [],
+        'error': compressed_video.get('error') or str(error),
+        'status': 'analysis_failed'
+    }
+
+
+async def analyze_video(
     compressed_video: Dict[str, Any],
-    vl_model: str
+    vl_model: str,
+    raise_transient: bool = False
 ) -> Dict[str, Any]:
     """
     VL 模型分析视频
 
     Args:
-        compressed_video: compress_and_upload_task 的返回值
+        compressed_video: compress_and_upload 的返回值
         vl_model: VL 模型名称
+        raise_transient: 遇到瞬时错误（见 _is_transient）时向上抛出（由调用方重试），
+                         否则与其他错误一样返回失败结果
 
     Returns:
         Dict: 完整的 VideoAnalysisResult 数据
@@ -484,10 +674,10 @@ def analyze_video_task(
                 'key_moments': []
             }
 
-        logger.info(f"分析视频 #{video_index} 使用 {vl_model}")
+        logger.info("分析视频 #%d 使用 %s", video_index, vl_model)
 
         # 调用 VL 模型
-        dashscope_client = DashScopeClient(api_key=settings.DASHSCOPE_API_KEY)
+        dashscope_client = get_dashscope_client()
 
         # 构建分析提示
         prompt = (
@@ -498,12 +688,10 @@ def analyze_video_task(
             "4. 适合剪辑的精彩片段"
         )
 
-        analysis_result = run_async(
-            dashscope_client.call_vl_model(
-                model=vl_model,
-                video_url=compressed_video['compressed_oss_url'],
-                prompt=prompt
-            )
+        analysis_result = await dashscope_client.call_vl_model(
+            model=vl_model,
+            video_url=compressed_video['compressed_oss_url'],
+            prompt=prompt
         )
 
         # 提取关键时刻（从AI分析文本中智能提取）
@@ -521,17 +709,255 @@ def analyze_video_task(
         }
 
     except Exception as e:
-        logger.error(f"分析视频 #{video_index} 失败: {str(e)}", exc_info=True)
-        return {
-            **compressed_video,
-            'vl_analysis': {},
-            'analysis_summary': f"分析失败: {str(e)}",
-            'key_moments': [],
-            'error': compressed_video.get('error') or str(e),
-            'status': 'analysis_failed'
-        }
+        if _is_transient(e):
+            if raise_transient:
+                raise
+            logger.error(f"分析视频 #{video_index} 失败（网络）: {type(e).__name__}: {str(e)}")
+        elif isinstance(e, ValueError):
+            # 已知的输入类错误，不需要堆栈
+            logger.warning(f"分析视频 #{video_index} 失败: {str(e)}")
+        else:
+            logger.error(f"分析视频 #{video_index} 失败: {str(e)}", exc_info=True)
+        return _analysis_failure(compressed_video, e)
+
+
+async def analyze_video_with_retry(
+    compressed_video: Dict[str, Any],
+    vl_model: str,
+    max_retries: int = VL_MAX_RETRIES,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> Dict[str, Any]:
+    """
+    VL 模型分析视频，瞬时错误在当前任务内按带抖动的指数退避重试
+
+    融合任务中准备、压缩上传已经完成，只重试分析阶段，不重新执行整个任务
+
+    Args:
+        compressed_video: compress_and_upload 的返回值
+        vl_model: VL 模型名称
+        max_retries: 最大重试次数
+        semaphore: VL 调用并发限制（可选），只在调用期间持有，退避等待时释放
+
+    Returns:
+        Dict: 见 analyze_video；重试耗尽后返回失败结果
+    """
+    for retries in range(max_retries + 1):
+        try:
+            if semaphore is None:
+                return await analyze_video(compressed_video, vl_model, raise_transient=True)
+            async with semaphore:
+                return await analyze_video(compressed_video, vl_model, raise_transient=True)
+        except Exception as e:
+            if retries >= max_retries:
+                logger.error(
+                    f"分析视频 #{compressed_video['video_index']} 重试耗尽: "
+                    f"{type(e).__name__}: {str(e)}"
+                )
+                return _analysis_failure(compressed_video, e)
+
+            await asyncio.sleep(get_exponential_backoff_interval(
+                factor=VL_RETRY_DELAY,
+                retries=retries,
+                maximum=VL_RETRY_MAX_DELAY,
+                full_jitter=True
+            ))
+
+
+async def process_single_video(
+    video_source_dict: Dict[str, Any],
+    video_index: int,
+    config: Dict[str, Any],
+    vl_semaphore: Optional[asyncio.Semaphore] = None
+) -> Dict[str, Any]:
+    """
+    单视频完整处理：准备 → 压缩上传 → VL分析（瞬时错误重试 config['vl_max_retries'] 次）
+
+    Args:
+        video_source_dict: VideoSource 字典
+        video_index: 视频索引
+        config: 批处理配置
+        vl_semaphore: VL 调用并发限制（可选，多个视频并发处理时共享）
+
+    Returns:
+        Dict: analyze_video 的返回值
+    """
+    prepared_video = await prepare_video(video_source_dict, video_index)
+    compressed_video = await compress_and_upload(
+        prepared_video,
+        config.get('global_compression_profile', 'balanced'),
+        config.get('temp_storage_expiry_hours', 24)
+    )
+    vl_model = config.get('vl_model', 'qwen-vl-plus')
+    max_retries = config.get('vl_max_retries', VL_MAX_RETRIES)
+
+    return await analyze_video_with_retry(compressed_video, vl_model, max_retries, vl_semaphore)
+
+
+# ======================
+# Celery 任务
+# ======================
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.prepare_video',
+    max_retries=3,
+    default_retry_delay=60
+)
+def prepare_video_task(self, video_source_dict: Dict[str, Any], video_index: int) -> Dict[str, Any]:
+    """
+    准备视频任务：下载或验证本地视频
+
+    Args:
+        video_source_dict: VideoSource 字典
+        video_index: 视频索引
+
+    Returns:
+        Dict: 见 prepare_video
+    """
+    return run_async(prepare_video(video_source_dict, video_index))
+
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.compress_and_upload',
+    max_retries=2,
+    default_retry_delay=120
+)
+def compress_and_upload_task(
+    self,
+    prepared_video: Dict[str, Any],
+    compression_profile: str,
+    temp_expiry_hours: int
+) -> Dict[str, Any]:
+    """
+    压缩并上传到临时 OSS
+
+    Args:
+        prepared_video: prepare_video_task 的返回值
+        compression_profile: 压缩策略
+        temp_expiry_hours: 临时存储过期时间（小时）
+
+    Returns:
+        Dict: 见 compress_and_upload
+    """
+    return run_async(
+        compress_and_upload(prepared_video, compression_profile, temp_expiry_hours)
+    )
+
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.analyze_video',
+    max_retries=3,
+    default_retry_delay=10
+)
+def analyze_video_task(
+    self,
+    compressed_video: Dict[str, Any],
+    vl_model: str
+) -> Dict[str, Any]:
+    """
+    VL 模型分析视频
+
+    网络类瞬时错误按带抖动的指数退避重试，避免多个 worker 同步重试；
+    重试耗尽后返回失败结果而不是抛出，以免整个 chord 失败
+
+    Args:
+        compressed_video: compress_and_upload_task 的返回值
+        vl_model: VL 模型名称
+
+    Returns:
+        Dict: 见 analyze_video
+    """
+    try:
+        return run_async(analyze_video(compressed_video, vl_model, raise_transient=True))
+    except Exception as e:
+        if not _is_transient(e):
+            raise
+        if self.request.retries >= self.max_retries:
+            logger.error(
+                f"分析视频 #{compressed_video['video_index']} 重试耗尽: "
+                f"{type(e).__name__}: {str(e)}"
+            )
+            return _analysis_failure(compressed_video, e)
+
+        raise self.retry(
+            exc=e,
+            countdown=get_exponential_backoff_interval(
+                factor=self.default_retry_delay,
+                retries=self.request.retries,
+                maximum=600,
+                full_jitter=True
+            )
+        )
+
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.process_single_video',
+    max_retries=2,
+    default_retry_delay=60
+)
+def process_single_video_task(
+    self,
+    video_source_dict: Dict[str, Any],
+    video_index: int,
+    config: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    单视频融合任务：准备 → 压缩上传 → VL分析
+
+    三个阶段对同一视频严格串行，合并为一个任务可省去两次 broker 入队
+    和两次结果写入（prepare/compress/analyze 三个独立任务仍保留以兼容）
+
+    Args:
+        video_source_dict: VideoSource 字典
+        video_index: 视频索引
+        config: 批处理配置
+
+    Returns:
+        Dict: 完整的 VideoAnalysisResult 数据
+    """
+    return run_async(process_single_video(video_source_dict, video_index, config))
 
 
+@celery_app.task(
+    bind=True,
+    name='batch_processing.process_video_batch'
+)
+def process_video_batch_task(
+    self,
+    video_sources_chunk: List[Dict[str, Any]],
+    start_index: int,
+    config: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    批量处理一组视频（减少每个视频单独入队的 broker 往返）
+
+    组内视频在同一事件循环中并发执行 准备 → 压缩上传 → VL分析，
+    VL 调用并发数受 config['vl_max_concurrency']（默认 MAX_PARALLEL_ANALYSIS）限制
+
+    Args:
+        video_sources_chunk: 本组 VideoSource 字典列表
+        start_index: 本组第一个视频在整个批次中的索引
+        config: 批处理配置
+
+    Returns:
+        List[Dict]: 每个视频的 analyze_video 返回值
+    """
+    logger.info("批量处理视频 #%d-#%d", start_index, start_index + len(video_sources_chunk) - 1)
+
+    async def _process_chunk():
+        vl_semaphore = asyncio.Semaphore(
+            config.get('vl_max_concurrency') or settings.MAX_PARALLEL_ANALYSIS
+        )
+        return await asyncio.gather(*(
+            process_single_video(video_source, start_index + offset, config, vl_semaphore)
+            for offset, video_source in enumerate(video_sources_chunk)
+        ))
+
+    return list(run_async(_process_chunk()))
+
 @celery_app.task(
     bind=True,
     name='batch_processing.generate_clip_plan'
@@ -541,22 +967,26 @@ def generate_clip_plan_task(
     analysis_results: List[Dict[str, Any]],
     text_model: str,
     target_duration: Optional[float],
-    clip_strategy: str
+    clip_strategy: str,
+    workflow_id: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     生成剪辑方案（聚合任务）
 
     Args:
-        analysis_results: 所有视频的分析结果列表
+        analysis_results: 所有视频的分析结果列表（批量任务的结果为嵌套列表）
         text_model: 文本模型名称
         target_duration: 目标时长（秒）
         clip_strategy: 剪辑策略
+        workflow_id: 工作流ID（可选），提供时将下游所需的分析摘要写入 Redis，
+                     链上后续任务按 ID 读取，而不是随任务结果逐级传递
 
     Returns:
-        Dict: ClipPlan 数据
+        Dict: ClipPlan 数据（含 workflow_id）
     """
     try:
-        logger.info(f"生成剪辑方案: {len(analysis_results)} 个视频")
+        analysis_results = _flatten_analysis_results(analysis_results)
+        logger.info("生成剪辑方案: %d 个视频", len(analysis_results))
 
         # 过滤失败的分析结果
         valid_results = [
@@ -606,7 +1036,7 @@ def generate_clip_plan_task(
         )
 
         # 调用文本模型
-        dashscope_client = DashScopeClient(api_key=settings.DASHSCOPE_API_KEY)
+        dashscope_client = get_dashscope_client()
 
         clip_plan_result = run_async(
             dashscope_client.call_text_model(
@@ -621,29 +1051,34 @@ def generate_clip_plan_task(
         # 使用健壮的JSON解析和Pydantic验证
         try:
             clip_plan = parse_json_with_model(clip_plan_text, ClipPlan, strict=False)
-            clip_plan_json = clip_plan.dict()
+            clip_plan_json = clip_plan.model_dump()
             logger.info("成功解析并验证AI生成的剪辑方案")
         except JSONParseError as parse_error:
             logger.warning(f"解析剪辑方案失败: {parse_error}, 使用默认方案")
-            # 生成默认剪辑方案（取每个视频的前30秒）
-            default_segments = [
-                ClipSegment(
-                    video_index=r['video_index'],
-                    start_time=0,
-                    end_time=min(30, r['duration']),
-                    duration=min(30, r['duration']),
-                    reason='视频开头精彩片段',
-                    priority=5
+            # 生成默认剪辑方案（取每个视频的前30秒，单次遍历同时累计总时长）
+            total_source_duration = 0
+            default_segments = []
+            for r in valid_results:
+                video_duration = r['duration']
+                total_source_duration += video_duration
+                clip_duration = 30 if video_duration >= 30 else video_duration
+                default_segments.append(
+                    ClipSegment(
+                        video_index=r['video_index'],
+                        start_time=0,
+                        end_time=clip_duration,
+                        duration=clip_duration,
+                        reason='视频开头精彩片段',
+                        priority=5
+                    )
                 )
-                for r in valid_results
-            ]
             clip_plan = ClipPlan(
                 strategy='默认剪辑策略：取每个视频的精彩片段',
-                total_duration=min(target_duration or 180, sum(r['duration'] for r in valid_results)),
+                total_duration=min(target_duration or 180, total_source_duration),
                 segments=default_segments,
                 reasoning='由于AI生成方案解析失败，使用默认策略'
             )
-            clip_plan_json = clip_plan.dict()
+            clip_plan_json = clip_plan.model_dump()
 
         # 计算质量评分
         quality_score = calculate_clip_plan_quality(
@@ -652,9 +1087,26 @@ def generate_clip_plan_task(
             target_duration
         )
 
+        # 仅保存成片生产阶段需要的字段
+        if workflow_id:
+            run_async(
+                redis_client.set_cache(
+                    _workflow_analyses_key(workflow_id),
+                    [
+                        {
+                            'analysis_summary': r.get('analysis_summary', ''),
+                            'key_moments': r.get('key_moments', [])
+                        }
+                        for r in analysis_results
+                    ],
+                    ttl=settings.TASK_TIMEOUT
+                )
+            )
+
         return {
             **clip_plan_json,
             'quality_score': quality_score,
+            'workflow_id': workflow_id,
             'error': None
         }
 
@@ -700,14 +1152,15 @@ def execute_clip_plan_task(
         if clip_plan.get('error'):
             raise ValueError(f"剪辑方案错误: {clip_plan['error']}")
 
-        logger.info(f"执行剪辑方案: {len(clip_plan['segments'])} 个片段")
+        logger.info("执行剪辑方案: %d 个片段", len(clip_plan['segments']))
 
-        # 转换为 ClipSegment 对象
-        segments = [ClipSegment(**seg) for seg in clip_plan['segments']]
+        # 转换为 ClipSegment 对象（片段已在 generate_clip_plan_task 中通过 ClipPlan 验证，
+        # 这里跳过重复验证）
+        segments = [ClipSegment.model_construct(**seg) for seg in clip_plan['segments']]
 
         # 生成输出路径
         output_filename = f"final_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-        output_path = os.path.join(settings.processed_dir, output_filename)
+        output_path = os.path.join(PROCESSED_DIR, output_filename)
 
         # 执行剪辑方案
         final_path, stats = run_async(
@@ -734,7 +1187,7 @@ def execute_clip_plan_task(
         else:
             final_url = f"file://{final_path}"
 
-        # 在返回结果中包含 analysis_results，供下游任务使用
+        # 分析结果保存在 Redis 中，只向下游传递 workflow_id
         result = {
             'final_video_path': final_path,
             'final_video_url': final_url,
@@ -742,7 +1195,7 @@ def execute_clip_plan_task(
             'file_size': stats['output_size'],
             'processing_time': stats['processing_time'],
             'video_paths': video_paths,  # 传递给下游任务
-            'analysis_results': clip_plan.get('analysis_results', []),  # 保存分析结果
+            'workflow_id': clip_plan.get('workflow_id'),
             'error': None
         }
 
@@ -759,30 +1212,61 @@ def execute_clip_plan_task(
         }
 
 
+def _final_video_failure(error: str) -> Dict[str, Any]:
+    """完整视频生产各阶段统一的失败结果"""
+    return {
+        'final_video_path': None,
+        'final_video_url': None,
+        'duration': 0,
+        'file_size': 0,
+        'has_narration': False,
+        'has_background_music': False,
+        'processing_time': 0,
+        'error': error
+    }
+
+
+def build_final_production_chain(
+    video_paths: List[str],
+    config: Dict[str, Any]
+):
+    """
+    构建完整视频生产链：配音生成 → 音视频合成 → 上传
+
+    三个阶段分别路由到不同队列（TTS 走 API 受限的 analyze_q，合成走 clipping_q），
+    多个工作流并发时，上一个工作流的合成与下一个工作流的 TTS 可以在不同 worker 上重叠执行
+
+    Args:
+        video_paths: 源视频路径列表
+        config: 批处理配置
+
+    Returns:
+        Signature: 以剪辑结果为输入的 chain 签名
+    """
+    return chain(
+        generate_narration_task.s(video_paths=video_paths, config=config),
+        mux_video_audio_task.s(),
+        upload_final_task.s()
+    )
+
+
 @celery_app.task(
     bind=True,
-    name='batch_processing.produce_final_video_with_narration',
+    name='batch_processing.generate_narration',
     max_retries=2,
-    default_retry_delay=60
+    default_retry_delay=30
 )
-def produce_final_video_with_narration_task(
+def generate_narration_task(
     self,
     clip_result: Dict[str, Any],
     video_paths: List[str] = None,
     config: Dict[str, Any] = None
 ) -> Dict[str, Any]:
     """
-    完整视频生产任务：基于剪辑结果生成带旁白的最终视频
-
-    这是完整的视频生产流程，包括：
-    1. 使用剪辑结果作为基础视频
-    2. 基于视频内容生成解说脚本
-    3. 生成TTS口播音频
-    4. 合成视频与音频
-    5. 添加背景音乐（可选）
+    完整视频生产阶段1：生成解说脚本与TTS配音
 
     Args:
-        clip_result: execute_clip_plan_task 的返回结果（包含 analysis_results）
+        clip_result: execute_clip_plan_task 的返回结果（包含 workflow_id）
         video_paths: 源视频路径列表（通过 Celery 的 s() 传递）
         config: 配置（通过 Celery 的 s() 传递），包含:
             - add_narration: bool, 是否添加配音
@@ -793,72 +1277,201 @@ def produce_final_video_with_narration_task(
 
     Returns:
         Dict: {
-            'final_video_path': str,
-            'final_video_url': str,
-            'duration': float,
-            'file_size': int,
-            'has_narration': bool,
-            'has_background_music': bool,
-            'processing_time': float,
+            'base_video_path': str,
+            'narration_audio_path': Optional[str],
+            'script_word_count': int,
+            'config': Dict,
+            'started_at': float,
             'error': Optional[str]
         }
     """
+    started_at = time.time()
     try:
         # 检查上游任务是否失败
         if clip_result.get('error'):
             raise ValueError(f"上游剪辑任务失败: {clip_result['error']}")
 
-        # 提取参数（从 clip_result 或使用默认值）
         if video_paths is None:
             video_paths = clip_result.get('video_paths', [])
         if config is None:
             config = {}
 
+        base_video_path = clip_result.get('final_video_path')
         logger.info(
-            f"开始完整视频生产流程:\n"
-            f"  基础剪辑视频: {clip_result.get('final_video_path')}\n"
-            f"  是否添加配音: {config.get('add_narration', True)}\n"
-            f"  解说风格: {config.get('narration_style', 'professional')}"
+            "开始完整视频生产流程: 基础剪辑视频=%s, 是否添加配音=%s, 解说风格=%s",
+            base_video_path,
+            config.get('add_narration', True),
+            config.get('narration_style', 'professional')
         )
 
-        # 如果不需要配音和背景音乐，直接返回基础剪辑结果
-        if not config.get('add_narration', True) and not config.get('background_music_path'):
-            logger.info("无需额外处理，直接使用基础剪辑结果")
-            return clip_result
+        result = {
+            'base_video_path': base_video_path,
+            'base_video_url': clip_result.get('final_video_url'),
+            'duration': clip_result.get('duration', 0),
+            'narration_audio_path': None,
+            'script_word_count': 0,
+            'config': config,
+            'started_at': started_at,
+            'error': None
+        }
 
-        # 初始化视频生产编排器
-        orchestrator = VideoProductionOrchestrator()
+        if not config.get('add_narration', True):
+            return result
 
-        # 从 clip_result 中提取分析结果
-        analysis_results = clip_result.get('analysis_results', [])
+        # 按 workflow_id 从 Redis 读取分析结果
+        workflow_id = clip_result.get('workflow_id')
+        analysis_results = (
+            run_async(redis_client.get_cache(_workflow_analyses_key(workflow_id))) or []
+            if workflow_id else clip_result.get('analysis_results', [])
+        )
 
-        # 构建剪辑决策（从分析结果和剪辑结果重建）
-        clip_decision = {
-            'theme': _extract_theme_from_analysis(analysis_results) if analysis_results else "精彩视频",
-            'total_duration': clip_result.get('duration', 0),
-            'clips': _reconstruct_clips_info(analysis_results) if analysis_results else []
-        }
+        clips = [
+            {**clip, 'visual_highlights': clip['description']}
+            for clip in _reconstruct_clips_info(analysis_results)
+        ]
+        script_data = run_async(
+            get_script_service().generate_narration_script(
+                theme=_extract_theme_from_analysis(analysis_results) if analysis_results else "精彩视频",
+                clips=clips,
+                target_duration=clip_result.get('duration', 0),
+                style=config.get('narration_style', 'professional')
+            )
+        )
 
-        # 生成最终输出路径
-        output_filename = f"final_with_narration_{datetime.now().strftime('%Y%m%d_%H%M%S')}.mp4"
-        output_path = os.path.join(settings.processed_dir, output_filename)
-
-        # 调用完整的视频生产流程
-        production_result = run_async(
-            orchestrator.produce_video_from_decision(
-                source_videos=video_paths,
-                clip_decision=clip_decision,
-                output_path=output_path,
-                narration_style=config.get('narration_style', 'professional'),
-                narration_voice=config.get('narration_voice', 'Cherry'),
-                add_narration=config.get('add_narration', True),
-                background_music_path=config.get('background_music_path'),
-                original_audio_volume=config.get('original_audio_volume', 0.3)
+        audio_path = os.path.join(
+            TEMP_DIR,
+            f"narration_{workflow_id or datetime.now().strftime('%Y%m%d_%H%M%S')}.mp3"
+        )
+        run_async(
+            get_tts_adapter().synthesize_to_file(
+                text=script_data['full_script'],
+                output_path=audio_path,
+                voice=config.get('narration_voice', 'Cherry')
             )
         )
 
-        # 上传最终视频到 OSS
-        final_path = production_result['final_video_path']
+        result['narration_audio_path'] = audio_path
+        result['script_word_count'] = script_data.get('word_count', 0)
+        logger.info("配音生成完成: %s, 脚本字数=%d", audio_path, result['script_word_count'])
+        return result
+
+    except Exception as e:
+        logger.error(f"配音生成失败: {str(e)}", exc_info=True)
+        return _final_video_failure(str(e))
+
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.mux_video_audio',
+    max_retries=2,
+    default_retry_delay=60
+)
+def mux_video_audio_task(self, narration_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    完整视频生产阶段2：合成配音与背景音乐
+
+    Args:
+        narration_result: generate_narration_task 的返回结果
+
+    Returns:
+        Dict: {
+            'final_video_path': str,
+            'duration': float,
+            'file_size': int,
+            'has_narration': bool,
+            'has_background_music': bool,
+            'script_word_count': int,
+            'started_at': float,
+            'error': Optional[str]
+        }
+    """
+    if narration_result.get('error'):
+        return narration_result
+
+    try:
+        config = narration_result['config']
+        audio_path = narration_result['narration_audio_path']
+        music_path = config.get('background_music_path')
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        video_path = narration_result['base_video_path']
+        stats = {
+            'output_path': video_path,
+            'output_size': os.path.getsize(video_path),
+            'video_duration': narration_result.get('duration', 0)
+        }
+
+        if audio_path:
+            stats = run_async(
+                video_audio_composer.compose_with_narration(
+                    video_path=video_path,
+                    audio_path=audio_path,
+                    output_path=os.path.join(PROCESSED_DIR, f"final_with_narration_{timestamp}.mp4"),
+                    original_audio_volume=config.get('original_audio_volume', 0.3)
+                )
+            )
+            os.remove(audio_path)
+            video_path = stats['output_path']
+
+        if music_path:
+            narrated_path = video_path if audio_path else None
+            stats = run_async(
+                video_audio_composer.add_background_music(
+                    video_path=video_path,
+                    music_path=music_path,
+                    output_path=os.path.join(PROCESSED_DIR, f"final_with_music_{timestamp}.mp4")
+                )
+            )
+            # 仅清理本阶段产生的中间文件，保留基础剪辑视频
+            if narrated_path:
+                os.remove(narrated_path)
+
+        return {
+            'final_video_path': stats['output_path'],
+            'duration': stats['video_duration'],
+            'file_size': stats['output_size'],
+            'has_narration': bool(audio_path),
+            'has_background_music': bool(music_path),
+            'script_word_count': narration_result.get('script_word_count', 0),
+            'started_at': narration_result['started_at'],
+            'error': None
+        }
+
+    except Exception as e:
+        logger.error(f"音视频合成失败: {str(e)}", exc_info=True)
+        return _final_video_failure(str(e))
+
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.upload_final',
+    max_retries=2,
+    default_retry_delay=60
+)
+def upload_final_task(self, mux_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    完整视频生产阶段3：上传最终视频
+
+    Args:
+        mux_result: mux_video_audio_task 的返回结果
+
+    Returns:
+        Dict: {
+            'final_video_path': str,
+            'final_video_url': str,
+            'duration': float,
+            'file_size': int,
+            'has_narration': bool,
+            'has_background_music': bool,
+            'processing_time': float,
+            'error': Optional[str]
+        }
+    """
+    if mux_result.get('error'):
+        return mux_result
+
+    try:
+        final_path = mux_result['final_video_path']
         if temp_storage_service.is_oss_configured():
             upload_result = run_async(
                 temp_storage_service.upload_temp_file(
@@ -871,87 +1484,155 @@ def produce_final_video_with_narration_task(
         else:
             final_url = f"file://{final_path}"
 
-        # 收集统计信息
-        stats = production_result['statistics']
-
         result = {
             'final_video_path': final_path,
             'final_video_url': final_url,
-            'duration': stats['final_duration'],
-            'file_size': stats['final_size'],
-            'has_narration': stats.get('has_narration', False),
-            'has_background_music': stats.get('has_background_music', False),
-            'script_word_count': stats.get('script_word_count', 0),
-            'processing_time': production_result['processing_time'],
+            'duration': mux_result['duration'],
+            'file_size': mux_result['file_size'],
+            'has_narration': mux_result['has_narration'],
+            'has_background_music': mux_result['has_background_music'],
+            'script_word_count': mux_result['script_word_count'],
+            'processing_time': time.time() - mux_result['started_at'],
             'error': None
         }
 
         logger.info(
-            f"完整视频生产完成:\n"
-            f"  最终视频: {final_path}\n"
-            f"  文件大小: {stats['final_size_mb']:.2f}MB\n"
-            f"  视频时长: {stats['final_duration']:.2f}秒\n"
-            f"  配音状态: {'已添加' if stats['has_narration'] else '未添加'}\n"
-            f"  脚本字数: {stats.get('script_word_count', 0)}字"
+            "完整视频生产完成: 最终视频=%s, 文件大小=%.2fMB, 视频时长=%.2f秒, 配音状态=%s, 脚本字数=%d",
+            final_path,
+            result['file_size'] / (1024 * 1024),
+            result['duration'],
+            '已添加' if result['has_narration'] else '未添加',
+            result['script_word_count']
         )
 
         return result
 
     except Exception as e:
-        logger.error(f"完整视频生产失败: {str(e)}", exc_info=True)
-        return {
-            'final_video_path': None,
-            'final_video_url': None,
-            'duration': 0,
-            'file_size': 0,
-            'has_narration': False,
-            'has_background_music': False,
-            'processing_time': 0,
-            'error': str(e)
-        }
+        logger.error(f"最终视频上传失败: {str(e)}", exc_info=True)
+        return _final_video_failure(str(e))
+
+
+@celery_app.task(
+    bind=True,
+    name='batch_processing.produce_final_video_with_narration'
+)
+def produce_final_video_with_narration_task(
+    self,
+    clip_result: Dict[str, Any],
+    video_paths: List[str] = None,
+    config: Dict[str, Any] = None
+):
+    """
+    完整视频生产任务：基于剪辑结果生成带旁白的最终视频
+
+    保留原任务入口以兼容已有调用方，实际执行替换为
+    generate_narration_task → mux_video_audio_task → upload_final_task 三阶段 chain
+
+    Args:
+        clip_result: execute_clip_plan_task 的返回结果（包含 workflow_id）
+        video_paths: 源视频路径列表
+        config: 配置，参见 generate_narration_task
+
+    Returns:
+        与 upload_final_task 相同的结果
+    """
+    if config is None:
+        config = {}
+
+    # 如果不需要配音和背景音乐，直接返回基础剪辑结果
+    if not config.get('add_narration', True) and not config.get('background_music_path'):
+        logger.info("无需额外处理，直接使用基础剪辑结果")
+        return clip_result
+
+    raise self.replace(chain(
+        generate_narration_task.s(clip_result, video_paths=video_paths, config=config),
+        mux_video_audio_task.s(),
+        upload_final_task.s()
+    ))
 
 
 def _extract_theme_from_analysis(analysis_results: List[Dict[str, Any]]) -> str:
     """从分析结果中提取视频主题"""
-    themes = []
-    for result in analysis_results:
-        if result.get('analysis_summary'):
-            # 提取前100个字符作为主题
-            summary = result['analysis_summary'][:100]
-            themes.append(summary)
-
-    if themes:
-        return " | ".join(themes[:3])  # 最多3个视频的主题
-    return "精彩视频合集"
+    # 最多3个视频的主题，每个取摘要前100个字符
+    themes = islice(
+        (summary[:100] for summary in (r.get('analysis_summary') for r in analysis_results) if summary),
+        3
+    )
+    return " | ".join(themes) or "精彩视频合集"
 
 
 def _reconstruct_clips_info(analysis_results: List[Dict[str, Any]]) -> List[Dict]:
     """从分析结果重建片段信息（用于脚本生成）"""
-    clips = []
-    for idx, result in enumerate(analysis_results):
-        if result.get('key_moments'):
-            for moment in result['key_moments']:
-                clips.append({
-                    'video_index': idx,
-                    'timestamp': moment.get('timestamp', 0),
-                    'description': moment.get('description', ''),
-                    'confidence': moment.get('confidence', 0.5)
-                })
+    clips = [
+        {
+            'video_index': idx,
+            'timestamp': moment.get('timestamp', 0),
+            'description': moment.get('description', ''),
+            'confidence': moment.get('confidence', 0.5)
+        }
+        for idx, result in enumerate(analysis_results)
+        for moment in (result.get('key_moments') or ())
+    ]
 
     # 如果没有关键时刻，使用分析摘要
     if not clips:
-        for idx, result in enumerate(analysis_results):
-            if result.get('analysis_summary'):
-                clips.append({
-                    'video_index': idx,
-                    'timestamp': 0,
-                    'description': result['analysis_summary'][:200],
-                    'confidence': 0.8
-                })
+        clips = [
+            {
+                'video_index': idx,
+                'timestamp': 0,
+                'description': summary[:200],
+                'confidence': 0.8
+            }
+            for idx, summary in enumerate(r.get('analysis_summary') for r in analysis_results)
+            if summary
+        ]
 
     return clips
 
 
+def _build_analysis_header(
+    video_sources: List[Dict[str, Any]],
+    config: Dict[str, Any]
+) -> List[Any]:
+    """
+    构建 chord header：每个视频（或每组视频）的 准备 → 压缩上传 → VL分析
+
+    默认每个视频一个融合任务（process_single_video_task）；
+    videos_per_task > 1 时按组打包为 process_video_batch_task，
+    broker 消息数从 N 降为 ceil(N/K)，组内视频在 worker 中并发处理
+
+    Args:
+        video_sources: VideoSource 字典列表
+        config: 批处理配置
+
+    Returns:
+        List[Signature]: chord header 签名列表
+    """
+    videos_per_task = max(1, int(config.get('videos_per_task') or settings.BATCH_VIDEOS_PER_TASK))
+
+    if videos_per_task > 1:
+        return [
+            process_video_batch_task.s(video_sources[start:start + videos_per_task], start, config)
+            for start in range(0, len(video_sources), videos_per_task)
+        ]
+
+    return [
+        process_single_video_task.s(video_source, idx, config)
+        for idx, video_source in enumerate(video_sources)
+    ]
+
+
+def _flatten_analysis_results(analysis_results: List[Any]) -> List[Dict[str, Any]]:
+    """展开 chord 结果（批量任务返回的是列表）"""
+    flattened = []
+    for item in analysis_results:
+        if isinstance(item, list):
+            flattened.extend(item)
+        else:
+            flattened.append(item)
+    return flattened
+
+
 # ======================
 # 主编排任务
 # ======================
@@ -978,88 +1659,47 @@ def batch_process_videos_task(
     task_id = self.request.id
 
     try:
-        logger.info(f"开始批处理任务 {task_id}: {len(video_sources)} 个视频")
-
-        # 阶段1: 并行准备所有视频（下载/验证）
-        prepare_tasks = group([
-            prepare_video_task.s(video_source, idx)
-            for idx, video_source in enumerate(video_sources)
-        ])
+        logger.info("开始批处理任务 %s: %d 个视频", task_id, len(video_sources))
 
-        # 阶段2: 并行压缩和上传
-        # 阶段3: 并行 VL 分析
+        # 阶段1-3: 并行 准备 → 压缩上传 → VL分析（chord header）
         # 阶段4: 聚合分析结果，生成剪辑方案
         # 阶段5: 执行剪辑方案
+        analysis_header = _build_analysis_header(video_sources, config)
 
         # 获取视频路径列表
         video_paths = [vs.get('path') or vs.get('url') for vs in video_sources]
 
+        # 聚合任务：生成剪辑方案 → 基础剪辑任务
+        callback = (
+            generate_clip_plan_task.s(
+                config.get('text_model', 'qwen-plus'),
+                config.get('target_duration'),
+                config.get('clip_strategy', 'highlights'),
+                workflow_id=task_id
+            )
+            | execute_clip_plan_task.s(
+                video_paths,
+                config.get('output_quality', 'high')
+            )
+        )
+
         # 决定是否使用完整视频生产流程
         use_full_production = config.get('add_narration', False) or config.get('background_music_path')
 
         if use_full_production:
             # 完整流程：包含脚本生成、TTS、音频合成
             logger.info("使用完整视频生产流程（包含配音和音乐）")
-
-            # 使用 chord 串联所有阶段
-            workflow = chord([
-                # 准备 → 压缩上传 → VL分析（链式调用）
-                prepare_video_task.s(video_source, idx)
-                | compress_and_upload_task.s(
-                    config.get('global_compression_profile', 'balanced'),
-                    config.get('temp_storage_expiry_hours', 24)
-                )
-                | analyze_video_task.s(config.get('vl_model', 'qwen-vl-plus'))
-                for idx, video_source in enumerate(video_sources)
-            ])(
-                # 聚合任务：生成剪辑方案
-                generate_clip_plan_task.s(
-                    config.get('text_model', 'qwen-plus'),
-                    config.get('target_duration'),
-                    config.get('clip_strategy', 'highlights')
-                )
-                # 基础剪辑任务
-                | execute_clip_plan_task.s(
-                    video_paths,
-                    config.get('output_quality', 'high')
-                )
-                # 完整视频生产任务（新增）
-                | produce_final_video_with_narration_task.s(
-                    video_paths=video_paths,
-                    config=config
-                )
-            )
+            callback = callback | build_final_production_chain(video_paths, config)
         else:
             # 简化流程：仅剪辑拼接
             logger.info("使用简化流程（仅剪辑拼接）")
 
-            workflow = chord([
-                # 准备 → 压缩上传 → VL分析（链式调用）
-                prepare_video_task.s(video_source, idx)
-                | compress_and_upload_task.s(
-                    config.get('global_compression_profile', 'balanced'),
-                    config.get('temp_storage_expiry_hours', 24)
-                )
-                | analyze_video_task.s(config.get('vl_model', 'qwen-vl-plus'))
-                for idx, video_source in enumerate(video_sources)
-            ])(
-                # 聚合任务：生成剪辑方案
-                generate_clip_plan_task.s(
-                    config.get('text_model', 'qwen-plus'),
-                    config.get('target_duration'),
-                    config.get('clip_strategy', 'highlights')
-                )
-                # 最终任务：执行剪辑方案
-                | execute_clip_plan_task.s(
-                    video_paths,
-                    config.get('output_quality', 'high')
-                )
-            )
+        workflow = chord(analysis_header, callback)
 
         # 异步执行工作流
         result = workflow.apply_async()
 
-        logger.info(f"批处理工作流已启动: task_id={task_id}, workflow_id={result.id}")
+        logger.info("批处理工作流已启动: task_id=%s, workflow_id=%s", task_id, result.id)
 
         return task_id
 
@@ -1120,7 +1760,7 @@ def process_video_pipeline_task(
             'config': config
         }
 
-        logger.info(f"任务 {task_id} 提交成功: {self.request.id}")
+        logger.info("任务 %s 提交成功: %s", task_id, self.request.id)
 
         return result
 
@@ -2,8 +2,17 @@
 Celery 应用配置
 批处理任务的分布式队列系统
 """
+import asyncio
+from typing import Optional, List, Callable, Awaitable
+
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure
+from celery.signals import (
+    task_prerun,
+    task_postrun,
+    task_failure,
+    worker_process_init,
+    worker_process_shutdown
+)
 
 from app.config import settings
 from app.utils.logger import logger
@@ -20,10 +29,15 @@ celery_app = Celery(
 
 # Celery 配置
 celery_app.conf.update(
-    # 任务序列化
-    task_serializer='json',
-    accept_content=['json'],
-    result_serializer='json',
+    # 任务序列化：msgpack 比 JSON 更紧凑，分析结果等大字典每次传递都受益
+    # accept_content 保留 json 以兼容旧消息
+    task_serializer='msgpack',
+    accept_content=['msgpack', 'json'],
+    result_serializer='msgpack',
+    result_accept_content=['msgpack', 'json'],
+    # 消息压缩：chord 聚合时 analysis_results 携带完整 vl_analysis，体积较大
+    task_compression='lz4',
+    result_compression='lz4',
     timezone='Asia/Shanghai',
     enable_utc=True,
 
@@ -41,12 +55,35 @@ celery_app.conf.update(
 
     # Worker 配置
     worker_prefetch_multiplier=1,  # 每次只取1个任务（适合长时间任务）
+    # 任务完成后再确认：worker 崩溃时任务重新投递而不是丢失
+    # 建议以 -Ofair 启动 worker，避免慢任务占住已预取的队列
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=50,  # 每个 worker 执行50个任务后重启（防止内存泄漏）
     worker_disable_rate_limits=True,
 
-    # 任务路由（可选）
+    # 任务路由：按瓶颈资源拆分队列，避免快任务排在慢任务之后（队头阻塞）
+    # - prepare_q: 下载/验证（网络）
+    # - compress_q: FFmpeg 压缩（CPU/NVENC），单视频融合任务也以压缩为主
+    # - analyze_q: VL 模型分析（API 限流）
+    # - aggregate_q: 编排与聚合（轻量）
+    # - clipping_q: 剪辑执行与成片生产（CPU/内存）
+    task_default_queue='aggregate_q',
     task_routes={
-        'app.workers.batch_processing_tasks.*': {'queue': 'batch_processing'},
+        'batch_processing.prepare_video': {'queue': 'prepare_q'},
+        'batch_processing.compress_and_upload': {'queue': 'compress_q'},
+        'batch_processing.process_single_video': {'queue': 'compress_q'},
+        'batch_processing.process_video_batch': {'queue': 'compress_q'},
+        'batch_processing.analyze_video': {'queue': 'analyze_q'},
+        'batch_processing.generate_clip_plan': {'queue': 'aggregate_q'},
+        'batch_processing.batch_process_videos': {'queue': 'aggregate_q'},
+        'task_service.process_video_pipeline': {'queue': 'aggregate_q'},
+        'batch_processing.execute_clip_plan': {'queue': 'clipping_q'},
+        'batch_processing.produce_final_video_with_narration': {'queue': 'clipping_q'},
+        # 成片生产三阶段分队列：TTS 等待 API，合成占用 CPU，上传占用网络，可跨工作流重叠
+        'batch_processing.generate_narration': {'queue': 'analyze_q'},
+        'batch_processing.mux_video_audio': {'queue': 'clipping_q'},
+        'batch_processing.upload_final': {'queue': 'prepare_q'},
     },
 
     # 并发配置
@@ -54,18 +91,76 @@ celery_app.conf.update(
 )
 
 
+# Worker 进程级事件循环
+# 每个 worker 子进程持有一个常驻事件循环，任务中的所有协程共用，
+# 避免每次调用都重新创建事件循环，并让 HTTP/OSS 连接池可以跨任务复用
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# worker 进程退出时、事件循环关闭前执行的异步清理函数（关闭连接池等）
+_worker_cleanups: List[Callable[[], Awaitable[None]]] = []
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """
+    获取当前 worker 进程的常驻事件循环
+
+    在 worker_process_init 中创建；eager 模式或 solo 池下未触发信号时按需创建
+
+    Returns:
+        asyncio.AbstractEventLoop: 事件循环
+    """
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
+
+
+def register_worker_cleanup(cleanup: Callable[[], Awaitable[None]]):
+    """
+    注册 worker 进程退出时的异步清理函数
+
+    Args:
+        cleanup: 无参数的协程函数，在常驻事件循环关闭前执行
+    """
+    _worker_cleanups.append(cleanup)
+
+
 # Celery 信号处理器
 
+@worker_process_init.connect
+def worker_process_init_handler(**kwargs):
+    """Worker 子进程启动钩子：创建常驻事件循环"""
+    get_worker_loop()
+    logger.info("Worker 进程事件循环已初始化")
+
+
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(**kwargs):
+    """Worker 子进程退出钩子：关闭常驻事件循环"""
+    global _worker_loop
+    if _worker_loop is not None and not _worker_loop.is_closed():
+        for cleanup in _worker_cleanups:
+            try:
+                _worker_loop.run_until_complete(cleanup())
+            except Exception as e:
+                logger.warning(f"Worker 进程清理失败: {str(e)}")
+        _worker_loop.run_until_complete(_worker_loop.shutdown_asyncgens())
+        _worker_loop.close()
+    _worker_loop = None
+
+
 @task_prerun.connect
 def task_prerun_handler(task_id, task, *args, **kwargs):
     """任务开始前的钩子"""
-    logger.info(f"任务开始: {task.name} [ID: {task_id}]")
+    logger.debug("任务开始: %s [ID: %s]", task.name, task_id)
 
 
 @task_postrun.connect
 def task_postrun_handler(task_id, task, *args, **kwargs):
     """任务完成后的钩子"""
-    logger.info(f"任务完成: {task.name} [ID: {task_id}]")
+    logger.debug("任务完成: %s [ID: %s]", task.name, task_id)
 
 
 @task_failure.connect
@@ -10,12 +10,15 @@
 5. 视频滤镜效果
 """
 import asyncio
+import os
 import sys
-from pathlib import Path
+import time
+from typing import Any, List
 
 # 添加项目根目录到路径
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from app.services.advanced_video_mixing import (
     advanced_video_mixing_service,
@@ -37,29 +40,12 @@ async def demo_basic_mixing():
         "storage/videos/video2.mp4"
     ]
 
-    segments = [
-        ClipSegment(
-            video_index=0,
-            start_time=0.0,
-            end_time=5.0,
-            priority=4,
-            reason="精彩开场"
-        ),
-        ClipSegment(
-            video_index=1,
-            start_time=10.0,
-            end_time=15.0,
-            priority=5,
-            reason="高潮时刻"
-        ),
-        ClipSegment(
-            video_index=0,
-            start_time=20.0,
-            end_time=25.0,
-            priority=3,
-            reason="完美收尾"
-        ),
-    ]
+    # (video_index, start_time, end_time, priority, reason)
+    segments = ClipSegment.batch_construct([
+        (0, 0.0, 5.0, 4, "精彩开场"),
+        (1, 10.0, 15.0, 5, "高潮时刻"),
+        (0, 20.0, 25.0, 3, "完美收尾"),
+    ])
 
     try:
         # 使用滑动转场效果
@@ -87,36 +73,12 @@ async def demo_smart_sorting():
     print("\n=== 示例2: 智能片段排序 ===\n")
 
     # 创建多个片段
-    segments = [
-        ClipSegment(
-            video_index=0,
-            start_time=0.0,
-            end_time=3.0,
-            priority=2,
-            reason="普通场景"
-        ),
-        ClipSegment(
-            video_index=0,
-            start_time=10.0,
-            end_time=15.0,
-            priority=5,
-            reason="精彩高潮时刻"
-        ),
-        ClipSegment(
-            video_index=1,
-            start_time=5.0,
-            end_time=8.0,
-            priority=3,
-            reason="不错的转场"
-        ),
-        ClipSegment(
-            video_index=1,
-            start_time=20.0,
-            end_time=25.0,
-            priority=4,
-            reason="震撼的亮点"
-        ),
-    ]
+    segments = ClipSegment.batch_construct([
+        (0, 0.0, 3.0, 2, "普通场景"),
+        (0, 10.0, 15.0, 5, "精彩高潮时刻"),
+        (1, 5.0, 8.0, 3, "不错的转场"),
+        (1, 20.0, 25.0, 4, "震撼的亮点"),
+    ])
 
     # 使用渐强式叙事（从低到高）
     sorted_segments, stats = smart_clip_strategy.create_optimal_clip_plan(
@@ -193,15 +155,9 @@ async def demo_with_filters():
 
     video_paths = ["storage/videos/video1.mp4"]
 
-    segments = [
-        ClipSegment(
-            video_index=0,
-            start_time=0.0,
-            end_time=10.0,
-            priority=4,
-            reason="应用滤镜的片段"
-        ),
-    ]
+    segments = ClipSegment.batch_construct([
+        (0, 0.0, 10.0, 4, "应用滤镜的片段"),
+    ])
 
     # 定义滤镜配置
     filters = {
@@ -234,22 +190,16 @@ async def demo_parallel_extraction():
         "storage/videos/video2.mp4"
     ]
 
-    # 创建多个片段（模拟大量剪辑任务）
-    segments = []
-    for i in range(10):
-        segments.append(
-            ClipSegment(
-                video_index=i % 2,
-                start_time=i * 5.0,
-                end_time=(i + 1) * 5.0,
-                priority=3,
-                reason=f"片段 {i+1}"
-            )
-        )
+    # 创建多个片段（模拟大量剪辑任务）：每段5秒，交替取自两个视频
+    segment_count = 10
+    segment_length = 5.0
+    segments = ClipSegment.batch_construct([
+        (i & 1, i * segment_length, (i + 1) * segment_length, 3, f"片段 {i + 1}")
+        for i in range(segment_count)
+    ])
 
     try:
-        import time
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
 
         # 并行提取
         clip_paths = await advanced_video_mixing_service.extract_clips_parallel(
@@ -257,17 +207,59 @@ async def demo_parallel_extraction():
             segments=segments
         )
 
-        elapsed_time = time.time() - start_time
+        elapsed_time = (time.perf_counter_ns() - start_ns) / 1e9
 
         print(f"✅ 并行提取完成:")
         print(f"   提取片段数: {len(clip_paths)}")
         print(f"   总耗时: {elapsed_time:.2f}秒")
         print(f"   平均速度: {len(clip_paths)/elapsed_time:.2f} 片段/秒")
 
+        # 配置了 DashScope 时，继续并发分析提取出的片段
+        if os.getenv("DASHSCOPE_API_KEY"):
+            analyses = await analyze_clips(clip_paths)
+            failed = sum(isinstance(a, Exception) for a in analyses)
+            print(f"✅ 片段分析完成: 成功 {len(analyses) - failed}，失败 {failed}")
+
     except Exception as e:
         print(f"❌ 提取失败: {str(e)}")
 
 
+# 片段分析的最大并发请求数
+CLIP_ANALYSIS_CONCURRENCY = 8
+
+
+async def analyze_clips(
+    clip_paths: List[str],
+    prompt: str = "请简要描述这个片段的主要内容"
+) -> List[Any]:
+    """
+    并发分析多个片段
+
+    片段以本地文件方式交给 DashScope SDK 上传，不做 base64 编码；
+    SDK 调用在线程池中执行，用信号量限制同时在途的请求数
+
+    Args:
+        clip_paths: 片段文件路径列表
+        prompt: 分析提示词
+
+    Returns:
+        与 clip_paths 一一对应的分析结果，失败项为异常对象
+    """
+    from app.utils.ai_clients.dashscope_client import DashScopeClient
+
+    client = DashScopeClient()
+    semaphore = asyncio.Semaphore(CLIP_ANALYSIS_CONCURRENCY)
+
+    async def analyze_one(path: str) -> str:
+        async with semaphore:
+            return await client.analyze_video_visual_file(path, prompt)
+
+    return await asyncio.gather(
+        *(analyze_one(path) for path in clip_paths),
+        return_exceptions=True
+    )
+
+
 async def demo_comprehensive_workflow():
     """示例7: 综合工作流（智能排序 + 高级混剪）"""
     print("\n=== 示例7: 综合工作流 ===\n")
@@ -278,13 +270,13 @@ async def demo_comprehensive_workflow():
     ]
 
     # 原始片段
-    raw_segments = [
-        ClipSegment(0, 0.0, 5.0, 2, "开场介绍"),
-        ClipSegment(0, 10.0, 15.0, 5, "精彩高潮"),
-        ClipSegment(1, 5.0, 10.0, 3, "转场过渡"),
-        ClipSegment(1, 20.0, 25.0, 4, "震撼亮点"),
-        ClipSegment(0, 30.0, 35.0, 1, "填充内容"),
-    ]
+    raw_segments = ClipSegment.batch_construct([
+        (0, 0.0, 5.0, 2, "开场介绍"),
+        (0, 10.0, 15.0, 5, "精彩高潮"),
+        (1, 5.0, 10.0, 3, "转场过渡"),
+        (1, 20.0, 25.0, 4, "震撼亮点"),
+        (0, 30.0, 35.0, 1, "填充内容"),
+    ])
 
     try:
         # 步骤1: 智能优化片段方案
@@ -323,41 +315,72 @@ async def demo_comprehensive_workflow():
         print(f"❌ 工作流失败: {str(e)}")
 
 
+# "运行所有示例"时的分组：3/4/5 输入输出互不依赖，可并发执行；其余按顺序执行
+INDEPENDENT_DEMOS = (3, 4, 5)
+SEQUENTIAL_DEMOS = (1, 2, 6, 7)
+
+# 单个示例的超时时间（秒），避免某个 FFmpeg 进程卡住阻塞整批示例
+DEMO_TIMEOUT = 600
+
+
+# 示例注册表与菜单文本在导入时构建一次，菜单循环中只做查表
+DEMOS = {
+    1: ("基础多视频混剪", demo_basic_mixing),
+    2: ("智能片段排序", demo_smart_sorting),
+    3: ("画中画布局", demo_pip_layout),
+    4: ("分屏布局", demo_split_screen),
+    5: ("视频滤镜效果", demo_with_filters),
+    6: ("并行提取优化", demo_parallel_extraction),
+    7: ("综合工作流", demo_comprehensive_workflow),
+}
+_DISPATCH = {str(k): v for k, v in DEMOS.items()}
+
+MENU_TEXT = "\n".join([
+    "\n" + "="*60,
+    "🎬 高级视频混剪功能演示",
+    "="*60,
+    "\n请选择演示示例:",
+    "  1. 基础多视频混剪（带转场）",
+    "  2. 智能片段排序",
+    "  3. 画中画布局",
+    "  4. 分屏布局",
+    "  5. 视频滤镜效果",
+    "  6. 并行提取优化",
+    "  7. 综合工作流",
+    "  8. 运行所有示例",
+    "  0. 退出",
+    "="*60,
+])
+
+
+BANNER = """
+    ╔════════════════════════════════════════════════════════════╗
+    ║                                                            ║
+    ║     🎬 Auto-Clip 高级视频混剪功能演示                     ║
+    ║                                                            ║
+    ║     新功能特性:                                            ║
+    ║     ✨ 多种转场效果（淡入淡出、滑动、缩放等）              ║
+    ║     ⚡ 并行处理优化（4x性能提升）                          ║
+    ║     🧠 智能片段排序（4种叙事风格）                         ║
+    ║     🎨 视频滤镜和特效                                      ║
+    ║     📐 多种布局（画中画、分屏、网格）                      ║
+    ║                                                            ║
+    ╚════════════════════════════════════════════════════════════╝
+    """
+
+
 def print_menu():
     """打印菜单"""
-    print("\n" + "="*60)
-    print("🎬 高级视频混剪功能演示")
-    print("="*60)
-    print("\n请选择演示示例:")
-    print("  1. 基础多视频混剪（带转场）")
-    print("  2. 智能片段排序")
-    print("  3. 画中画布局")
-    print("  4. 分屏布局")
-    print("  5. 视频滤镜效果")
-    print("  6. 并行提取优化")
-    print("  7. 综合工作流")
-    print("  8. 运行所有示例")
-    print("  0. 退出")
-    print("="*60)
+    print(MENU_TEXT)
 
 
 async def main():
     """主函数"""
-    demos = {
-        1: ("基础多视频混剪", demo_basic_mixing),
-        2: ("智能片段排序", demo_smart_sorting),
-        3: ("画中画布局", demo_pip_layout),
-        4: ("分屏布局", demo_split_screen),
-        5: ("视频滤镜效果", demo_with_filters),
-        6: ("并行提取优化", demo_parallel_extraction),
-        7: ("综合工作流", demo_comprehensive_workflow),
-    }
-
     while True:
         print_menu()
 
         try:
-            choice = input("\n请输入选项 (0-8): ").strip()
+            choice = (await asyncio.to_thread(input, "\n请输入选项 (0-8): ")).strip()
 
             if choice == "0":
                 print("\n👋 再见!")
@@ -365,19 +388,35 @@ async def main():
 
             elif choice == "8":
                 print("\n🚀 运行所有示例...\n")
-                for name, demo_func in demos.values():
+
+                # 输出文件互不相关的示例并发执行，FFmpeg 进程可以重叠
+                print(f"\n{'='*60}")
+                print(f"▶️  并发运行: {', '.join(DEMOS[k][0] for k in INDEPENDENT_DEMOS)}")
+                print(f"{'='*60}")
+                results = await asyncio.gather(
+                    *(
+                        asyncio.wait_for(DEMOS[k][1](), timeout=DEMO_TIMEOUT)
+                        for k in INDEPENDENT_DEMOS
+                    ),
+                    return_exceptions=True
+                )
+                for k, result in zip(INDEPENDENT_DEMOS, results):
+                    if isinstance(result, Exception):
+                        print(f"❌ 示例失败: {DEMOS[k][0]}: {str(result) or type(result).__name__}")
+
+                for k in SEQUENTIAL_DEMOS:
+                    name, demo_func = DEMOS[k]
                     print(f"\n{'='*60}")
                     print(f"▶️  {name}")
                     print(f"{'='*60}")
                     try:
-                        await demo_func()
+                        await asyncio.wait_for(demo_func(), timeout=DEMO_TIMEOUT)
                     except Exception as e:
-                        print(f"❌ 示例失败: {str(e)}")
+                        print(f"❌ 示例失败: {str(e) or type(e).__name__}")
                     print("\n" + "="*60)
 
-            elif choice.isdigit() and int(choice) in demos:
-                demo_num = int(choice)
-                name, demo_func = demos[demo_num]
+            elif choice in _DISPATCH:
+                name, demo_func = _DISPATCH[choice]
                 print(f"\n▶️  运行示例: {name}")
                 await demo_func()
 
@@ -392,22 +431,16 @@ async def main():
 
 
 if __name__ == "__main__":
-    print("""
-    ╔════════════════════════════════════════════════════════════╗
-    ║                                                            ║
-    ║     🎬 Auto-Clip 高级视频混剪功能演示                     ║
-    ║                                                            ║
-    ║     新功能特性:                                            ║
-    ║     ✨ 多种转场效果（淡入淡出、滑动、缩放等）              ║
-    ║     ⚡ 并行处理优化（4x性能提升）                          ║
-    ║     🧠 智能片段排序（4种叙事风格）                         ║
-    ║     🎨 视频滤镜和特效                                      ║
-    ║     📐 多种布局（画中画、分屏、网格）                      ║
-    ║                                                            ║
-    ╚════════════════════════════════════════════════════════════╝
-    """)
+    print(BANNER)
+
+    # 安装了 uvloop 时使用其事件循环（可选依赖）
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
 
     try:
-        asyncio.run(main())
+        run(main())
     except Exception as e:
         print(f"\n❌ 程序异常: {str(e)}")
@@ -13,10 +13,11 @@ Agno智能剪辑Agent系统 - 最佳配置实践
 
 import os
 import sys
-from pathlib import Path
 
 # 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from app.agents import AgnoClipTeam
 from rich.console import Console
@@ -89,11 +90,10 @@ def run_example(video_path: str):
         console.print(f"总耗时: {output.processing_time:.1f}秒")
         console.print(f"质量评分: {output.quality_review.overall_score}/10")
 
-        # 保存结果
-        import json
+        # 保存结果（由 pydantic-core 直接序列化，无需先转 dict 再走 json 模块）
         output_file = "agno_output.json"
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(output.model_dump(), f, ensure_ascii=False, indent=2, default=str)
+            f.write(output.model_dump_json(indent=2))
 
         console.print(f"结果已保存: {output_file}", style="cyan")
 
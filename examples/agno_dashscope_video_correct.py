@@ -8,20 +8,75 @@ Author: Auto-Clip Team
 Date: 2025-11-12
 """
 
+import os
 import sys
-from pathlib import Path
+from collections import deque
+from typing import Tuple
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.panel import Panel
+from rich.live import Live
 
 # 添加项目根目录
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 # 加载环境变量
 load_dotenv()
 
 console = Console()
 
+# 出错时是否打印完整堆栈（-v 参数或 AUTOCLIP_VERBOSE=1）
+VERBOSE = "-v" in sys.argv or os.getenv("AUTOCLIP_VERBOSE") == "1"
+
+# agno 为可选依赖：模块加载时统一导入一次，未安装时各演示给出提示
+try:
+    from agno.agent import Agent
+    from agno.media import Video
+    from agno.models.dashscope import DashScope
+except ImportError:
+    Agent = Video = DashScope = None
+
+# 流式输出时保留的最近分片数，限制显示窗口和内存占用
+STREAM_WINDOW_CHUNKS = 8192
+
+# 各演示共用的Agent（首次使用时创建）
+_agent = None
+
+
+def get_agent():
+    """获取演示共用的 DashScope qwen-vl-plus Agent"""
+    global _agent
+    if _agent is None:
+        _agent = Agent(
+            model=DashScope(id="qwen-vl-plus"),  # ✅ DashScope视觉模型
+            markdown=True
+        )
+    return _agent
+
+
+def _resolve_video(video_path: str) -> Tuple[str, int]:
+    """
+    一次 stat 同时完成存在性检查与大小获取
+
+    Returns:
+        (绝对路径, 文件大小字节数)
+
+    Raises:
+        FileNotFoundError: 视频不存在
+    """
+    size = os.stat(video_path).st_size
+    return os.path.realpath(video_path), size
+
+
+def _agno_available() -> bool:
+    """检查 agno 是否已安装"""
+    if Agent is None:
+        console.print("❌ 未安装 agno，请先执行: pip install agno", style="bold red")
+        return False
+    return True
+
 
 def demo_dashscope_video_with_agno():
     """
@@ -32,9 +87,8 @@ def demo_dashscope_video_with_agno():
     2. 使用 agno.media.Video 加载本地文件
     3. qwen-vl-plus 模型支持视频理解
     """
-    from agno.agent import Agent
-    from agno.media import Video
-    from agno.models.dashscope import DashScope
+    if not _agno_available():
+        return
 
     console.print("\n" + "=" * 70, style="bold cyan")
     console.print("✅ 正确方式：Agno + DashScope 本地视频分析", style="bold cyan")
@@ -43,25 +97,24 @@ def demo_dashscope_video_with_agno():
     # 1. 创建Agent（使用DashScope的qwen-vl-plus视觉模型）
     console.print("🤖 初始化Agno Agent（DashScope qwen-vl-plus）...", style="blue")
 
-    agent = Agent(
-        model=DashScope(id="qwen-vl-plus"),  # ✅ DashScope视觉模型
-        markdown=True
-    )
+    agent = get_agent()
 
     console.print("✅ Agent创建成功", style="green")
 
     # 2. 加载本地视频
     video_path = "/Users/niko/auto-clip/tmp/7514135682735639860.mp4"
 
-    if not Path(video_path).exists():
+    try:
+        abs_path, size = _resolve_video(video_path)
+    except FileNotFoundError:
         console.print(f"❌ 视频不存在: {video_path}", style="bold red")
         console.print("💡 请修改 video_path 为实际路径", style="yellow")
         return
 
-    console.print(f"\n📹 加载视频: {Path(video_path).name}", style="blue")
+    console.print(f"\n📹 加载视频: {os.path.basename(abs_path)} ({size / (1 << 20):.2f} MB)", style="blue")
 
     # ✅ 关键：使用 agno.media.Video 加载本地文件
-    video = Video(filepath=str(Path(video_path).absolute()))
+    video = Video(filepath=abs_path)
 
     console.print("✅ 视频加载成功", style="green")
 
@@ -81,16 +134,14 @@ def demo_dashscope_video_with_agno():
     console.print("\n🔍 开始分析视频...", style="blue")
 
     try:
-        # ✅ 调用Agent分析视频
-        response = agent.run(
-            prompt,
-            videos=[video]  # 传入Video对象
-        )
-
-        # 显示结果
+        # ✅ 流式调用Agent分析视频，实时刷新最近的输出窗口
         console.print("\n📊 分析结果:", style="bold green")
-        content = response.content if hasattr(response, 'content') else str(response)
-        console.print(Panel(content, title="DashScope qwen-vl-plus 分析", border_style="green"))
+        window = deque(maxlen=STREAM_WINDOW_CHUNKS)
+        with Live(console=console, refresh_per_second=20) as live:
+            for chunk in agent.run(prompt, videos=[video], stream=True):  # 传入Video对象
+                if chunk.content:
+                    window.append(chunk.content)
+                    live.update(Panel("".join(window), title="DashScope qwen-vl-plus 分析", border_style="green"))
 
         # 代码示例
         code_example = """
@@ -132,8 +183,9 @@ DASHSCOPE_API_KEY=sk-xxxxxxxxxxxx
 
     except Exception as e:
         console.print(f"\n❌ 分析失败: {e}", style="bold red")
-        import traceback
-        console.print(traceback.format_exc(), style="red")
+        if VERBOSE:
+            import traceback
+            console.print(traceback.format_exc(), style="red")
 
 
 def demo_dashscope_video_async():
@@ -141,29 +193,28 @@ def demo_dashscope_video_async():
     异步方式使用 Agno + DashScope 分析视频
     """
     import asyncio
-    from agno.agent import Agent
-    from agno.media import Video
-    from agno.models.dashscope import DashScope
+
+    if not _agno_available():
+        return
 
     console.print("\n" + "=" * 70, style="bold magenta")
     console.print("⚡ 异步方式：Agno + DashScope", style="bold magenta")
     console.print("=" * 70 + "\n", style="bold magenta")
 
     async def analyze_async():
-        # 创建Agent
-        agent = Agent(
-            model=DashScope(id="qwen-vl-plus"),
-            markdown=True
-        )
+        # 获取共用Agent
+        agent = get_agent()
 
         # 加载视频
         video_path = "/Users/niko/auto-clip/tmp/7514135682735639860.mp4"
 
-        if not Path(video_path).exists():
+        try:
+            abs_path, _ = _resolve_video(video_path)
+        except FileNotFoundError:
             console.print(f"❌ 视频不存在: {video_path}", style="bold red")
             return
 
-        video = Video(filepath=str(Path(video_path).absolute()))
+        video = Video(filepath=abs_path)
 
         console.print("🔍 异步分析中...", style="blue")
 
@@ -214,28 +265,26 @@ def demo_dashscope_video_streaming():
     """
     流式输出：实时查看分析结果
     """
-    from agno.agent import Agent
-    from agno.media import Video
-    from agno.models.dashscope import DashScope
+    if not _agno_available():
+        return
 
     console.print("\n" + "=" * 70, style="bold yellow")
     console.print("🌊 流式输出：Agno + DashScope", style="bold yellow")
     console.print("=" * 70 + "\n", style="bold yellow")
 
-    # 创建Agent
-    agent = Agent(
-        model=DashScope(id="qwen-vl-plus"),
-        markdown=True
-    )
+    # 获取共用Agent
+    agent = get_agent()
 
     # 加载视频
     video_path = "/Users/niko/auto-clip/tmp/7514135682735639860.mp4"
 
-    if not Path(video_path).exists():
+    try:
+        abs_path, _ = _resolve_video(video_path)
+    except FileNotFoundError:
         console.print(f"❌ 视频不存在: {video_path}", style="bold red")
         return
 
-    video = Video(filepath=str(Path(video_path).absolute()))
+    video = Video(filepath=abs_path)
 
     console.print("🌊 流式分析中（实时显示）...\n", style="blue")
 
@@ -332,8 +381,9 @@ def main():
         console.print("\n\n👋 演示中断", style="yellow")
     except Exception as e:
         console.print(f"\n❌ 演示出错: {e}", style="bold red")
-        import traceback
-        console.print(traceback.format_exc(), style="red")
+        if VERBOSE:
+            import traceback
+            console.print(traceback.format_exc(), style="red")
 
 
 if __name__ == "__main__":
@@ -14,22 +14,123 @@ Date: 2025-11-12
 import sys
 import os
 import asyncio
-import base64
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
 from rich.console import Console
 from rich.panel import Panel
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
 from dotenv import load_dotenv
 
 # 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 # 加载环境变量
 load_dotenv()
 
 console = Console()
 
+# 出错时是否打印完整堆栈（-v 参数或 AUTOCLIP_VERBOSE=1）
+VERBOSE = "-v" in sys.argv or os.getenv("AUTOCLIP_VERBOSE") == "1"
+
+# 演示日志（含异常堆栈）写入文件，控制台只显示简短错误
+DEMO_LOG_FILE = os.path.join(_ROOT, "logs", "agno_dashscope_video_demo.log")
+
+
+def _setup_demo_logging():
+    """
+    日志只写文件：先给根logger挂文件处理器，setup_logging 中的 basicConfig
+    发现已有处理器便不再添加stdout输出，避免JSON日志混入演示界面
+    """
+    import logging
+    from app.utils.logger import setup_logging
+
+    os.makedirs(os.path.dirname(DEMO_LOG_FILE), exist_ok=True)
+    logging.getLogger().addHandler(logging.FileHandler(DEMO_LOG_FILE, encoding="utf-8"))
+    setup_logging()
+
+
+_setup_demo_logging()
+
+from app.utils.logger import get_logger  # noqa: E402
+
+logger = get_logger(__name__)
+
+# 超过该大小的视频不再base64内联，改由SDK按本地文件上传
+INLINE_BASE64_MAX_BYTES = 64 * 1024 * 1024
+
+# "运行所有方案"时同时运行的演示数
+ALL_DEMOS_CONCURRENCY = 2
+
+# 各演示共用的DashScope客户端（首次使用时创建）
+_client = None
+
+
+# 已创建的Agent，按 (模型ID, 工具名) 复用，重复运行演示时不再重建模型客户端和工具描述
+_AGENT_CACHE: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+
+
+def _get_agent(model_id: str, tools: List[Any], factory: Callable[[str, List[Any]], Any]):
+    """
+    获取（必要时创建）指定模型和工具组合的Agent
+
+    Args:
+        model_id: 模型ID
+        tools: 工具列表
+        factory: 缓存未命中时调用 factory(model_id, tools) 创建Agent
+
+    Returns:
+        Agent实例
+    """
+    key = (model_id, tuple(getattr(t, "name", None) or t.__qualname__ for t in tools))
+    if key not in _AGENT_CACHE:
+        _AGENT_CACHE[key] = factory(model_id, tools)
+    return _AGENT_CACHE[key]
+
+
+# 所有演示共用一个进度显示（rich 同一时间只允许一个 Live），并发运行时各自添加任务行
+_progress = None
+_progress_users = 0
+
+
+@contextmanager
+def _spinner(description: str):
+    """显示一个不定长进度行，退出时移除；多个演示并发时共用同一进度显示"""
+    global _progress, _progress_users
+    from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+    if _progress is None:
+        # 由 rich 的刷新线程按固定频率重绘（含已用时），不依赖被等待的调用让出事件循环
+        _progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            TimeElapsedColumn(),
+            console=console,
+            transient=True,
+            refresh_per_second=4
+        )
+        _progress.start()
+    _progress_users += 1
+    task = _progress.add_task(description, total=None)
+    try:
+        yield
+    finally:
+        _progress.remove_task(task)
+        _progress_users -= 1
+        if _progress_users == 0:
+            _progress.stop()
+            _progress = None
+
+
+def get_client():
+    """获取演示共用的DashScope客户端，重复运行菜单时不再重复初始化"""
+    global _client
+    if _client is None:
+        from app.utils.ai_clients.dashscope_client import DashScopeClient
+        _client = DashScopeClient()
+    return _client
+
 
 # ============================================================================
 # 方案1：直接使用DashScope官方SDK（推荐，最简单）
@@ -41,16 +142,15 @@ async def demo_dashscope_sdk():
 
     特点：
     - ✅ 简单直接，项目已集成
-    - ✅ 支持base64编码上传本地文件
+    - ✅ 支持SDK直接上传本地文件
     - ✅ 官方维护，稳定可靠
     - ❌ 不是通过agno框架调用
     """
+
     console.print("\n" + "=" * 70, style="bold cyan")
     console.print("方案1：DashScope官方SDK（推荐）", style="bold cyan")
     console.print("=" * 70 + "\n", style="bold cyan")
 
-    from app.utils.ai_clients.dashscope_client import DashScopeClient
-
     # 检查API密钥
     if not os.getenv("DASHSCOPE_API_KEY"):
         console.print("❌ 未设置DASHSCOPE_API_KEY环境变量", style="bold red")
@@ -59,41 +159,32 @@ async def demo_dashscope_sdk():
     # 示例视频路径（替换为你的视频）
     video_path = "/Users/niko/auto-clip/tmp/7514135682735639860.mp4"
 
-    if not Path(video_path).exists():
+    try:
+        file_size = os.stat(video_path).st_size
+    except FileNotFoundError:
         console.print(f"❌ 视频文件不存在: {video_path}", style="bold red")
         console.print("💡 提示：请将 video_path 替换为实际的视频路径", style="yellow")
         return
 
     try:
-        # 初始化客户端
-        client = DashScopeClient()
+        # 获取共用客户端
+        client = get_client()
         console.print(f"✅ DashScope客户端初始化成功", style="green")
 
-        # 读取并编码视频
-        console.print(f"📹 读取视频文件: {Path(video_path).name}", style="blue")
-        with open(video_path, "rb") as f:
-            video_base64 = base64.b64encode(f.read()).decode("utf-8")
-
-        file_size_mb = len(video_base64) / (1024 * 1024) * 0.75  # base64约75%的原始大小
+        # 本地文件由SDK直接上传，无需读入内存做base64编码
+        console.print(f"📹 视频文件: {os.path.basename(video_path)}", style="blue")
+        file_size_mb = file_size / (1024 * 1024)
         console.print(f"📦 视频大小: {file_size_mb:.2f} MB", style="blue")
 
         # 分析视频
         prompt = "请详细分析这个视频的内容，包括：\n1. 主要场景和环境\n2. 人物和动作\n3. 情感氛围\n4. 关键时刻（标注时间戳）"
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("🔍 DashScope VL模型分析中...", total=None)
-
-            result = await client.analyze_video_visual_base64(
-                video_base64=video_base64,
+        with _spinner("🔍 DashScope VL模型分析中..."):
+            result = await client.analyze_video_visual_file(
+                video_path=video_path,
                 prompt=prompt
             )
 
-            progress.update(task, completed=True)
-
         # 显示结果
         console.print("\n📊 分析结果:", style="bold green")
         console.print(Panel(result, title="qwen-vl-plus 分析结果", border_style="green"))
@@ -102,17 +193,12 @@ async def demo_dashscope_sdk():
         code_example = """
 # 方案1使用示例
 from app.utils.ai_clients.dashscope_client import DashScopeClient
-import base64
 
 client = DashScopeClient()
 
-# 读取视频
-with open("video.mp4", "rb") as f:
-    video_base64 = base64.b64encode(f.read()).decode("utf-8")
-
-# 分析视频
-result = await client.analyze_video_visual_base64(
-    video_base64=video_base64,
+# 分析本地视频（SDK自动上传文件，无需base64编码）
+result = await client.analyze_video_visual_file(
+    video_path="video.mp4",
     prompt="请分析视频内容"
 )
 """
@@ -120,9 +206,10 @@ result = await client.analyze_video_visual_base64(
         console.print(Panel(code_example, title="Python代码", border_style="yellow"))
 
     except Exception as e:
+        logger.exception("demo_dashscope_sdk_failed", video_path=video_path)
         console.print(f"\n❌ 分析失败: {e}", style="bold red")
-        import traceback
-        console.print(traceback.format_exc(), style="red")
+        if VERBOSE:
+            console.print_exception()
 
 
 # ============================================================================
@@ -146,13 +233,10 @@ async def demo_agno_tool():
     from agno.agent import Agent
     from agno.models.google import Gemini
     from agno.tools import tool
-    import structlog
-
-    logger = structlog.get_logger(__name__)
 
     # 定义Agno Tool
     @tool
-    def analyze_video_dashscope(
+    async def analyze_video_dashscope(
         video_path: str,
         prompt: str = "请详细分析这个视频的内容"
     ) -> str:
@@ -166,27 +250,33 @@ async def demo_agno_tool():
         Returns:
             视频分析结果
         """
-        from app.utils.ai_clients.dashscope_client import DashScopeClient
+        from app.utils.b64_cache import get_or_encode
 
         try:
             path = Path(video_path)
-            if not path.exists():
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
                 return f"错误：视频文件不存在 - {video_path}"
 
-            # 读取视频
-            with open(path, "rb") as f:
-                video_base64 = base64.b64encode(f.read()).decode("utf-8")
-
-            # 调用DashScope
-            client = DashScopeClient()
-            result = asyncio.run(
-                client.analyze_video_visual_base64(
-                    video_base64=video_base64,
+            # 大文件交给SDK按本地路径上传，不在内存中构造base64字符串
+            if size > INLINE_BASE64_MAX_BYTES:
+                console.print(f"📤 {path.name} ({size / (1 << 20):.1f} MB) 走本地文件上传", style="dim")
+                return await get_client().analyze_video_visual_file(
+                    video_path=str(path),
                     prompt=prompt
                 )
-            )
 
-            return result
+            console.print(f"📦 {path.name} ({size / (1 << 20):.1f} MB) 走base64内联", style="dim")
+
+            # 读取视频（分块编码放到线程中执行，不阻塞事件循环；同一文件只编码一次）
+            video_base64 = await asyncio.to_thread(get_or_encode, str(path))
+
+            # 调用DashScope（工具运行在Agent的事件循环中，直接await）
+            return await get_client().analyze_video_visual_base64(
+                video_base64=video_base64,
+                prompt=prompt
+            )
 
         except Exception as e:
             return f"视频分析失败: {str(e)}"
@@ -199,16 +289,20 @@ async def demo_agno_tool():
         console.print("💡 提示：设置GEMINI_API_KEY以使用Gemini作为Agent的大脑", style="yellow")
         return
 
-    agent = Agent(
-        name="VideoAnalyzer",
-        model=Gemini(id="gemini-2.0-flash-exp"),
-        tools=[analyze_video_dashscope],
-        instructions=[
-            "你是专业的视频分析专家",
-            "当用户提供视频路径时，使用analyze_video_dashscope工具分析",
-            "分析结果要详细、结构化"
-        ],
-        markdown=False
+    agent = _get_agent(
+        "gemini-2.0-flash-exp",
+        [analyze_video_dashscope],
+        lambda model_id, tools: Agent(
+            name="VideoAnalyzer",
+            model=Gemini(id=model_id),
+            tools=tools,
+            instructions=[
+                "你是专业的视频分析专家",
+                "当用户提供视频路径时，使用analyze_video_dashscope工具分析",
+                "分析结果要详细、结构化"
+            ],
+            markdown=False
+        )
     )
 
     console.print("✅ Agent创建成功", style="green")
@@ -216,23 +310,17 @@ async def demo_agno_tool():
     # 示例视频路径
     video_path = "/Users/niko/auto-clip/tmp/7514135682735639860.mp4"
 
-    if not Path(video_path).exists():
+    video_file = Path(video_path)
+    if not video_file.exists():
         console.print(f"❌ 视频文件不存在: {video_path}", style="bold red")
         return
 
     # 运行Agent
-    console.print(f"\n🎬 开始分析视频: {Path(video_path).name}", style="blue")
-
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console
-    ) as progress:
-        task = progress.add_task("🤖 Agent工作中（调用DashScope Tool）...", total=None)
+    console.print(f"\n🎬 开始分析视频: {video_file.name}", style="blue")
 
-        response = agent.run(f"请分析这个视频的内容：{video_path}")
-
-        progress.update(task, completed=True)
+    with _spinner("🤖 Agent工作中（调用DashScope Tool）..."):
+        # 异步工具需要通过 arun 调用
+        response = await agent.arun(f"请分析这个视频的内容：{video_path}")
 
     # 显示结果
     console.print("\n📊 Agent分析结果:", style="bold green")
@@ -251,10 +339,10 @@ from agno.tools import tool
 from app.utils.ai_clients.dashscope_client import DashScopeClient
 
 @tool
-def analyze_video_dashscope(video_path: str, prompt: str) -> str:
+async def analyze_video_dashscope(video_path: str, prompt: str) -> str:
     \"\"\"使用DashScope分析视频\"\"\"
     client = DashScopeClient()
-    # ... base64编码 + API调用
+    # ... base64编码（asyncio.to_thread） + await API调用
     return result
 
 agent = Agent(
@@ -264,7 +352,7 @@ agent = Agent(
     instructions=["你是视频分析专家"]
 )
 
-response = agent.run("分析这个视频：/path/to/video.mp4")
+response = await agent.arun("分析这个视频：/path/to/video.mp4")
 """
     console.print("\n💻 代码示例:", style="bold yellow")
     console.print(Panel(code_example, title="Python代码", border_style="yellow"))
@@ -317,6 +405,8 @@ result = await tool.analyze_video(
 
 async def main():
     """主函数"""
+    from rich.table import Table
+
     console.print("""
 ╔══════════════════════════════════════════════════════════════╗
 ║                                                              ║
@@ -362,8 +452,9 @@ async def main():
     console.print("  3️⃣  方案3：LiteLLM中间层（实验性）", style="yellow")
     console.print("  0️⃣  运行所有方案", style="green")
 
+    choice = None
     try:
-        choice = input("\n请输入选择 (0-3): ").strip()
+        choice = (await asyncio.to_thread(input, "\n请输入选择 (0-3): ")).strip()
 
         if choice == "1":
             await demo_dashscope_sdk()
@@ -372,9 +463,18 @@ async def main():
         elif choice == "3":
             await demo_litellm()
         elif choice == "0":
-            await demo_dashscope_sdk()
-            await demo_agno_tool()
-            await demo_litellm()
+            # 各方案互不依赖，并发运行（限制同时调用的数量，避免触发API限流）
+            sem = asyncio.Semaphore(ALL_DEMOS_CONCURRENCY)
+
+            async def _run(demo):
+                async with sem:
+                    return await demo()
+
+            demos = (demo_dashscope_sdk, demo_agno_tool, demo_litellm)
+            results = await asyncio.gather(*(_run(d) for d in demos), return_exceptions=True)
+            for demo, result in zip(demos, results):
+                if isinstance(result, BaseException):
+                    console.print(f"❌ {demo.__name__} 出错: {result}", style="bold red")
         else:
             console.print("❌ 无效选择", style="bold red")
             return
@@ -423,10 +523,18 @@ async def main():
     except KeyboardInterrupt:
         console.print("\n\n👋 演示中断", style="yellow")
     except Exception as e:
-        console.print(f"\n❌ 演示出错: {e}", style="bold red")
-        import traceback
-        console.print(traceback.format_exc(), style="red")
+        logger.exception("demo_failed", choice=choice)
+        console.print(f"\n❌ 演示出错: {e}（详情见 {DEMO_LOG_FILE}）", style="bold red")
+        if VERBOSE:
+            console.print_exception()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 安装了 uvloop 时使用其事件循环（可选依赖）
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+
+    run(main())
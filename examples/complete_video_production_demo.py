@@ -20,11 +20,148 @@
 """
 
 import asyncio
+import hashlib
 import httpx
 import json
+import logging
+import os
+import random
+import sys
 import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Tuple
+
+# orjson 为可选依赖：安装时用于请求/响应的JSON编解码，否则退回标准库
+try:
+    import orjson
+
+    def json_dumps(obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj: Any, indent: bool = False) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+    json_loads = json.loads
+
+# 演示异常堆栈写入日志文件，控制台只显示简短错误（设置 AUTOCLIP_VERBOSE=1 时同时输出到控制台）
+DEMO_LOG_FILE = "complete_video_production_demo.log"
+
+logger = logging.getLogger(__name__)
+
+# 任务终态
+TERMINAL_STATUSES = ("completed", "failed")
+
+# 服务端不支持事件推送时的轮询退避参数（秒）
+POLL_BACKOFF_BASE = 1.0
+POLL_BACKOFF_CAP = 30.0
+POLL_BACKOFF_JITTER = 0.5
+
+# 各阶段的初始轮询间隔（秒）：准备/压缩很快结束，AI分析和成片合成通常需要数分钟
+STAGE_POLL_INTERVALS = {
+    "preparing": 1.0,
+    "compressing": 2.0,
+    "analyzing": 15.0,
+    "planning": 3.0,
+    "clipping": 5.0,
+    "producing": 15.0
+}
+
+# 进度刷新节流：进度变化（百分点）或时间间隔（秒）
+PROGRESS_MIN_DELTA = 1.0
+PROGRESS_MIN_INTERVAL = 0.25
+
+# 单次请求超时：超时后立即重试，避免个别卡住的请求拖慢整体
+SUBMIT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+STATUS_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+# 事件流：读超时即两次事件之间的最长间隔，超过则视为连接已失效
+STREAM_TIMEOUT = httpx.Timeout(10.0, connect=5.0, read=60.0)
+
+# 网络错误/5xx 重试参数
+REQUEST_MAX_ATTEMPTS = 5
+REQUEST_BACKOFF_INITIAL = 0.25
+REQUEST_BACKOFF_MAX = 8.0
+
+# 只有幂等请求可以重试：POST 超时时请求可能已到达服务端，重发会重复创建任务
+RETRYABLE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+class TaskFailedError(Exception):
+    """生产任务以失败状态结束"""
+
+    def __init__(self, task_id: str, status: Dict[str, Any]):
+        self.task_id = task_id
+        self.status = status
+        super().__init__(f"任务 {task_id} 失败: {status.get('error', '未知错误')}")
+
+
+# 视频指纹读取的头/尾字节数
+FINGERPRINT_SAMPLE_BYTES = 1024 * 1024
+
+# 本次运行中已完成的任务：(视频指纹, 配置哈希) -> (任务ID, 结果)，相同输入重复运行时直接复用
+_completed: Dict[Tuple[Tuple[str, ...], str], Tuple[str, Dict[str, Any]]] = {}
+_dedup_keys: Dict[str, Tuple[Tuple[str, ...], str]] = {}
+
+
+def _fingerprint(path: str) -> str:
+    """
+    计算视频的快速指纹：文件大小 + 头尾各1MB内容的哈希
+
+    文件在本机不可读（例如只存在于服务端）时退化为按路径计算
+    """
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        size = os.stat(path).st_size
+        h.update(str(size).encode())
+        with open(path, "rb") as f:
+            h.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+            if size > FINGERPRINT_SAMPLE_BYTES:
+                f.seek(max(FINGERPRINT_SAMPLE_BYTES, size - FINGERPRINT_SAMPLE_BYTES))
+                h.update(f.read())
+    except OSError:
+        h.update(os.path.abspath(path).encode())
+    return h.hexdigest()
+
+
+def _config_hash(config: Dict[str, Any]) -> str:
+    """配置的稳定哈希（键排序后序列化）"""
+    canonical = json.dumps(config, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# 所有演示共用的HTTP客户端（首次使用时创建）
+_client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    获取共用的HTTP客户端
+
+    多个演示、多次状态查询复用同一连接池；安装了 h2 时启用 HTTP/2，
+    状态查询可在同一条连接上多路复用
+    """
+    global _client
+    if _client is None:
+        try:
+            import h2  # noqa: F401
+            http2 = True
+        except ImportError:
+            http2 = False
+
+        _client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(600.0, connect=10.0)
+        )
+    return _client
+
+
+async def close_client():
+    """关闭共用的HTTP客户端"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 class CompleteVideoProductionDemo:
@@ -32,7 +169,49 @@ class CompleteVideoProductionDemo:
 
     def __init__(self, api_base: str = "http://localhost:8000"):
         self.api_base = api_base
-        self.client = httpx.AsyncClient(timeout=600.0)
+        self.client = get_client()
+
+    async def _request_json(
+        self,
+        method: str,
+        url: str,
+        timeout: httpx.Timeout,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        发送请求并解析JSON响应，幂等请求（GET等）遇到网络错误、超时和5xx时按指数退避 + 抖动重试
+
+        4xx 属于请求本身的问题，直接抛出不重试；POST 等非幂等请求只发送一次
+
+        Args:
+            method: HTTP方法
+            url: 请求地址
+            timeout: 单次请求超时
+            **kwargs: 透传给 httpx 的参数
+
+        Returns:
+            响应JSON
+
+        Raises:
+            httpx.HTTPStatusError: 4xx，或重试耗尽后（非幂等请求为首次）的 5xx
+            httpx.TransportError: 重试耗尽后（非幂等请求为首次）的网络错误/超时
+        """
+        max_attempts = REQUEST_MAX_ATTEMPTS if method.upper() in RETRYABLE_METHODS else 1
+
+        for attempt in range(max_attempts):
+            try:
+                response = await self.client.request(method, url, timeout=timeout, **kwargs)
+                response.raise_for_status()
+                return json_loads(response.content)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code < 500 or attempt == max_attempts - 1:
+                    raise
+            except httpx.TransportError:
+                if attempt == max_attempts - 1:
+                    raise
+
+            delay = min(REQUEST_BACKOFF_MAX, REQUEST_BACKOFF_INITIAL * 2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, delay))
 
     async def start_production(
         self,
@@ -58,20 +237,36 @@ class CompleteVideoProductionDemo:
         """
         url = f"{self.api_base}/api/v1/batch/process"
 
+        fingerprints = tuple(
+            await asyncio.gather(*(asyncio.to_thread(_fingerprint, p) for p in video_paths))
+        )
+        config_hash = _config_hash(config)
+        dedup_key = (fingerprints, config_hash)
+
+        if dedup_key in _completed:
+            task_id, _ = _completed[dedup_key]
+            print(f"♻️  相同视频和配置已处理过，复用任务: {task_id}")
+            return task_id
+
+        # 指纹随请求提交，服务端可据此识别重复任务
         payload = {
             "video_paths": video_paths,
-            "config": config
+            "config": config,
+            "fingerprints": list(fingerprints),
+            "config_hash": config_hash
         }
 
         print("📤 发起完整视频生产请求...")
         print(f"   视频数量: {len(video_paths)}")
-        print(f"   配置: {json.dumps(config, ensure_ascii=False, indent=2)}")
+        print(f"   配置: {json_dumps(config, indent=True).decode('utf-8')}")
 
-        response = await self.client.post(url, json=payload)
-        response.raise_for_status()
-
-        result = response.json()
+        result = await self._request_json(
+            "POST", url, SUBMIT_TIMEOUT,
+            content=json_dumps(payload),
+            headers={"Content-Type": "application/json"}
+        )
         task_id = result.get("task_id")
+        _dedup_keys[task_id] = dedup_key
 
         print(f"✅ 任务已创建: {task_id}")
         return task_id
@@ -79,25 +274,95 @@ class CompleteVideoProductionDemo:
     async def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """获取任务状态"""
         url = f"{self.api_base}/api/v1/tasks/{task_id}/status"
-        response = await self.client.get(url)
-        response.raise_for_status()
-        return response.json()
+        return await self._request_json("GET", url, STATUS_TIMEOUT)
+
+    async def cancel_task(self, task_id: str):
+        """通知服务端取消任务（尽力而为，失败只打印提示）"""
+        url = f"{self.api_base}/api/v1/tasks/{task_id}"
+        try:
+            response = await self.client.delete(url, timeout=STATUS_TIMEOUT)
+            response.raise_for_status()
+            print(f"\n🛑 已取消任务: {task_id}")
+        except httpx.HTTPError as e:
+            print(f"\n⚠️  取消任务失败 {task_id}: {e}")
+
+    async def _poll_status(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        轮询任务状态（按阶段确定初始间隔，指数退避 + 随机抖动）
 
-    async def wait_for_completion(
-        self,
-        task_id: str,
-        check_interval: int = 10
-    ) -> Dict[str, Any]:
+        状态有变化时重置退避，长时间无变化时逐步拉长间隔，上限 POLL_BACKOFF_CAP
+        """
+        attempt = 0
+        last_status = None
+        while True:
+            status = await self.get_task_status(task_id)
+            yield status
+
+            if status != last_status:
+                attempt = 0
+                last_status = status
+
+            base = STAGE_POLL_INTERVALS.get(status.get("stage"), POLL_BACKOFF_BASE)
+            delay = min(POLL_BACKOFF_CAP, base * 2 ** attempt)
+            await asyncio.sleep(delay + random.uniform(0, POLL_BACKOFF_JITTER))
+            attempt += 1
+
+    async def stream_status(self, task_id: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        订阅任务状态更新
+
+        优先使用服务端推送（SSE: /api/v1/tasks/{task_id}/events），
+        服务端不支持（404/405/415）、事件流结束或连接异常（断开、读超时）时
+        退回到指数退避轮询
+
+        Args:
+            task_id: 任务ID
+
+        Yields:
+            任务状态字典
+        """
+        url = f"{self.api_base}/api/v1/tasks/{task_id}/events"
+        headers = {"Accept": "text/event-stream"}
+
+        try:
+            async with self.client.stream(
+                "GET", url, headers=headers, timeout=STREAM_TIMEOUT
+            ) as response:
+                if response.status_code not in (404, 405, 415):
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        # SSE帧格式: "data: {json}"，其余行（注释、event、空行）忽略
+                        if not line.startswith("data:"):
+                            continue
+                        status = json_loads(line[5:].strip())
+                        yield status
+                        if status.get("status") in TERMINAL_STATUSES:
+                            return
+                    # 推送连接在任务结束前断开，继续轮询至终态
+                    print("   ℹ️  事件流已断开，改为轮询")
+                else:
+                    print("   ℹ️  服务端不支持事件推送，改为轮询")
+        except httpx.TransportError as e:
+            print(f"   ℹ️  事件流连接异常（{type(e).__name__}），改为轮询")
+
+        async for status in self._poll_status(task_id):
+            yield status
+
+    async def wait_for_completion(self, task_id: str) -> Dict[str, Any]:
         """
         等待任务完成并显示进度
 
         Args:
             task_id: 任务ID
-            check_interval: 检查间隔（秒）
 
         Returns:
             最终结果
         """
+        for cached_task_id, cached_result in _completed.values():
+            if cached_task_id == task_id:
+                print(f"\n✅ 任务 {task_id} 已完成（复用结果）")
+                return cached_result
+
         print(f"\n⏳ 等待任务完成 (任务ID: {task_id})...")
 
         stage_emojis = {
@@ -112,36 +377,51 @@ class CompleteVideoProductionDemo:
         }
 
         last_stage = None
+        last_printed_progress = None
+        last_print_ts = 0.0
         start_time = time.time()
-
-        while True:
-            status = await self.get_task_status(task_id)
-            current_stage = status.get("stage", "unknown")
-            progress = status.get("progress", 0)
-
-            # 显示阶段变化
-            if current_stage != last_stage:
-                emoji = stage_emojis.get(current_stage, "🔄")
-                elapsed = time.time() - start_time
-                print(f"\n{emoji} 阶段: {current_stage.upper()} (已用时: {elapsed:.1f}s)")
-                last_stage = current_stage
-
-            # 显示进度
-            print(f"   进度: {progress:.1f}%", end="\r")
-
-            # 检查是否完成
-            if status.get("status") == "completed":
-                elapsed = time.time() - start_time
-                print(f"\n✅ 任务完成! 总耗时: {elapsed:.1f}s")
-                return status
-
-            # 检查是否失败
-            if status.get("status") == "failed":
-                error = status.get("error", "未知错误")
-                print(f"\n❌ 任务失败: {error}")
-                return status
-
-            await asyncio.sleep(check_interval)
+        status: Dict[str, Any] = {}
+
+        try:
+            async for status in self.stream_status(task_id):
+                current_stage = status.get("stage", "unknown")
+                progress = status.get("progress", 0)
+
+                # 显示阶段变化
+                if current_stage != last_stage:
+                    emoji = stage_emojis.get(current_stage, "🔄")
+                    elapsed = time.time() - start_time
+                    print(f"\n{emoji} 阶段: {current_stage.upper()} (已用时: {elapsed:.1f}s)")
+                    last_stage = current_stage
+
+                # 显示进度（节流：进度变化≥1%或距上次刷新≥250ms才重绘）
+                now = time.monotonic()
+                if progress != last_printed_progress and (
+                    last_printed_progress is None
+                    or abs(progress - last_printed_progress) >= PROGRESS_MIN_DELTA
+                    or now - last_print_ts >= PROGRESS_MIN_INTERVAL
+                ):
+                    sys.stdout.write(f"   进度: {progress:.1f}%\r")
+                    sys.stdout.flush()
+                    last_printed_progress = progress
+                    last_print_ts = now
+
+                if status.get("status") in TERMINAL_STATUSES:
+                    break
+        except asyncio.CancelledError:
+            # 本地等待被取消（例如并发的另一任务失败）时，服务端任务也一并取消
+            await self.cancel_task(task_id)
+            raise
+
+        elapsed = time.time() - start_time
+        if status.get("status") == "completed":
+            print(f"\n✅ 任务完成! 总耗时: {elapsed:.1f}s")
+            if task_id in _dedup_keys:
+                _completed[_dedup_keys.pop(task_id)] = (task_id, status)
+        else:
+            error = status.get("error", "未知错误")
+            print(f"\n❌ 任务失败: {error}")
+        return status
 
     def display_results(self, result: Dict[str, Any]):
         """
@@ -197,10 +477,6 @@ class CompleteVideoProductionDemo:
 
         print("\n" + "="*60)
 
-    async def close(self):
-        """关闭客户端"""
-        await self.client.aclose()
-
 
 async def demo_basic_narration():
     """
@@ -213,31 +489,27 @@ async def demo_basic_narration():
 
     demo = CompleteVideoProductionDemo()
 
-    try:
-        # 配置
-        video_paths = [
-            "/path/to/your/video1.mp4",
-            "/path/to/your/video2.mp4"
-        ]
-
-        config = {
-            "add_narration": True,  # 启用完整流程的关键配置
-            "narration_voice": "longxiaochun",  # 龙小春语音
-            "target_duration": 60,
-            "min_clip_duration": 2.0
-        }
-
-        # 启动
-        task_id = await demo.start_production(video_paths, config)
+    # 配置
+    video_paths = [
+        "/path/to/your/video1.mp4",
+        "/path/to/your/video2.mp4"
+    ]
+
+    config = {
+        "add_narration": True,  # 启用完整流程的关键配置
+        "narration_voice": "longxiaochun",  # 龙小春语音
+        "target_duration": 60,
+        "min_clip_duration": 2.0
+    }
 
-        # 等待完成
-        result = await demo.wait_for_completion(task_id)
+    # 启动
+    task_id = await demo.start_production(video_paths, config)
 
-        # 显示结果
-        demo.display_results(result)
+    # 等待完成
+    result = await demo.wait_for_completion(task_id)
 
-    finally:
-        await demo.close()
+    # 显示结果
+    demo.display_results(result)
 
 
 async def demo_with_background_music():
@@ -251,28 +523,24 @@ async def demo_with_background_music():
 
     demo = CompleteVideoProductionDemo()
 
-    try:
-        video_paths = [
-            "/path/to/your/video1.mp4",
-            "/path/to/your/video2.mp4"
-        ]
-
-        config = {
-            "add_narration": True,
-            "narration_voice": "longxiaochun",
-            "background_music_path": "/path/to/background_music.mp3",
-            "background_music_volume": 0.2,  # 背景音乐音量20%
-            "target_duration": 90,
-            "min_clip_duration": 3.0,
-            "transition_type": "crossfade"  # 交叉淡化转场
-        }
-
-        task_id = await demo.start_production(video_paths, config)
-        result = await demo.wait_for_completion(task_id)
-        demo.display_results(result)
+    video_paths = [
+        "/path/to/your/video1.mp4",
+        "/path/to/your/video2.mp4"
+    ]
+
+    config = {
+        "add_narration": True,
+        "narration_voice": "longxiaochun",
+        "background_music_path": "/path/to/background_music.mp3",
+        "background_music_volume": 0.2,  # 背景音乐音量20%
+        "target_duration": 90,
+        "min_clip_duration": 3.0,
+        "transition_type": "crossfade"  # 交叉淡化转场
+    }
 
-    finally:
-        await demo.close()
+    task_id = await demo.start_production(video_paths, config)
+    result = await demo.wait_for_completion(task_id)
+    demo.display_results(result)
 
 
 async def demo_educational_video():
@@ -286,30 +554,26 @@ async def demo_educational_video():
 
     demo = CompleteVideoProductionDemo()
 
-    try:
-        video_paths = [
-            "/path/to/lesson/intro.mp4",
-            "/path/to/lesson/content1.mp4",
-            "/path/to/lesson/content2.mp4",
-            "/path/to/lesson/summary.mp4"
-        ]
-
-        config = {
-            "add_narration": True,
-            "narration_voice": "zhimi",  # 知米语音（更正式）
-            "target_duration": 300,  # 5分钟教学视频
-            "min_clip_duration": 5.0,
-            "transition_type": "fade",
-            "background_music_path": "/path/to/calm_music.mp3",
-            "background_music_volume": 0.15
-        }
-
-        task_id = await demo.start_production(video_paths, config)
-        result = await demo.wait_for_completion(task_id)
-        demo.display_results(result)
+    video_paths = [
+        "/path/to/lesson/intro.mp4",
+        "/path/to/lesson/content1.mp4",
+        "/path/to/lesson/content2.mp4",
+        "/path/to/lesson/summary.mp4"
+    ]
+
+    config = {
+        "add_narration": True,
+        "narration_voice": "zhimi",  # 知米语音（更正式）
+        "target_duration": 300,  # 5分钟教学视频
+        "min_clip_duration": 5.0,
+        "transition_type": "fade",
+        "background_music_path": "/path/to/calm_music.mp3",
+        "background_music_volume": 0.15
+    }
 
-    finally:
-        await demo.close()
+    task_id = await demo.start_production(video_paths, config)
+    result = await demo.wait_for_completion(task_id)
+    demo.display_results(result)
 
 
 async def demo_vlog_production():
@@ -323,31 +587,27 @@ async def demo_vlog_production():
 
     demo = CompleteVideoProductionDemo()
 
-    try:
-        video_paths = [
-            "/path/to/vlog/morning.mp4",
-            "/path/to/vlog/sightseeing.mp4",
-            "/path/to/vlog/food.mp4",
-            "/path/to/vlog/sunset.mp4",
-            "/path/to/vlog/night.mp4"
-        ]
-
-        config = {
-            "add_narration": True,
-            "narration_voice": "longxiaochun",  # 亲切的语音
-            "target_duration": 180,  # 3分钟Vlog
-            "min_clip_duration": 4.0,
-            "transition_type": "crossfade",
-            "background_music_path": "/path/to/upbeat_music.mp3",
-            "background_music_volume": 0.25
-        }
-
-        task_id = await demo.start_production(video_paths, config)
-        result = await demo.wait_for_completion(task_id)
-        demo.display_results(result)
+    video_paths = [
+        "/path/to/vlog/morning.mp4",
+        "/path/to/vlog/sightseeing.mp4",
+        "/path/to/vlog/food.mp4",
+        "/path/to/vlog/sunset.mp4",
+        "/path/to/vlog/night.mp4"
+    ]
+
+    config = {
+        "add_narration": True,
+        "narration_voice": "longxiaochun",  # 亲切的语音
+        "target_duration": 180,  # 3分钟Vlog
+        "min_clip_duration": 4.0,
+        "transition_type": "crossfade",
+        "background_music_path": "/path/to/upbeat_music.mp3",
+        "background_music_volume": 0.25
+    }
 
-    finally:
-        await demo.close()
+    task_id = await demo.start_production(video_paths, config)
+    result = await demo.wait_for_completion(task_id)
+    demo.display_results(result)
 
 
 async def demo_comparison_workflows():
@@ -361,59 +621,72 @@ async def demo_comparison_workflows():
 
     demo = CompleteVideoProductionDemo()
 
-    try:
-        video_paths = [
-            "/path/to/video1.mp4",
-            "/path/to/video2.mp4"
-        ]
-
-        # 基础流程（不添加口播）
-        print("\n📌 方式A: 基础剪辑流程")
-        print("   仅视频分析 + 剪辑 + 拼接")
-        config_basic = {
-            "add_narration": False,  # 不启用口播
-            "target_duration": 60,
-            "transition_type": "fade"
-        }
-
-        task_id_basic = await demo.start_production(video_paths, config_basic)
-        result_basic = await demo.wait_for_completion(task_id_basic)
-
-        print("\n✅ 基础流程完成:")
-        print(f"   输出: 拼接视频")
-        print(f"   耗时: {result_basic.get('statistics', {}).get('processing_time', 0):.1f}秒")
-
-        # 完整流程（添加口播）
-        print("\n📌 方式B: 完整生产流程")
-        print("   视频分析 + 剪辑 + 脚本生成 + TTS + 音视频合成")
-        config_full = {
-            "add_narration": True,  # 启用完整流程
-            "narration_voice": "longxiaochun",
-            "target_duration": 60,
-            "transition_type": "fade",
-            "background_music_path": "/path/to/music.mp3",
-            "background_music_volume": 0.2
-        }
-
-        task_id_full = await demo.start_production(video_paths, config_full)
-        result_full = await demo.wait_for_completion(task_id_full)
-
-        print("\n✅ 完整流程完成:")
-        print(f"   输出: 带口播的完整视频")
-        print(f"   耗时: {result_full.get('statistics', {}).get('processing_time', 0):.1f}秒")
-        print(f"   质量评分: {result_full.get('quality_scores', {}).get('overall_score', 0):.2f}")
+    video_paths = [
+        "/path/to/video1.mp4",
+        "/path/to/video2.mp4"
+    ]
+
+    # 基础流程（不添加口播）
+    print("\n📌 方式A: 基础剪辑流程")
+    print("   仅视频分析 + 剪辑 + 拼接")
+    config_basic = {
+        "add_narration": False,  # 不启用口播
+        "target_duration": 60,
+        "transition_type": "fade"
+    }
 
-        # 对比总结
-        print("\n" + "="*60)
-        print("📊 流程对比总结:")
-        print("="*60)
-        print(f"基础流程耗时: {result_basic.get('statistics', {}).get('processing_time', 0):.1f}秒")
-        print(f"完整流程耗时: {result_full.get('statistics', {}).get('processing_time', 0):.1f}秒")
-        print(f"\n完整流程额外时间: 用于脚本生成、TTS合成、音视频混合")
-        print(f"完整流程产出: 更丰富的内容、更好的用户体验、更高的质量")
+    # 完整流程（添加口播）
+    print("\n📌 方式B: 完整生产流程")
+    print("   视频分析 + 剪辑 + 脚本生成 + TTS + 音视频合成")
+    config_full = {
+        "add_narration": True,  # 启用完整流程
+        "narration_voice": "longxiaochun",
+        "target_duration": 60,
+        "transition_type": "fade",
+        "background_music_path": "/path/to/music.mp3",
+        "background_music_volume": 0.2
+    }
 
-    finally:
-        await demo.close()
+    async def produce(config: Dict[str, Any]) -> Dict[str, Any]:
+        task_id = await demo.start_production(video_paths, config)
+        result = await demo.wait_for_completion(task_id)
+        if result.get("status") == "failed":
+            raise TaskFailedError(task_id, result)
+        return result
+
+    # 两个任务互不依赖：同时提交、同时等待，总耗时取决于较慢的一个；
+    # 任一任务失败时取消另一个，避免继续消耗分析/合成资源
+    tasks = [
+        asyncio.create_task(produce(config_basic)),
+        asyncio.create_task(produce(config_full))
+    ]
+    try:
+        result_basic, result_full = await asyncio.gather(*tasks)
+    except TaskFailedError as e:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        print(f"\n❌ {e}")
+        print("   已取消其余对比任务")
+        return
+
+    print("\n✅ 基础流程完成:")
+    print(f"   输出: 拼接视频")
+    print(f"   耗时: {result_basic.get('statistics', {}).get('processing_time', 0):.1f}秒")
+
+    print("\n✅ 完整流程完成:")
+    print(f"   输出: 带口播的完整视频")
+    print(f"   耗时: {result_full.get('statistics', {}).get('processing_time', 0):.1f}秒")
+    print(f"   质量评分: {result_full.get('quality_scores', {}).get('overall_score', 0):.2f}")
+
+    # 对比总结
+    print("\n" + "="*60)
+    print("📊 流程对比总结:")
+    print("="*60)
+    print(f"基础流程耗时: {result_basic.get('statistics', {}).get('processing_time', 0):.1f}秒")
+    print(f"完整流程耗时: {result_full.get('statistics', {}).get('processing_time', 0):.1f}秒")
+    print(f"\n完整流程额外时间: 用于脚本生成、TTS合成、音视频混合")
+    print(f"完整流程产出: 更丰富的内容、更好的用户体验、更高的质量")
 
 
 def print_menu():
@@ -432,8 +705,21 @@ def print_menu():
     print("      并且已配置好 DASHSCOPE_API_KEY")
 
 
+def setup_demo_logging():
+    """配置演示日志：写入文件，详细模式下同时输出到控制台"""
+    handlers: List[logging.Handler] = [logging.FileHandler(DEMO_LOG_FILE, encoding="utf-8")]
+    if "-v" in sys.argv or os.getenv("AUTOCLIP_VERBOSE") == "1":
+        handlers.append(logging.StreamHandler())
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        handlers=handlers
+    )
+
+
 async def main():
     """主函数"""
+    setup_demo_logging()
     demos = {
         "1": demo_basic_narration,
         "2": demo_with_background_music,
@@ -442,26 +728,35 @@ async def main():
         "5": demo_comparison_workflows
     }
 
-    while True:
-        print_menu()
-        choice = input("\n请选择 (0-5): ").strip()
-
-        if choice == "0":
-            print("\n👋 再见!")
-            break
-
-        if choice in demos:
-            try:
-                await demos[choice]()
-            except Exception as e:
-                print(f"\n❌ 演示出错: {e}")
-                import traceback
-                traceback.print_exc()
-
-            input("\n按回车继续...")
-        else:
-            print("\n❌ 无效选择，请重试")
+    try:
+        while True:
+            print_menu()
+            choice = (await asyncio.to_thread(input, "\n请选择 (0-5): ")).strip()
+
+            if choice == "0":
+                print("\n👋 再见!")
+                break
+
+            if choice in demos:
+                try:
+                    await demos[choice]()
+                except Exception as e:
+                    logger.exception("演示出错: choice=%s", choice)
+                    print(f"\n❌ 演示出错: {e}（详情见 {DEMO_LOG_FILE}）")
+
+                await asyncio.to_thread(input, "\n按回车继续...")
+            else:
+                print("\n❌ 无效选择，请重试")
+    finally:
+        await close_client()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # 安装了 uvloop 时使用其事件循环（可选依赖）
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+
+    run(main())
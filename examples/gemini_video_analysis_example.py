@@ -9,19 +9,113 @@ Gemini视频分析使用示例
 """
 
 import asyncio
+import os
 import sys
+import time
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
 
 # 添加项目根目录到路径
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from app.adapters.gemini_vision_adapter import GeminiVisionAdapter
+from app.core.exceptions import LLMServiceError
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 
 console = Console()
 
+# 批量处理时同时分析的视频数
+BATCH_CONCURRENCY = 8
+
+# Gemini 每分钟请求数上限（按账号配额调整）
+GEMINI_RPM = 60
+
+# 被限流（429）时的重试参数
+RATE_LIMIT_MAX_ATTEMPTS = 5
+RATE_LIMIT_BACKOFF_MAX = 30.0
+
+
+class TokenBucket:
+    """
+    异步令牌桶限流器
+
+    以 rate/period 的速度补充令牌，桶容量为 rate；每次请求消耗一个令牌，
+    令牌不足时等待，主动把请求速率控制在配额内，而不是等服务端返回429再重试
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = rate
+        self.fill_rate = rate / period
+        self.tokens = float(rate)
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.fill_rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+# 所有示例共用的 Gemini 限流器
+gemini_limiter = TokenBucket(GEMINI_RPM, 60.0)
+
+# 按 base_url 缓存的适配器（None 表示读取环境变量配置），首次使用时创建
+_adapters: Dict[Optional[str], GeminiVisionAdapter] = {}
+
+
+def get_adapter(base_url: Optional[str] = None) -> GeminiVisionAdapter:
+    """获取示例共用的适配器，同一 base_url 只创建一次，HTTP连接在示例之间复用"""
+    if base_url not in _adapters:
+        _adapters[base_url] = (
+            GeminiVisionAdapter(base_url=base_url) if base_url else GeminiVisionAdapter()
+        )
+    return _adapters[base_url]
+
+
+async def close_adapters():
+    """关闭所有已创建的适配器"""
+    while _adapters:
+        _, adapter = _adapters.popitem()
+        await adapter.aclose()
+
+
+async def analyze_with_limit(adapter, video_path: str, prompt: str) -> str:
+    """
+    限流 + 429 指数退避重试地调用 analyze_from_path
+
+    Args:
+        adapter: 视觉分析适配器
+        video_path: 视频路径
+        prompt: 提示词
+
+    Returns:
+        分析结果
+    """
+    for attempt in range(RATE_LIMIT_MAX_ATTEMPTS):
+        async with gemini_limiter:
+            try:
+                return await adapter.analyze_from_path(video_path=video_path, prompt=prompt)
+            except LLMServiceError as e:
+                if not e.recoverable or attempt == RATE_LIMIT_MAX_ATTEMPTS - 1:
+                    raise
+        await asyncio.sleep(min(RATE_LIMIT_BACKOFF_MAX, 2 ** attempt))
+
 
 async def example_1_basic_analysis():
     """示例1: 基础视频分析"""
@@ -29,9 +123,6 @@ async def example_1_basic_analysis():
     console.print("📝 示例1: 基础视频分析", style="bold cyan")
     console.print("="*70, style="cyan")
 
-    # 初始化适配器（自动读取环境变量配置）
-    adapter = GeminiVisionAdapter()
-
     # 分析单个视频
     video_path = "/path/to/your/video.mp4"  # 替换为实际路径
 
@@ -39,7 +130,7 @@ async def example_1_basic_analysis():
     console.print("🔄 分析中...\n", style="yellow")
 
     try:
-        result = await adapter.analyze_from_path(
+        result = await get_adapter().analyze_from_path(
             video_path=video_path,
             prompt="""
             请分析这个视频，提供以下信息：
@@ -74,42 +165,45 @@ async def example_2_batch_processing():
         "/path/to/video3.mp4",
     ]
 
-    adapter = GeminiVisionAdapter()
-
     console.print(f"📋 待处理: {len(video_paths)}个视频\n", style="dim")
 
-    # 使用Progress显示进度
+    # 所有视频并发分析（信号量限制同时进行的请求数），共用一个进度条，每完成一个前进一格
+    sem = asyncio.Semaphore(BATCH_CONCURRENCY)
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
         console=console
     ) as progress:
-
-        results = []
-
-        for i, video_path in enumerate(video_paths, 1):
-            task = progress.add_task(f"处理 {i}/{len(video_paths)}: {Path(video_path).name}", total=None)
-
-            try:
-                result = await adapter.analyze_from_path(
-                    video_path=video_path,
-                    prompt="请用一句话概括这个视频的主要内容"
-                )
-                results.append({"video": video_path, "result": result, "status": "success"})
-
-            except Exception as e:
-                results.append({"video": video_path, "error": str(e), "status": "failed"})
-
-            progress.remove_task(task)
+        task = progress.add_task("处理视频", total=len(video_paths))
+
+        async def analyze_one(video_path: str) -> dict:
+            # 文件名只计算一次，进度条和结果输出共用
+            name = Path(video_path).name
+            async with sem:
+                try:
+                    result = await analyze_with_limit(
+                        get_adapter(), video_path, "请用一句话概括这个视频的主要内容"
+                    )
+                    return {"video": video_path, "name": name, "result": result, "status": "success"}
+                except Exception as e:
+                    return {"video": video_path, "name": name, "error": str(e), "status": "failed"}
+                finally:
+                    # 协程在同一事件循环中执行，更新进度无需额外加锁
+                    progress.update(task, advance=1, description=f"完成 {name}")
+
+        results = await asyncio.gather(*(analyze_one(path) for path in video_paths))
 
     # 输出结果
     console.print("\n📊 处理结果:", style="bold")
     for i, item in enumerate(results, 1):
         if item["status"] == "success":
-            console.print(f"\n{i}. ✅ {Path(item['video']).name}", style="green")
+            console.print(f"\n{i}. ✅ {item['name']}", style="green")
             console.print(f"   {item['result'][:100]}...", style="dim green")
         else:
-            console.print(f"\n{i}. ❌ {Path(item['video']).name}", style="red")
+            console.print(f"\n{i}. ❌ {item['name']}", style="red")
             console.print(f"   错误: {item['error']}", style="dim red")
 
 
@@ -129,8 +223,8 @@ async def example_3_integration_with_service():
                 use_gemini: 是否使用Gemini（False则使用DashScope）
             """
             if use_gemini:
-                from app.adapters.gemini_vision_adapter import GeminiVisionAdapter
-                self.vision_adapter = GeminiVisionAdapter()
+                # 复用示例共享的适配器及其HTTP连接池
+                self.vision_adapter = get_adapter()
                 console.print("✅ 使用Gemini视觉分析服务", style="green")
             else:
                 from app.adapters.vision_adapters import DashScopeVisionAdapter
@@ -167,9 +261,8 @@ async def example_3_integration_with_service():
             """
 
             try:
-                analysis_result = await self.vision_adapter.analyze_from_path(
-                    video_path=video_path,
-                    prompt=analysis_prompt
+                analysis_result = await analyze_with_limit(
+                    self.vision_adapter, video_path, analysis_prompt
                 )
 
                 console.print("\n📝 分析结果:", style="bold")
@@ -223,7 +316,7 @@ async def example_3_integration_with_service():
 
 
 async def example_4_custom_base_url():
-    """示例4: 使用自定义Base URL（代理场景）"""
+    """示例4: 使用自定义Base URL（代理场景，按base_url单独缓存适配器）"""
     console.print("\n" + "="*70, style="bold cyan")
     console.print("📝 示例4: 使用自定义Base URL", style="bold cyan")
     console.print("="*70, style="cyan")
@@ -235,15 +328,15 @@ async def example_4_custom_base_url():
     console.print("📝 适用场景: 企业内网、地区限制、流量监控\n", style="dim")
 
     try:
-        # 使用自定义base_url初始化适配器
-        adapter = GeminiVisionAdapter(base_url=custom_base_url)
+        # 使用自定义base_url获取适配器
+        proxy_adapter = get_adapter(custom_base_url)
 
         console.print("✅ 适配器初始化成功（使用自定义Base URL）", style="green")
 
         # 后续使用方式与标准配置完全相同
         video_path = "/path/to/your/video.mp4"
 
-        result = await adapter.analyze_from_path(
+        result = await proxy_adapter.analyze_from_path(
             video_path=video_path,
             prompt="简要描述视频内容"
         )
@@ -272,24 +365,39 @@ async def main():
     console.print("  2. 修改示例中的视频路径为实际文件", style="dim")
     console.print("  3. （可选）配置 GEMINI_BASE_URL 使用代理\n", style="dim")
 
-    # 运行示例
-    examples = [
+    # 相互独立的示例并发运行
+    concurrent_examples = [
         ("基础视频分析", example_1_basic_analysis),
-        ("批量视频处理", example_2_batch_processing),
         ("与现有服务集成", example_3_integration_with_service),
         ("使用自定义Base URL", example_4_custom_base_url),
     ]
 
-    for name, example_func in examples:
+    async def run_example(name: str, example_func) -> None:
         console.print(f"\n▶️  运行示例: {name}", style="bold blue")
         try:
             await example_func()
-        except KeyboardInterrupt:
-            console.print(f"\n⚠️  示例被中断: {name}", style="yellow")
-            break
         except Exception as e:
             console.print(f"\n❌ 示例失败: {name}", style="red")
             console.print(f"   错误: {e}", style="dim red")
+            raise
+
+    tasks = [
+        asyncio.create_task(run_example(name, example_func))
+        for name, example_func in concurrent_examples
+    ]
+    try:
+        await asyncio.gather(*tasks, return_exceptions=False)
+
+        # 批量示例带进度条，单独运行，避免与其他示例的输出交错
+        await run_example("批量视频处理", example_2_batch_processing)
+    except Exception:
+        # 示例内部未处理的异常（如配置错误）会取消其余示例
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        console.print("\n⚠️  有示例失败，已停止其余示例", style="yellow")
+    finally:
+        await close_adapters()
 
     console.print("\n" + "="*70, style="bold magenta")
     console.print("✅ 示例演示完成", style="bold magenta")
@@ -8,7 +8,9 @@ import os
 from pathlib import Path
 
 # 添加项目根目录
-sys.path.insert(0, str(Path(__file__).parent.parent))
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from app.agents.content_analyzer import ContentAnalyzerAgent
 
@@ -49,13 +51,17 @@ print()
 # 测试视频路径
 video_path = "/Users/niko/auto-clip/tmp/7514135682735639860.mp4"
 
-if not Path(video_path).exists():
+# 一次 stat 同时完成存在性检查与大小获取
+video_file = Path(video_path)
+try:
+    video_size = video_file.stat().st_size
+except FileNotFoundError:
     print(f"❌ 视频文件不存在: {video_path}")
     print("💡 请将 video_path 替换为实际的视频路径")
     sys.exit(1)
 
-print(f"📹 视频文件: {Path(video_path).name}")
-print(f"📦 文件大小: {Path(video_path).stat().st_size / (1024*1024):.2f} MB")
+print(f"📹 视频文件: {video_file.name}")
+print(f"📦 文件大小: {video_size / (1024*1024):.2f} MB")
 print()
 
 # 分析视频
@@ -7,6 +7,7 @@ import os
 import sys
 import asyncio
 from pathlib import Path
+from typing import Optional, Set, Tuple
 
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent
@@ -30,7 +31,7 @@ async def test_upload():
     oss_path = "test/test_video.mp4"
 
     try:
-        if not os.path.exists(test_file):
+        if not await asyncio.to_thread(os.path.exists, test_file):
             print(f"❌ 测试文件不存在: {test_file}")
             return False
 
@@ -53,19 +54,29 @@ async def test_upload():
         return False
 
 
-async def test_object_exists():
-    """测试对象存在性检查"""
+async def check_object_exists(existing: Set[str]):
+    """
+    测试对象存在性检查
+
+    Args:
+        existing: test/ 前缀下一次列举得到的对象集合
+    """
     print_section("2. 测试对象存在性检查 (object_exists)")
 
     oss_path = "test/test_video.mp4"
     non_existent_path = "test/non_existent_file.mp4"
 
     try:
-        exists = oss_client.object_exists(oss_path)
+        exists = oss_path in existing
         print(f"✅ 检查路径: {oss_path}")
         print(f"   对象存在: {'是' if exists else '否'}")
 
-        not_exists = oss_client.object_exists(non_existent_path)
+        # 与单对象接口的结果交叉校验
+        if exists != oss_client.object_exists(oss_path):
+            print("   ⚠️ 列举结果与 object_exists 不一致")
+            return False
+
+        not_exists = non_existent_path in existing
         print(f"   检查路径: {non_existent_path}")
         print(f"   对象存在: {'是' if not_exists else '否'}")
 
@@ -102,18 +113,26 @@ async def test_generate_signed_url():
         return False
 
 
-async def test_download_to_memory():
-    """测试下载到内存"""
+async def check_download_to_memory(existing: Set[str]) -> Tuple[bool, Optional[bytes]]:
+    """
+    测试下载到内存
+
+    Args:
+        existing: test/ 前缀下一次列举得到的对象集合
+
+    Returns:
+        (是否通过, 下载内容)；下载内容供下载到文件测试复用，避免重复下载同一对象
+    """
     print_section("4. 测试下载到内存 (download)")
 
     oss_path = "test/test_video.mp4"
 
     try:
         # 检查对象是否存在
-        if not oss_client.object_exists(oss_path):
+        if oss_path not in existing:
             print(f"⏭️  跳过：对象不存在 {oss_path}")
             print(f"   请先运行上传测试")
-            return True
+            return True, None
 
         content = await oss_client.download(oss_path=oss_path)
 
@@ -121,41 +140,59 @@ async def test_download_to_memory():
         print(f"   下载内容大小: {len(content) / 1024 / 1024:.2f} MB")
         print(f"   数据类型: {type(content).__name__}")
 
-        return True
+        return True, content
 
     except Exception as e:
         print(f"❌ 测试失败: {str(e)}")
-        return False
+        return False, None
+
 
+async def test_download_to_file(content: Optional[bytes] = None):
+    """
+    测试下载到文件
 
-async def test_download_to_file():
-    """测试下载到文件"""
+    Args:
+        content: 下载到内存测试已取得的内容；提供时直接落盘校验，不再重复下载
+    """
     print_section("5. 测试下载到文件 (download to file)")
 
     oss_path = "test/test_video.mp4"
     local_path = "tmp/test_download.mp4"
 
     try:
-        # 检查对象是否存在
-        if not oss_client.object_exists(oss_path):
-            print(f"⏭️  跳过：对象不存在 {oss_path}")
-            print(f"   请先运行上传测试")
-            return True
+        if content is not None:
+            def write_file():
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                with open(local_path, "wb") as f:
+                    f.write(content)
 
-        await oss_client.download(
-            oss_path=oss_path,
-            local_path=local_path
-        )
+            await asyncio.to_thread(write_file)
+        else:
+            # 检查对象是否存在
+            if not oss_client.object_exists(oss_path):
+                print(f"⏭️  跳过：对象不存在 {oss_path}")
+                print("   请先运行上传测试")
+                return True
+
+            await oss_client.download(
+                oss_path=oss_path,
+                local_path=local_path
+            )
 
         print(f"✅ OSS路径: {oss_path}")
         print(f"   本地保存: {local_path}")
 
         # 验证文件
-        if os.path.exists(local_path):
-            file_size = os.path.getsize(local_path)
+        try:
+            file_size = (await asyncio.to_thread(os.stat, local_path)).st_size
             print(f"   文件大小: {file_size / 1024 / 1024:.2f} MB")
-        else:
+        except FileNotFoundError:
             print(f"   ⚠️ 文件未找到")
+            return False
+
+        if content is not None and file_size != len(content):
+            print(f"   ⚠️ 文件大小与下载内容不一致: {file_size} != {len(content)}")
+            return False
 
         return True
 
@@ -164,15 +201,20 @@ async def test_download_to_file():
         return False
 
 
-async def test_delete():
-    """测试删除对象"""
+async def check_delete(existing: Set[str]):
+    """
+    测试删除对象
+
+    Args:
+        existing: test/ 前缀下一次列举得到的对象集合（删除前状态）
+    """
     print_section("6. 测试删除对象 (delete)")
 
     oss_path = "test/test_video.mp4"
 
     try:
         # 检查对象是否存在
-        exists_before = oss_client.object_exists(oss_path)
+        exists_before = oss_path in existing
         print(f"   删除前对象存在: {'是' if exists_before else '否'}")
 
         if not exists_before:
@@ -196,7 +238,7 @@ async def test_delete():
         return False
 
 
-def cleanup_test_files():
+async def cleanup_test_files():
     """清理测试生成的文件"""
     print_section("清理测试文件")
 
@@ -204,13 +246,16 @@ def cleanup_test_files():
         "tmp/test_download.mp4"
     ]
 
-    for file_path in test_files:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                print(f"🗑️  已删除: {file_path}")
-            except Exception as e:
-                print(f"⚠️  删除失败 {file_path}: {e}")
+    async def remove(file_path: str):
+        try:
+            await asyncio.to_thread(os.remove, file_path)
+            print(f"🗑️  已删除: {file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  删除失败 {file_path}: {e}")
+
+    await asyncio.gather(*(remove(file_path) for file_path in test_files))
 
 
 async def main():
@@ -223,7 +268,7 @@ async def main():
     test_video = "tmp/7514135682735639860.mp4"
 
     print("\n📋 检查测试环境...")
-    if os.path.exists(test_video):
+    if await asyncio.to_thread(os.path.exists, test_video):
         print(f"✅ 找到测试视频: {test_video}")
     else:
         print(f"❌ 缺少测试视频: {test_video}")
@@ -233,11 +278,36 @@ async def main():
     results = {}
 
     results['upload'] = await test_upload()
-    results['object_exists'] = await test_object_exists()
-    results['signed_url'] = await test_generate_signed_url()
-    results['download_memory'] = await test_download_to_memory()
-    results['download_file'] = await test_download_to_file()
-    results['delete'] = await test_delete()
+
+    # 一次列举 test/ 前缀，代替各测试分别发起 object_exists 请求；
+    # 依赖列举结果的检查命名为 check_*，由这里调用，不会被 pytest 当作缺少 fixture 的用例收集
+    existing = await asyncio.to_thread(oss_client.list_object_keys, "test/")
+
+    # 两个下载测试共用一次下载：先下载到内存，再把同一份内容落盘校验
+    async def test_downloads():
+        results['download_memory'], content = await check_download_to_memory(existing)
+        results['download_file'] = await test_download_to_file(content)
+        return results['download_memory'] and results['download_file']
+
+    # 以下测试只依赖已上传的对象，互不影响，并发执行（输出可能交错）
+    concurrent_tests = {
+        'object_exists': lambda: check_object_exists(existing),
+        'signed_url': test_generate_signed_url,
+        'download': test_downloads,
+    }
+    outcomes = await asyncio.gather(
+        *(test() for test in concurrent_tests.values()),
+        return_exceptions=True
+    )
+    for name, outcome in zip(concurrent_tests, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"❌ {name} 异常: {outcome}")
+            results[name] = False
+        elif name != 'download':
+            results[name] = outcome
+
+    # 删除必须在其他测试结束后执行
+    results['delete'] = await check_delete(existing)
 
     # 打印测试总结
     print_section("测试总结")
@@ -256,7 +326,7 @@ async def main():
         print("\n⚠️  部分测试失败，请检查错误信息")
 
     # 自动清理测试文件
-    cleanup_test_files()
+    await cleanup_test_files()
 
     print("\n" + "☁️" * 30)
 
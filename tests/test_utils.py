@@ -3,9 +3,15 @@
 工具类测试脚本
 测试 video_utils 和 audio_utils 的所有功能
 """
+import asyncio
+import io
 import os
 import sys
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
 from pathlib import Path
+from typing import Optional
 
 # 添加项目根目录到 Python 路径
 project_root = Path(__file__).parent
@@ -13,23 +19,36 @@ sys.path.insert(0, str(project_root))
 
 from app.utils.video_utils import (
     get_video_info,
+    get_video_info_async,
     extract_video_clip,
     concatenate_video_clips,
-    video_to_base64
+    video_to_base64,
+    video_to_base64_stream,
+    nvc
 )
 from app.utils.audio_utils import (
     extract_audio_from_video,
     convert_audio_format,
-    merge_audio_files,
-    trim_audio
+    trim_audio,
+    extract_and_derive
 )
 
 
+SECTION_RULE = "=" * 60
+
+
 def print_section(title: str):
-    """打印章节标题"""
-    print("\n" + "=" * 60)
-    print(f"  {title}")
-    print("=" * 60)
+    """打印章节标题（一次写出）"""
+    print(f"\n{SECTION_RULE}\n  {title}\n{SECTION_RULE}")
+
+
+def print_file_size(path: str):
+    """打印文件大小（一次 stat 同时完成存在性检查，文件不存在时不输出）"""
+    try:
+        file_size = os.stat(path).st_size
+    except FileNotFoundError:
+        return
+    print(f"   文件大小: {file_size / 1024:.2f} KB")
 
 
 def test_video_info():
@@ -69,7 +88,8 @@ def test_extract_video_clip():
             video_path=test_video,
             start_time=0.0,
             end_time=clip_duration,
-            output_path=output_path
+            output_path=output_path,
+            hw_accel="auto"
         )
 
         print(f"✅ 原视频: {test_video}")
@@ -102,12 +122,20 @@ def test_concatenate_videos():
     try:
         result = concatenate_video_clips(
             clip_paths=video_paths,
-            output_path=output_path
+            output_path=output_path,
+            hw_accel="auto",
+            # 安装了 PyNvVideoCodec 时两个视频各用一个 NVDEC 会话并行解码
+            backend="pynvc" if nvc is not None else None
         )
 
+        # 各片段并发探测
+        async def probe_all():
+            return await asyncio.gather(*(get_video_info_async(path) for path in video_paths))
+
+        infos = asyncio.run(probe_all())
+
         print(f"✅ 拼接视频数量: {len(video_paths)}")
-        for i, path in enumerate(video_paths, 1):
-            info = get_video_info(path)
+        for i, (path, info) in enumerate(zip(video_paths, infos), 1):
             print(f"   视频{i}: {path} ({info['duration']:.2f}秒)")
 
         print(f"   输出文件: {result}")
@@ -143,6 +171,16 @@ def test_video_to_base64():
         if base64_str and len(base64_str) > 0:
             print(f"   ✅ Base64 编码成功")
 
+        # 分块编码结果拼接后应与一次性编码一致
+        stream_length = 0
+        for chunk in video_to_base64_stream(test_video):
+            if stream_length == 0 and chunk[:50].decode('ascii') != base64_str[:50]:
+                raise AssertionError("分块编码结果与一次性编码不一致")
+            stream_length += len(chunk)
+        if stream_length != len(base64_str):
+            raise AssertionError(f"分块编码长度不一致: {stream_length} != {len(base64_str)}")
+        print(f"   ✅ 分块编码一致 (video_to_base64_stream)")
+
         return True
     except Exception as e:
         print(f"❌ 测试失败: {str(e)}")
@@ -150,25 +188,26 @@ def test_video_to_base64():
 
 
 def test_extract_audio():
-    """测试音频提取"""
-    print_section("5. 测试音频提取 (extract_audio_from_video)")
+    """测试音频提取、格式转换与裁剪（一次ffmpeg调用完成）"""
+    print_section("5. 测试音频提取/转换/裁剪 (extract_and_derive)")
 
     test_video = "tmp/7514135682735639860.mp4"
-    output_path = "tmp/test_audio.mp3"
+    outputs = [
+        ("tmp/test_audio.mp3", None),
+        ("tmp/test_audio.wav", None),
+        ("tmp/test_audio_trimmed.mp3", (0.0, 3.0)),
+    ]
 
     try:
-        result = extract_audio_from_video(
-            video_path=test_video,
-            output_path=output_path
-        )
+        results = extract_and_derive(video_path=test_video, outputs=outputs)
 
         print(f"✅ 视频路径: {test_video}")
-        print(f"   输出音频: {result}")
+        for result, (_, trim) in zip(results, outputs):
+            trim_desc = f"（裁剪 {trim[0]:.1f} - {trim[1]:.1f} 秒）" if trim else ""
+            print(f"   输出音频: {result}{trim_desc}")
 
-        # 验证输出文件
-        if os.path.exists(result):
-            file_size = os.path.getsize(result)
-            print(f"   文件大小: {file_size / 1024:.2f} KB")
+            # 验证输出文件
+            print_file_size(result)
 
         return True
     except Exception as e:
@@ -176,33 +215,44 @@ def test_extract_audio():
         return False
 
 
-def test_convert_audio_format():
-    """测试音频格式转换"""
-    print_section("6. 测试音频格式转换 (convert_audio_format)")
-
-    input_audio = "tmp/test_audio.mp3"
-    output_path = "tmp/test_audio.wav"
+def test_audio_utils():
+    """测试单独的音频提取、格式转换与裁剪（业务代码直接调用的接口）"""
+    print_section("6. 测试音频提取/转换/裁剪 (extract_audio_from_video / convert_audio_format / trim_audio)")
 
-    # 先确保有音频文件
-    if not os.path.exists(input_audio):
-        print("⏭️  跳过：需要先运行音频提取测试")
-        return True
+    test_video = "tmp/7514135682735639860.mp4"
+    asr_audio = "tmp/test_audio_asr.wav"
+    converted_audio = "tmp/test_audio_asr.mp3"
+    trimmed_audio = "tmp/test_audio_asr_trimmed.wav"
 
     try:
-        result = convert_audio_format(
-            input_path=input_audio,
-            output_path=output_path,
-            target_format="wav"
+        # ASR 参数：16kHz、16位、单声道 PCM
+        result = extract_audio_from_video(
+            video_path=test_video,
+            output_path=asr_audio,
+            audio_codec="pcm_s16le",
+            fps=16000,
+            nbytes=2,
+            ffmpeg_params=["-ac", "1"]
         )
-
-        print(f"✅ 输入音频: {input_audio}")
-        print(f"   输出格式: WAV")
-        print(f"   输出文件: {result}")
-
-        # 验证输出文件
-        if os.path.exists(result):
-            file_size = os.path.getsize(result)
-            print(f"   文件大小: {file_size / 1024:.2f} KB")
+        with wave.open(result, "rb") as wav:
+            params = (wav.getframerate(), wav.getsampwidth(), wav.getnchannels())
+        print(f"✅ 提取音频: {result}")
+        print(f"   采样率/位宽/声道: {params[0]}Hz / {params[1] * 8}bit / {params[2]}")
+        if params != (16000, 2, 1):
+            print("   ⚠️ 输出参数与请求不一致")
+            return False
+
+        result = convert_audio_format(input_path=asr_audio, output_path=converted_audio, target_format="mp3")
+        print(f"   格式转换: {result}")
+        print_file_size(result)
+
+        result = trim_audio(audio_path=asr_audio, output_path=trimmed_audio, start_time=0.0, end_time=3.0, format="wav")
+        with wave.open(result, "rb") as wav:
+            trimmed_duration = wav.getnframes() / wav.getframerate()
+        print(f"   裁剪音频: {result}（{trimmed_duration:.2f} 秒）")
+        if abs(trimmed_duration - 3.0) > 0.1:
+            print("   ⚠️ 裁剪时长与请求不一致")
+            return False
 
         return True
     except Exception as e:
@@ -210,39 +260,29 @@ def test_convert_audio_format():
         return False
 
 
-def test_trim_audio():
-    """测试音频裁剪"""
-    print_section("7. 测试音频裁剪 (trim_audio)")
-
-    input_audio = "tmp/test_audio.mp3"
-    output_path = "tmp/test_audio_trimmed.mp3"
-
-    # 先确保有音频文件
-    if not os.path.exists(input_audio):
-        print("⏭️  跳过：需要先运行音频提取测试")
-        return True
-
-    try:
-        result = trim_audio(
-            audio_path=input_audio,
-            start_time=0.0,
-            end_time=3.0,
-            output_path=output_path
-        )
+def run_captured(test_func):
+    """在子进程中运行测试，捕获其输出，由主进程按提交顺序统一打印"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        result = test_func()
+    return result, buffer.getvalue()
 
-        print(f"✅ 输入音频: {input_audio}")
-        print(f"   裁剪时间: 0.0 - 3.0 秒")
-        print(f"   输出文件: {result}")
 
-        # 验证输出文件
-        if os.path.exists(result):
-            file_size = os.path.getsize(result)
-            print(f"   文件大小: {file_size / 1024:.2f} KB")
+def run_stage(executor, tests: dict, results: dict):
+    """
+    并发运行一组互不依赖的测试
 
-        return True
-    except Exception as e:
-        print(f"❌ 测试失败: {str(e)}")
-        return False
+    Args:
+        executor: 进程池
+        tests: {测试名: 测试函数}
+        results: 测试结果，按提交顺序写入
+    """
+    futures = {name: executor.submit(run_captured, func) for name, func in tests.items()}
+    for name, future in futures.items():
+        results[name], output = future.result()
+        # 每个测试的输出整体写出一次
+        sys.stdout.write(output)
+    sys.stdout.flush()
 
 
 def cleanup_test_files():
@@ -254,20 +294,29 @@ def cleanup_test_files():
         "tmp/test_concatenated.mp4",
         "tmp/test_audio.mp3",
         "tmp/test_audio.wav",
-        "tmp/test_audio_trimmed.mp3"
+        "tmp/test_audio_trimmed.mp3",
+        "tmp/test_audio_asr.wav",
+        "tmp/test_audio_asr.mp3",
+        "tmp/test_audio_asr_trimmed.wav"
     ]
 
     for file_path in test_files:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                print(f"🗑️  已删除: {file_path}")
-            except Exception as e:
-                print(f"⚠️  删除失败 {file_path}: {e}")
-
-
-def main():
-    """主测试函数"""
+        try:
+            os.remove(file_path)
+            print(f"🗑️  已删除: {file_path}")
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            print(f"⚠️  删除失败 {file_path}: {e}")
+
+
+def main(cleanup: Optional[bool] = None):
+    """
+    主测试函数
+
+    Args:
+        cleanup: 是否清理测试生成的文件；None 时交互式终端下询问，非交互环境（CI）下保留
+    """
     print("\n" + "🎬" * 30)
     print("  视频/音频工具类测试")
     print("🎬" * 30)
@@ -286,19 +335,23 @@ def main():
             print(f"❌ 缺少测试视频: {video}")
             return
 
-    # 运行所有测试
+    # 运行所有测试：各测试互不依赖，在进程池中并发执行
     results = {}
 
-    # Video Utils 测试
-    results['video_info'] = test_video_info()
-    results['extract_clip'] = test_extract_video_clip()
-    results['concatenate'] = test_concatenate_videos()
-    results['video_base64'] = test_video_to_base64()
-
-    # Audio Utils 测试
-    results['extract_audio'] = test_extract_audio()
-    results['convert_audio'] = test_convert_audio_format()
-    results['trim_audio'] = test_trim_audio()
+    independent_tests = {
+        # Video Utils 测试
+        'video_info': test_video_info,
+        'extract_clip': test_extract_video_clip,
+        'concatenate': test_concatenate_videos,
+        'video_base64': test_video_to_base64,
+        # Audio Utils 测试（提取、转换、裁剪共用一次解码）
+        'extract_audio': test_extract_audio,
+        # Audio Utils 测试（业务代码使用的单独接口）
+        'audio_utils': test_audio_utils,
+    }
+
+    with ProcessPoolExecutor(max_workers=min(len(independent_tests), os.cpu_count() or 1)) as executor:
+        run_stage(executor, independent_tests, results)
 
     # 打印测试总结
     print_section("测试总结")
@@ -307,19 +360,19 @@ def main():
     passed = sum(1 for v in results.values() if v)
     failed = total - passed
 
-    print(f"\n总计: {total} 个测试")
-    print(f"✅ 通过: {passed}")
-    print(f"❌ 失败: {failed}")
-
-    if failed == 0:
-        print("\n🎉 所有测试通过！")
-    else:
-        print("\n⚠️  部分测试失败，请检查错误信息")
+    summary = [
+        f"\n总计: {total} 个测试",
+        f"✅ 通过: {passed}",
+        f"❌ 失败: {failed}",
+        "\n🎉 所有测试通过！" if failed == 0 else "\n⚠️  部分测试失败，请检查错误信息",
+    ]
+    print("\n".join(summary))
 
     # 询问是否清理测试文件
     print("\n" + "=" * 60)
-    cleanup = input("是否清理测试生成的文件？(y/n): ").lower().strip()
-    if cleanup == 'y':
+    if cleanup is None and sys.stdin.isatty():
+        cleanup = input("是否清理测试生成的文件？(y/n): ").lower().strip() == 'y'
+    if cleanup:
         cleanup_test_files()
     else:
         print("📁 测试文件已保留在 tmp/ 目录")
@@ -328,4 +381,15 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="视频/音频工具类测试")
+    parser.add_argument(
+        "--cleanup",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="结束后是否清理测试文件（不指定时交互式终端下询问，非交互环境下保留）"
+    )
+    args = parser.parse_args()
+
+    main(cleanup=args.cleanup)
@@ -5,6 +5,9 @@
 
 import sys
 import asyncio
+import cProfile
+import faulthandler
+import signal
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -34,6 +37,9 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# --profile 时性能分析数据的保存路径
+PROFILE_PATH = "tmp/output/clip_team.prof"
+
 
 def print_banner():
     """打印欢迎横幅"""
@@ -49,8 +55,78 @@ def print_banner():
     console.print(banner, style="bold cyan")
 
 
-async def main():
-    """主函数"""
+def print_stage_result(stage: str, result):
+    """打印单个步骤的结果"""
+    if stage == "analyses":
+        # 分析结果
+        table = Table(title="内容分析", show_header=True)
+        table.add_column("指标", style="cyan")
+        table.add_column("数值", style="magenta")
+
+        analysis = result[0]
+        table.add_row("视频ID", analysis.video_id)
+        table.add_row("总时长", f"{analysis.duration:.1f}秒")
+        table.add_row("关键时刻", f"{len(analysis.key_moments)}个")
+        table.add_row("时间轴片段", f"{len(analysis.timeline)}个")
+
+        console.print(table)
+
+    elif stage == "strategy":
+        # 策略结果
+        console.print(f"\n🎨 创意策略:", style="bold green")
+        console.print(f"  • 风格: {result.recommended_style}", style="green")
+        console.print(f"  • 钩子: {result.viral_hook}", style="green")
+        console.print(f"  • 目标时长: {result.target_duration}秒", style="green")
+
+    elif stage == "technical_plan":
+        # 技术方案
+        console.print(f"\n🔧 技术方案:", style="bold magenta")
+        console.print(f"  • 片段数: {len(result.segments)}个", style="magenta")
+        console.print(f"  • 总时长: {result.total_duration:.1f}秒", style="magenta")
+
+    elif stage == "quality_review":
+        # 质量评审
+        pass_status = "✅ 通过" if result.pass_review else "❌ 未通过"
+        pass_style = "bold green" if result.pass_review else "bold red"
+        console.print(f"\n⭐ 质量评审:", style="bold yellow")
+        console.print(f"  • 总分: {result.overall_score:.1f}/10", style="yellow")
+        console.print(f"  • 结果: {pass_status}", style=pass_style)
+
+    elif stage == "execution_result":
+        # 视频执行结果
+        if result and result.get("success"):
+            console.print(f"\n🎬 视频剪辑:", style="bold blue")
+            console.print(f"  • 输出路径: {result['output_path']}", style="blue")
+            if result.get("total_duration") is not None:
+                console.print(f"  • 视频时长: {result['total_duration']:.1f}秒", style="blue")
+            if result.get("file_size_mb") is not None:
+                console.print(f"  • 文件大小: {result['file_size_mb']:.2f}MB", style="blue")
+
+    elif stage == "script":
+        # 口播脚本
+        if result:
+            console.print(f"\n📝 口播脚本:", style="bold cyan")
+            console.print(f"  • 标题: {result.title}", style="cyan")
+            console.print(f"  • 脚本长度: {result.word_count}字", style="cyan")
+            console.print(f"  • 预估时长: {result.estimated_speech_duration:.1f}秒", style="cyan")
+            console.print(f"  • 预览: {result.full_script[:100]}...", style="dim cyan")
+
+    elif stage == "narration_result":
+        # 口播和字幕结果
+        if result and result.get("success"):
+            console.print(f"\n🎥 完整视频（含口播+字幕）:", style="bold green")
+            console.print(f"  • 最终路径: {result['output_path']}", style="green")
+            if result.get("srt_path"):
+                console.print(f"  • 字幕文件: {result['srt_path']}", style="green")
+
+
+async def main(profile: bool = False):
+    """
+    主函数
+
+    Args:
+        profile: 是否对流程执行部分做性能分析（不含导入和初始化）
+    """
     print_banner()
     
     # 查找tmp目录下的视频
@@ -112,6 +188,8 @@ async def main():
         "narration_tts_provider": "kokoro",  # 使用Kokoro TTS（本地开源）
         "narration_voice": "af_heart",  # Kokoro 音色
         "narration_speed": 1.0,  # Kokoro 语速
+        "narration_tts_dtype": "float16",  # Kokoro 混合精度推理（GPU）
+        "narration_tts_chunk_chars": 120,  # Kokoro 按句子分块推理
         "generate_srt": True,  # 生成SRT字幕文件
         "burn_subtitles": True,  # 烧录字幕到视频
         "subtitle_config": {
@@ -124,86 +202,59 @@ async def main():
     
     console.print(f"\n🚀 开始执行完整流程（目标时长: 30秒，使用Kokoro TTS + 字幕）...\n", style="bold cyan")
 
+    # 只分析流程执行部分；cProfile 只记录主线程，线程池中的阻塞调用表现为等待时间
+    profiler = cProfile.Profile() if profile else None
+
     try:
-        # 运行完整流程
-        output = await team.run(
+        if profiler is not None:
+            profiler.enable()
+
+        # 运行完整流程，每个步骤完成后立即打印其结果
+        output = None
+        async for stage, result in team.run_stream(
             video_paths=test_videos,
             config=config,
             output_path=output_path
-        )
-        
-        # 打印结果摘要
-        console.print("\n" + "=" * 70, style="bold cyan")
-        console.print("📊 执行结果摘要", style="bold cyan")
-        console.print("=" * 70 + "\n", style="bold cyan")
-        
-        # 分析结果
-        table = Table(title="内容分析", show_header=True)
-        table.add_column("指标", style="cyan")
-        table.add_column("数值", style="magenta")
-        
-        analysis = output.analyses[0]
-        table.add_row("视频ID", analysis.video_id)
-        table.add_row("总时长", f"{analysis.duration:.1f}秒")
-        table.add_row("关键时刻", f"{len(analysis.key_moments)}个")
-        table.add_row("时间轴片段", f"{len(analysis.timeline)}个")
-        
-        console.print(table)
-        
-        # 策略结果
-        console.print(f"\n🎨 创意策略:", style="bold green")
-        console.print(f"  • 风格: {output.strategy.recommended_style}", style="green")
-        console.print(f"  • 钩子: {output.strategy.viral_hook}", style="green")
-        console.print(f"  • 目标时长: {output.strategy.target_duration}秒", style="green")
-        
-        # 技术方案
-        console.print(f"\n🔧 技术方案:", style="bold magenta")
-        console.print(f"  • 片段数: {len(output.technical_plan.segments)}个", style="magenta")
-        console.print(f"  • 总时长: {output.technical_plan.total_duration:.1f}秒", style="magenta")
-        
-        # 质量评审
-        pass_status = "✅ 通过" if output.quality_review.pass_review else "❌ 未通过"
-        pass_style = "bold green" if output.quality_review.pass_review else "bold red"
-        console.print(f"\n⭐ 质量评审:", style="bold yellow")
-        console.print(f"  • 总分: {output.quality_review.overall_score:.1f}/10", style="yellow")
-        console.print(f"  • 结果: {pass_status}", style=pass_style)
-        console.print(f"  • 迭代次数: {output.iteration_count}", style="yellow")
-        
-        # 视频执行结果
-        if output.clipped_video_path:
-            console.print(f"\n🎬 视频剪辑:", style="bold blue")
-            console.print(f"  • 输出路径: {output.clipped_video_path}", style="blue")
-            console.print(f"  • 视频时长: {output.video_duration:.1f}秒", style="blue")
-            console.print(f"  • 文件大小: {output.video_file_size_mb:.2f}MB", style="blue")
-
-        # 口播和字幕结果
-        if output.script:
-            console.print(f"\n📝 口播脚本:", style="bold cyan")
-            console.print(f"  • 标题: {output.script.title}", style="cyan")
-            console.print(f"  • 脚本长度: {output.script.word_count}字", style="cyan")
-            console.print(f"  • 预估时长: {output.script.estimated_speech_duration:.1f}秒", style="cyan")
-            console.print(f"  • 预览: {output.script.full_script[:100]}...", style="dim cyan")
+        ):
+            if stage == "output":
+                output = result
+            else:
+                print_stage_result(stage, result)
 
-        if output.final_video_path:
-            console.print(f"\n🎥 完整视频（含口播+字幕）:", style="bold green")
-            console.print(f"  • 最终路径: {output.final_video_path}", style="green")
-            if output.srt_file_path:
-                console.print(f"  • 字幕文件: {output.srt_file_path}", style="green")
-        
         # 总结
         console.print("\n" + "=" * 70, style="bold cyan")
         console.print(
-            f"🎉 完整流程验证成功！总耗时: {output.processing_time:.1f}秒",
+            f"🎉 完整流程验证成功！总耗时: {output.processing_time:.1f}秒"
+            f"（迭代次数: {output.iteration_count}）",
             style="bold cyan"
         )
         console.print("=" * 70 + "\n", style="bold cyan")
-        
+
     except Exception as e:
         console.print(f"\n❌ 执行失败: {e}", style="bold red")
         logger.exception("执行异常")
         import traceback
         traceback.print_exc()
 
+    finally:
+        # 失败时同样保存，便于定位卡在哪个步骤
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(PROFILE_PATH)
+            console.print(f"📈 性能分析数据已保存: {PROFILE_PATH}（python -m pstats 查看）", style="dim")
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+
+    parser = argparse.ArgumentParser(description="验证clip_team完整流程")
+    parser.add_argument("--profile", action="store_true", help=f"对流程执行做性能分析，结果保存到 {PROFILE_PATH}")
+    args = parser.parse_args()
+
+    # 崩溃（如原生扩展段错误）时输出各线程的Python堆栈；
+    # 卡死时可执行 kill -USR1 <pid> 随时打印当前堆栈
+    faulthandler.enable()
+    if hasattr(signal, "SIGUSR1"):
+        faulthandler.register(signal.SIGUSR1, all_threads=True)
+
+    asyncio.run(main(profile=args.profile))